@@ -0,0 +1,8 @@
+"""
+Permet l'exécution de la ligne de commande avec `python -m algotrading`.
+"""
+import sys
+
+from algotrading.cli import main
+
+sys.exit(main())
@@ -0,0 +1,367 @@
+"""
+Module de benchmark des composants du système.
+
+Mesure le temps d'exécution et le pic de mémoire du chargement des données,
+des indicateurs, des stratégies et du backtest sur des jeux de données
+synthétiques de taille croissante, et compare les résultats à une référence
+enregistrée pour détecter les régressions.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+import numpy as np
+from typing import Optional, Dict, List, Union, Tuple, Any, Callable
+
+from algotrading.data_loader import DataLoader
+from algotrading.indicators import TechnicalIndicators
+from algotrading.strategy import MovingAverageCrossover, RSIStrategy
+from algotrading.costs import CompositeCostModel, SquareRootImpact, CapacityLimit
+from algotrading.synthetic import SyntheticMarketGenerator
+
+
+# Tailles par défaut ; les grandes tailles (plusieurs minutes, plusieurs Go)
+# sont exécutées seulement sur demande (--large ou --sizes)
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+LARGE_SIZES = [10_000_000]
+
+# Nombre de symboles des cas multi-symboles (la taille est répartie entre eux)
+N_SYMBOLS = 4
+
+
+def make_synthetic_prices(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Génère des barres OHLCV synthétiques au format de `prepare_price_data`.
+    
+    Les barres minute sont produites par `SyntheticMarketGenerator`.
+    
+    Args:
+        n_bars: Nombre de barres.
+        seed: Graine du générateur aléatoire.
+        
+    Returns:
+        DataFrame indexé par 'date' avec les colonnes Open, High, Low, Close, Volume.
+    """
+    generator = SyntheticMarketGenerator(['BENCH'], freq='min', seed=seed)
+    return generator.generate(n_bars)['BENCH']
+
+
+class BenchmarkContext:
+    """Données partagées par les cas de benchmark pour une taille donnée."""
+
+    def __init__(self, n_bars: int, work_dir: str, seed: int = 0):
+        """
+        Initialise le contexte.
+        
+        Args:
+            n_bars: Nombre de barres des données synthétiques.
+            work_dir: Répertoire pour les fichiers temporaires.
+            seed: Graine du générateur aléatoire.
+        """
+        self.n_bars = n_bars
+        self.work_dir = work_dir
+        self.seed = seed
+        self._prices: Optional[pd.DataFrame] = None
+        self._raw: Optional[pd.DataFrame] = None
+        self._csv: Optional[str] = None
+        self._results: Optional[pd.DataFrame] = None
+
+    @property
+    def prices(self) -> pd.DataFrame:
+        """Données de prix préparées."""
+        if self._prices is None:
+            self._prices = make_synthetic_prices(self.n_bars, self.seed)
+        return self._prices
+
+    @property
+    def raw(self) -> pd.DataFrame:
+        """Données brutes (colonne 'date' non indexée), comme après `load_csv`."""
+        if self._raw is None:
+            self._raw = self.prices.reset_index()
+        return self._raw
+
+    @property
+    def csv_filename(self) -> str:
+        """Nom du fichier CSV des données, écrit à la première demande."""
+        if self._csv is None:
+            self._csv = f"bench_{self.n_bars}.csv"
+            self.raw.to_csv(os.path.join(self.work_dir, self._csv), index=False)
+        return self._csv
+
+    @property
+    def symbol_prices(self) -> Dict[str, pd.DataFrame]:
+        """
+        Données de `N_SYMBOLS` symboles totalisant `n_bars` barres.
+        
+        Chaque symbole reçoit une tranche distincte des données : la mémoire
+        des cas multi-symboles reste celle des cas à un symbole de même taille.
+        """
+        size = max(self.n_bars // N_SYMBOLS, 1)
+        return {f"S{i}": self.prices.iloc[i * size:(i + 1) * size] for i in range(N_SYMBOLS)}
+
+    @property
+    def backtest_results(self) -> pd.DataFrame:
+        """Résultats d'un backtest de référence, pour le calcul des métriques."""
+        if self._results is None:
+            self._results = MovingAverageCrossover(20, 50).backtest(self.prices)
+        return self._results
+
+
+# Cas de benchmark : nom -> fonction exécutant l'opération mesurée
+BENCHMARK_CASES: Dict[str, Callable[[BenchmarkContext], Any]] = {
+    'load_csv': lambda ctx: DataLoader(ctx.work_dir).load_csv(ctx.csv_filename),
+    'prepare_price_data': lambda ctx: DataLoader(ctx.work_dir).prepare_price_data(ctx.raw),
+    'validate_price_data': lambda ctx: DataLoader(ctx.work_dir).prepare_price_data(ctx.raw, validate=True),
+    'sma': lambda ctx: TechnicalIndicators.sma(ctx.prices),
+    'ema': lambda ctx: TechnicalIndicators.ema(ctx.prices),
+    'rsi': lambda ctx: TechnicalIndicators.rsi(ctx.prices),
+    'macd': lambda ctx: TechnicalIndicators.macd(ctx.prices),
+    'bollinger_bands': lambda ctx: TechnicalIndicators.bollinger_bands(ctx.prices),
+    'add_all_indicators': lambda ctx: TechnicalIndicators.add_all_indicators(ctx.prices),
+    'add_all_indicators_threads': lambda ctx: TechnicalIndicators.add_all_indicators(ctx.prices, n_jobs=None),
+    'add_all_indicators_symbols': lambda ctx: TechnicalIndicators.add_all_indicators_many(
+        ctx.symbol_prices, n_jobs=None),
+    'ma_crossover_signals': lambda ctx: MovingAverageCrossover(20, 50).generate_signals(ctx.prices),
+    'rsi_strategy_signals': lambda ctx: RSIStrategy(14, 70, 30).generate_signals(ctx.prices),
+    'backtest': lambda ctx: MovingAverageCrossover(20, 50).backtest(ctx.prices, commission=0.001),
+    'calculate_metrics': lambda ctx: MovingAverageCrossover(20, 50).calculate_metrics(ctx.backtest_results),
+    'backtest_matrix': lambda ctx: MovingAverageCrossover.backtest_matrix(
+        ctx.prices, [{'fast_window': f, 'slow_window': s} for f in (5, 10, 15, 20) for s in (30, 40, 50, 60)],
+        commission=0.001),
+    'backtest_matrix_capacity': lambda ctx: MovingAverageCrossover.backtest_matrix(
+        ctx.prices, [{'fast_window': f, 'slow_window': s} for f in (5, 10, 15, 20) for s in (30, 40, 50, 60)],
+        initial_capital=1e7, cost_model=CompositeCostModel([SquareRootImpact(), CapacityLimit(0.01)])),
+}
+
+
+def measure(func: Callable[[], Any], repeat: int = 3, track_memory: bool = True,
+            max_total_time: float = 5.0) -> Dict[str, float]:
+    """
+    Mesure le temps d'exécution et le pic de mémoire d'une fonction.
+    
+    Le temps retenu est le minimum sur les répétitions ; le pic de mémoire est
+    mesuré par une exécution séparée sous `tracemalloc`, qui ralentit le code.
+    
+    Args:
+        func: Fonction sans argument à mesurer.
+        repeat: Nombre maximal de répétitions pour le temps.
+        track_memory: Mesurer le pic de mémoire.
+        max_total_time: Les répétitions s'arrêtent au-delà de cette durée cumulée.
+        
+    Returns:
+        Dictionnaire avec 'time_s', 'peak_mb' (ou None) et 'runs'.
+    """
+    timings = []
+    total = 0.0
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        total += elapsed
+        if total > max_total_time:
+            break
+
+    peak_mb = None
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_mb = peak / 1024 ** 2
+
+    return {'time_s': min(timings), 'peak_mb': peak_mb, 'runs': len(timings)}
+
+
+def run_benchmarks(sizes: Optional[List[int]] = None, cases: Optional[List[str]] = None,
+                   repeat: int = 3, track_memory: bool = True, seed: int = 0,
+                   work_dir: Optional[str] = None,
+                   progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Exécute les benchmarks.
+    
+    Args:
+        sizes: Tailles des jeux de données (nombre de barres).
+        cases: Noms des cas à exécuter (tous par défaut).
+        repeat: Nombre de répétitions pour la mesure du temps.
+        track_memory: Mesurer le pic de mémoire.
+        seed: Graine des données synthétiques.
+        work_dir: Répertoire des fichiers temporaires (temporaire par défaut).
+        progress: Fonction appelée avec un message après chaque mesure.
+        
+    Returns:
+        Dictionnaire avec les clés 'meta' et 'results' (liste de mesures).
+        
+    Raises:
+        ValueError: Si un cas demandé n'existe pas.
+    """
+    sizes = sizes or DEFAULT_SIZES
+    cases = cases or list(BENCHMARK_CASES)
+    unknown = [name for name in cases if name not in BENCHMARK_CASES]
+    if unknown:
+        raise ValueError(f"Cas de benchmark inconnus : {', '.join(unknown)}.")
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': [],
+    }
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        for n_bars in sizes:
+            ctx = BenchmarkContext(int(n_bars), tmp_dir, seed)
+            for name in cases:
+                measurement = measure(lambda: BENCHMARK_CASES[name](ctx), repeat, track_memory)
+                measurement.update({'case': name, 'n_bars': int(n_bars)})
+                report['results'].append(measurement)
+                if progress is not None:
+                    peak = measurement['peak_mb']
+                    progress(f"{name:<22} {n_bars:>10} barres  {measurement['time_s']:.4f} s"
+                             + (f"  {peak:.1f} Mo" if peak is not None else ""))
+            # Libérer les données de cette taille avant la suivante
+            del ctx
+            gc.collect()
+
+    return report
+
+
+def save_results(report: Dict[str, Any], path: str) -> None:
+    """Enregistre un rapport de benchmark au format JSON."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Charge un rapport de benchmark JSON."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float = 0.25, memory_threshold: Optional[float] = None,
+                        min_time: float = 1e-3) -> List[Dict[str, Any]]:
+    """
+    Compare un rapport à une référence et liste les régressions.
+    
+    Args:
+        report: Rapport courant.
+        baseline: Rapport de référence.
+        threshold: Ralentissement relatif toléré (0.25 = +25 %).
+        memory_threshold: Hausse relative tolérée du pic de mémoire (None pour ignorer).
+        min_time: Les mesures plus courtes que cette durée (bruit) sont ignorées.
+        
+    Returns:
+        Liste des régressions (cas, taille, métrique, référence, valeur, ratio).
+    """
+    reference = {(r['case'], r['n_bars']): r for r in baseline.get('results', [])}
+    regressions = []
+
+    for result in report.get('results', []):
+        base = reference.get((result['case'], result['n_bars']))
+        if base is None:
+            continue
+
+        checks = [('time_s', threshold)]
+        if memory_threshold is not None:
+            checks.append(('peak_mb', memory_threshold))
+
+        for metric, limit in checks:
+            old, new = base.get(metric), result.get(metric)
+            if old is None or new is None or old <= 0:
+                continue
+            if metric == 'time_s' and max(old, new) < min_time:
+                continue
+            ratio = new / old
+            if ratio > 1 + limit:
+                regressions.append({
+                    'case': result['case'],
+                    'n_bars': result['n_bars'],
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'ratio': ratio,
+                })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée en ligne de commande des benchmarks.
+    
+    Args:
+        argv: Arguments (ceux de `sys.argv` par défaut).
+        
+    Returns:
+        Code de sortie : 1 si une régression dépasse le seuil, 0 sinon.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks du système AlgoTrading.")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    return run_from_args(args)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Ajoute les options des benchmarks à un analyseur d'arguments."""
+    parser.add_argument('--sizes', type=lambda s: [int(float(x)) for x in s.split(',')],
+                        default=DEFAULT_SIZES, help="Tailles séparées par des virgules (ex. 1e3,1e5).")
+    parser.add_argument('--large', action='store_true',
+                        help=f"Ajouter les grandes tailles ({', '.join(f'{n:.0e}' for n in LARGE_SIZES)}).")
+    parser.add_argument('--cases', type=lambda s: s.split(','), default=None,
+                        help=f"Cas à exécuter parmi : {', '.join(BENCHMARK_CASES)}.")
+    parser.add_argument('--repeat', type=int, default=3, help="Répétitions par mesure.")
+    parser.add_argument('--no-memory', action='store_true', help="Ne pas mesurer la mémoire.")
+    parser.add_argument('--output', default='benchmarks/results.json', help="Fichier JSON de sortie.")
+    parser.add_argument('--baseline', default=None, help="Rapport JSON de référence.")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Ralentissement relatif toléré par rapport à la référence.")
+    parser.add_argument('--memory-threshold', type=float, default=None,
+                        help="Hausse relative tolérée du pic de mémoire.")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Remplacer la référence par les résultats courants.")
+
+
+def run_from_args(args: argparse.Namespace) -> int:
+    """Exécute les benchmarks à partir d'arguments analysés."""
+    sizes = list(args.sizes) + [n for n in LARGE_SIZES if args.large and n not in args.sizes]
+    report = run_benchmarks(sizes=sizes, cases=args.cases, repeat=args.repeat,
+                            track_memory=not args.no_memory, progress=print)
+    save_results(report, args.output)
+    print(f"Résultats enregistrés dans {args.output}")
+
+    if args.baseline is None:
+        return 0
+    if args.update_baseline or not os.path.exists(args.baseline):
+        save_results(report, args.baseline)
+        print(f"Référence enregistrée dans {args.baseline}")
+        return 0
+
+    regressions = compare_to_baseline(report, load_results(args.baseline),
+                                      args.threshold, args.memory_threshold)
+    for r in regressions:
+        print(f"RÉGRESSION {r['case']} ({r['n_bars']} barres) {r['metric']} : "
+              f"{r['baseline']:.4g} -> {r['current']:.4g} (x{r['ratio']:.2f})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
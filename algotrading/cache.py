@@ -0,0 +1,323 @@
+"""
+Module de cache persistant des résultats de backtest.
+
+La clé d'un résultat combine l'empreinte des données, la configuration de la
+stratégie (classe, paramètres, code source) et les paramètres du backtest
+(dont le modèle de coûts). Le code source pris en compte comprend celui des
+classes de la stratégie (et de ses stratégies filles) et celui des modules
+utilisés par le backtest (indicateurs, comptabilité, coûts) : une
+modification de ce code change donc la clé et invalide automatiquement les
+anciens résultats.
+"""
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+import pickle
+import zlib
+import pandas as pd
+import numpy as np
+from typing import Optional, Dict, List, Union, Tuple, Any
+
+from algotrading.strategy import Strategy
+from algotrading.costs import CostModel
+
+# Modules dont dépend le résultat d'un backtest, en plus des classes de la stratégie
+BACKTEST_MODULES = ('algotrading.strategy', 'algotrading.indicators', 'algotrading.vectorized',
+                    'algotrading.costs')
+
+# Empreintes du code source des modules, calculées une fois par processus
+_MODULE_FINGERPRINTS: Dict[str, str] = {}
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """
+    Calcule l'empreinte d'un DataFrame (index, colonnes et valeurs).
+    
+    Args:
+        data: DataFrame à identifier.
+        
+    Returns:
+        Empreinte hexadécimale SHA-256.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(list(data.columns)).encode())
+    digest.update(repr([str(dtype) for dtype in data.dtypes]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def _module_fingerprint(name: str) -> str:
+    """Calcule l'empreinte du code source d'un module (une fois par processus)."""
+    if name not in _MODULE_FINGERPRINTS:
+        module = sys.modules.get(name) or importlib.import_module(name)
+        try:
+            source = inspect.getsource(module)
+        except (OSError, TypeError):
+            source = name
+        _MODULE_FINGERPRINTS[name] = hashlib.sha256(source.encode()).hexdigest()
+    return _MODULE_FINGERPRINTS[name]
+
+
+def _strategy_classes(strategy: Strategy) -> List[type]:
+    """Liste les classes d'une stratégie et de ses stratégies filles, récursivement."""
+    classes = [type(strategy)]
+    for value in vars(strategy).values():
+        children = value if isinstance(value, (list, tuple)) else [value]
+        for child in children:
+            if isinstance(child, Strategy):
+                classes.extend(_strategy_classes(child))
+    return classes
+
+
+def strategy_code_fingerprint(strategy: Strategy) -> str:
+    """
+    Calcule l'empreinte du code dont dépend le backtest d'une stratégie.
+    
+    Comprend le code source des classes de la stratégie et de ses stratégies
+    filles (avec leurs classes parentes), de leurs modules et des modules
+    `BACKTEST_MODULES`.
+    
+    Args:
+        strategy: Stratégie à identifier.
+        
+    Returns:
+        Empreinte hexadécimale SHA-256.
+    """
+    digest = hashlib.sha256()
+    modules = set(BACKTEST_MODULES)
+    seen = set()
+    for strategy_class in _strategy_classes(strategy):
+        for cls in strategy_class.__mro__:
+            if cls is object or cls.__module__ == 'abc' or cls in seen:
+                continue
+            seen.add(cls)
+            modules.add(cls.__module__)
+            try:
+                digest.update(inspect.getsource(cls).encode())
+            except (OSError, TypeError):
+                # Classe sans source disponible (définie dynamiquement)
+                digest.update(cls.__qualname__.encode())
+    for name in sorted(modules):
+        digest.update(_module_fingerprint(name).encode())
+    return digest.hexdigest()
+
+
+def strategy_fingerprint(strategy: Strategy) -> str:
+    """
+    Calcule l'empreinte de la configuration d'une stratégie (paramètres et code).
+    
+    Args:
+        strategy: Stratégie à identifier.
+        
+    Returns:
+        Empreinte hexadécimale SHA-256.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{type(strategy).__module__}.{type(strategy).__qualname__}".encode())
+    digest.update(json.dumps(strategy.params(), sort_keys=True).encode())
+    digest.update(strategy_code_fingerprint(strategy).encode())
+    return digest.hexdigest()
+
+
+def _class_tag(strategy: Strategy) -> str:
+    """Retourne une étiquette courte identifiant la classe d'une stratégie."""
+    name = f"{type(strategy).__module__}.{type(strategy).__qualname__}"
+    return hashlib.sha256(name.encode()).hexdigest()[:12]
+
+
+class BacktestCache:
+    """Cache sur disque des résultats de backtest avec éviction par taille."""
+
+    def __init__(self, cache_dir: str = ".backtest_cache", max_size_bytes: int = 512 * 1024 ** 2,
+                 compression_level: int = 1):
+        """
+        Initialise le cache.
+        
+        Args:
+            cache_dir: Répertoire de stockage des résultats.
+            max_size_bytes: Taille totale maximale du cache (les entrées les
+                            moins récemment utilisées sont supprimées au-delà).
+            compression_level: Niveau de compression zlib (0 à 9).
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.compression_level = compression_level
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(self, strategy: Strategy, data: pd.DataFrame, initial_capital: float = 10000.0,
+                 position_size: float = 1.0, commission: float = 0.0,
+                 cost_model: Optional[CostModel] = None) -> str:
+        """
+        Construit la clé d'un backtest.
+        
+        Args:
+            strategy: Stratégie testée.
+            data: DataFrame contenant les données de prix.
+            initial_capital: Capital initial.
+            position_size: Taille de la position (proportion du capital).
+            commission: Commission par transaction (proportion).
+            cost_model: Modèle de coûts de transaction.
+            
+        Returns:
+            Clé préfixée par l'étiquette de la classe de stratégie.
+        """
+        digest = hashlib.sha256()
+        digest.update(strategy_fingerprint(strategy).encode())
+        digest.update(data_fingerprint(data).encode())
+        digest.update(repr((float(initial_capital), float(position_size), float(commission))).encode())
+        if cost_model is not None:
+            digest.update(json.dumps(cost_model.params(), sort_keys=True).encode())
+        return f"{_class_tag(strategy)}-{digest.hexdigest()}"
+
+    def _path(self, key: str) -> str:
+        """Retourne le chemin du fichier d'une entrée."""
+        return os.path.join(self.cache_dir, f"{key}.bt")
+
+    def get(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict[str, float]]]:
+        """
+        Lit une entrée du cache.
+        
+        Args:
+            key: Clé de l'entrée.
+            
+        Returns:
+            Tuple (résultats, métriques) ou None si l'entrée est absente ou illisible.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+            results, metrics = pickle.loads(zlib.decompress(payload))
+        except FileNotFoundError:
+            return None
+        except (zlib.error, pickle.UnpicklingError, EOFError, ValueError):
+            # Entrée corrompue (écriture interrompue) : la supprimer
+            self._remove(path)
+            return None
+
+        # Mettre à jour la date d'accès pour l'éviction LRU
+        os.utime(path, None)
+        return results, metrics
+
+    def put(self, key: str, results: pd.DataFrame, metrics: Dict[str, float]) -> None:
+        """
+        Enregistre une entrée dans le cache puis applique l'éviction.
+        
+        Args:
+            key: Clé de l'entrée.
+            results: DataFrame des résultats du backtest.
+            metrics: Métriques de performance.
+        """
+        payload = zlib.compress(pickle.dumps((results, metrics), protocol=pickle.HIGHEST_PROTOCOL),
+                                self.compression_level)
+        path = self._path(key)
+        # Écriture atomique : un lecteur concurrent ne voit jamais de fichier partiel
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def backtest(self, strategy: Strategy, data: pd.DataFrame, initial_capital: float = 10000.0,
+                 position_size: float = 1.0, commission: float = 0.0,
+                 cost_model: Optional[CostModel] = None) -> Tuple[pd.DataFrame, Dict[str, float]]:
+        """
+        Exécute un backtest en réutilisant le résultat en cache s'il existe.
+        
+        Args:
+            strategy: Stratégie à tester.
+            data: DataFrame contenant les données de prix.
+            initial_capital: Capital initial.
+            position_size: Taille de la position (proportion du capital).
+            commission: Commission par transaction (proportion).
+            cost_model: Modèle de coûts de transaction (voir `algotrading.costs`).
+            
+        Returns:
+            Tuple (résultats du backtest, métriques de performance).
+        """
+        key = self.make_key(strategy, data, initial_capital, position_size, commission, cost_model)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        results = strategy.backtest(data, initial_capital=initial_capital,
+                                    position_size=position_size, commission=commission,
+                                    cost_model=cost_model)
+        metrics = strategy.calculate_metrics(results)
+        self.put(key, results, metrics)
+        return results, metrics
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """Liste les entrées (date d'accès, taille, chemin)."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.bt'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        """Retourne la taille totale du cache en octets."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à respecter la taille maximale.
+        
+        Returns:
+            Nombre d'entrées supprimées.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_size_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def invalidate(self, strategy: Optional[Strategy] = None) -> int:
+        """
+        Invalide explicitement des entrées du cache.
+        
+        Sans argument, vide tout le cache. Avec une stratégie, seules les
+        entrées produites par la même classe de stratégie sont supprimées,
+        quels que soient ses paramètres et l'état de son code (utile après
+        une modification).
+        
+        Args:
+            strategy: Stratégie dont les entrées doivent être supprimées.
+            
+        Returns:
+            Nombre d'entrées supprimées.
+        """
+        prefix = _class_tag(strategy) + '-' if strategy is not None else ''
+        removed = 0
+        for _, _, path in self._entries():
+            if not os.path.basename(path).startswith(prefix):
+                continue
+            self._remove(path)
+            removed += 1
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Supprime un fichier d'entrée sans échouer s'il a déjà disparu."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,399 @@
+"""
+Interface en ligne de commande du système AlgoTrading.
+
+Sous-commandes : `backtest`, `sweep`, `ingest` et `bench`. Les modules lourds
+(pandas, numpy, stratégies) ne sont importés qu'au moment où une
+sous-commande en a besoin, pour que `--help` et les commandes légères
+démarrent immédiatement.
+
+Exemple de configuration JSON (TOML également accepté) :
+
+    {
+        "data": {"file": "prices.csv", "data_dir": "data", "date_col": "date"},
+        "indicators": true,
+        "strategy": {"type": "MovingAverageCrossover",
+                     "params": {"fast_window": 20, "slow_window": 50}},
+        "backtest": {"initial_capital": 10000, "commission": 0.001},
+        "output": {"results": "outputs/ma.csv", "metrics": "outputs/ma.json"}
+    }
+    
+Une configuration de `sweep` ajoute une grille de paramètres :
+`"grid": {"fast_window": [10, 20], "slow_window": [50, 100]}`.
+"""
+import argparse
+import importlib
+import itertools
+import json
+import os
+import sys
+from typing import Optional, Dict, List, Union, Tuple, Any
+
+
+# Stratégies connues par nom court ; un chemin 'module:Classe' est aussi accepté
+STRATEGIES = {
+    'MovingAverageCrossover': 'algotrading.strategy:MovingAverageCrossover',
+    'RSIStrategy': 'algotrading.strategy:RSIStrategy',
+}
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """
+    Charge un fichier de configuration JSON ou TOML.
+    
+    Args:
+        path: Chemin du fichier.
+        
+    Returns:
+        Dictionnaire de configuration.
+        
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas.
+        ValueError: Si l'extension n'est pas supportée.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Le fichier {path} n'existe pas.")
+
+    if path.endswith('.toml'):
+        import tomllib
+        with open(path, 'rb') as f:
+            config = tomllib.load(f)
+    elif path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    else:
+        raise ValueError(f"Format de configuration non supporté : {path} (JSON ou TOML attendu).")
+
+    # Les chemins relatifs sont résolus par rapport au fichier de configuration
+    config.setdefault('_base_dir', os.path.dirname(os.path.abspath(path)))
+    config.setdefault('_name', os.path.splitext(os.path.basename(path))[0])
+    return config
+
+
+def _resolve_path(config: Dict[str, Any], path: str) -> str:
+    """Résout un chemin relatif par rapport au répertoire de la configuration."""
+    return path if os.path.isabs(path) else os.path.join(config.get('_base_dir', '.'), path)
+
+
+def resolve_strategy_class(name: str) -> type:
+    """
+    Retrouve une classe de stratégie par nom court ou chemin 'module:Classe'.
+    
+    Args:
+        name: Nom de la stratégie.
+        
+    Returns:
+        Classe de la stratégie.
+        
+    Raises:
+        ValueError: Si la stratégie est inconnue.
+    """
+    target = STRATEGIES.get(name, name)
+    if ':' not in target:
+        raise ValueError(f"Stratégie inconnue : {name}. Stratégies disponibles : {', '.join(STRATEGIES)}.")
+    module_name, class_name = target.split(':', 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def build_strategy(spec: Dict[str, Any]):
+    """
+    Instancie une stratégie à partir de sa description {'type', 'params'}.
+    
+    Args:
+        spec: Description de la stratégie.
+        
+    Returns:
+        Instance de la stratégie.
+    """
+    strategy_class = resolve_strategy_class(spec['type'])
+    return strategy_class(**spec.get('params', {}))
+
+
+# Données déjà préparées dans ce processus, pour les grilles de paramètres
+_DATA_CACHE: Dict[str, Any] = {}
+
+
+def load_prepared_data(config: Dict[str, Any]):
+    """
+    Charge et prépare les données décrites par la section 'data' d'une configuration.
+    
+    Les données sont mémorisées dans le processus : les exécutions d'une même
+    grille ne relisent pas le fichier.
+    
+    Args:
+        config: Configuration complète.
+        
+    Returns:
+        DataFrame préparé (avec les indicateurs si 'indicators' est vrai).
+    """
+    key = json.dumps([config['data'], config.get('indicators', False), config.get('_base_dir')],
+                     sort_keys=True)
+    if key not in _DATA_CACHE:
+        _DATA_CACHE.clear()
+        _DATA_CACHE[key] = _load_prepared_data(config)
+    return _DATA_CACHE[key]
+
+
+def _load_prepared_data(config: Dict[str, Any]):
+    """Charge et prépare les données sans passer par le cache du processus."""
+    from algotrading.data_loader import DataLoader
+
+    data_config = config['data']
+    loader = DataLoader(_resolve_path(config, data_config.get('data_dir', 'data')))
+    df = loader.prepare_price_data(loader.load_csv(data_config['file']),
+                                   date_col=data_config.get('date_col', 'date'),
+                                   ohlcv_cols=data_config.get('ohlcv_cols'))
+    if config.get('indicators', False):
+        from algotrading.indicators import TechnicalIndicators
+        df = TechnicalIndicators.add_all_indicators(df)
+    return df
+
+
+def run_backtest_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Exécute le backtest décrit par une configuration.
+    
+    Fonction de niveau module pour pouvoir être exécutée dans un processus
+    de travail.
+    
+    Args:
+        config: Configuration (voir la documentation du module).
+        
+    Returns:
+        Dictionnaire avec le nom de la configuration, la stratégie et ses métriques.
+    """
+    strategy = build_strategy(config['strategy'])
+    backtest_args = config.get('backtest', {})
+    data = load_prepared_data(config)
+
+    if config.get('cache_dir'):
+        from algotrading.cache import BacktestCache
+        cache = BacktestCache(_resolve_path(config, config['cache_dir']))
+        results, metrics = cache.backtest(strategy, data, **backtest_args)
+    else:
+        results = strategy.backtest(data, **backtest_args)
+        metrics = strategy.calculate_metrics(results)
+
+    if config.get('results_db'):
+        from algotrading.results_store import ResultsStore
+        with ResultsStore(_resolve_path(config, config['results_db'])) as store:
+            store.record(strategy, results, metrics)
+
+    output = config.get('output', {})
+    if output.get('results'):
+        path = _resolve_path(config, output['results'])
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        results.to_csv(path)
+    if output.get('metrics'):
+        path = _resolve_path(config, output['metrics'])
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({k: float(v) for k, v in metrics.items()}, f, indent=2)
+
+    return {
+        'config': config.get('_name', ''),
+        'strategy': strategy.name,
+        'params': config['strategy'].get('params', {}),
+        'metrics': {k: float(v) for k, v in metrics.items()},
+    }
+
+
+def expand_grid(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Développe la grille de paramètres d'une configuration de `sweep`.
+    
+    Args:
+        config: Configuration contenant une clé 'grid'.
+        
+    Returns:
+        Liste de configurations, une par combinaison de paramètres.
+    """
+    grid = config.get('grid', {})
+    base_params = config['strategy'].get('params', {})
+    names = list(grid)
+    configs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(base_params, **dict(zip(names, values)))
+        run = {key: value for key, value in config.items() if key not in ('grid', 'output')}
+        run['strategy'] = dict(config['strategy'], params=params)
+        run['_name'] = f"{config.get('_name', 'sweep')}[{', '.join(f'{k}={v}' for k, v in zip(names, values))}]"
+        configs.append(run)
+    return configs
+
+
+def run_configs(configs: List[Dict[str, Any]], jobs: int = 1) -> List[Dict[str, Any]]:
+    """
+    Exécute une liste de configurations, en parallèle si `jobs` > 1.
+    
+    Args:
+        configs: Configurations à exécuter.
+        jobs: Nombre de processus de travail.
+        
+    Returns:
+        Résumés des exécutions, dans l'ordre des configurations.
+    """
+    if jobs <= 1 or len(configs) <= 1:
+        return [run_backtest_config(config) for config in configs]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(jobs, len(configs))) as executor:
+        return list(executor.map(run_backtest_config, configs))
+
+
+def _print_summaries(summaries: List[Dict[str, Any]]) -> None:
+    """Affiche les métriques des exécutions sous forme de tableau."""
+    if not summaries:
+        return
+    metric_names = list(summaries[0]['metrics'])
+    width = max(len(s['config']) for s in summaries)
+    print(f"{'configuration':<{width}}  " + "  ".join(f"{name:>17}" for name in metric_names))
+    for summary in summaries:
+        print(f"{summary['config']:<{width}}  "
+              + "  ".join(f"{summary['metrics'][name]:>17.4f}" for name in metric_names))
+
+
+def cmd_backtest(args: argparse.Namespace) -> int:
+    """Sous-commande `backtest` : exécute une ou plusieurs configurations."""
+    configs = [load_config(path) for path in args.configs]
+
+    if args.profile:
+        from algotrading.profiling import Profiler
+        with Profiler(track_memory=args.profile_memory) as profiler:
+            summaries = run_configs(configs, jobs=1)
+        profiler.to_chrome_trace(args.profile)
+        print(f"Trace enregistrée dans {args.profile}")
+    else:
+        summaries = run_configs(configs, jobs=args.jobs)
+
+    _print_summaries(summaries)
+    return 0
+
+
+def cmd_sweep(args: argparse.Namespace) -> int:
+    """Sous-commande `sweep` : explore une grille de paramètres."""
+    config = load_config(args.config)
+    configs = expand_grid(config)
+    summaries = run_configs(configs, jobs=args.jobs)
+
+    summaries.sort(key=lambda s: _sort_key(s['metrics'].get(args.sort_by)), reverse=True)
+    _print_summaries(summaries[:args.top] if args.top else summaries)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summaries, f, indent=2)
+        print(f"Résultats enregistrés dans {args.output}")
+    return 0
+
+
+def _sort_key(value: Optional[float]) -> float:
+    """Clé de tri plaçant les valeurs manquantes ou NaN en dernier."""
+    if value is None or value != value:
+        return float('-inf')
+    return value
+
+
+def cmd_ingest(args: argparse.Namespace) -> int:
+    """Sous-commande `ingest` : rejoue des connecteurs vers le stockage."""
+    import asyncio
+    from algotrading.ingestion import MarketDataIngestor, FileReplayConnector, CsvBarStore
+
+    config = load_config(args.config)
+    connectors = []
+    for spec in config['connectors']:
+        if spec.get('type', 'file') != 'file':
+            raise ValueError(f"Type de connecteur non supporté : {spec['type']}.")
+        connectors.append(FileReplayConnector(_resolve_path(config, spec['path']),
+                                              symbol=spec.get('symbol'),
+                                              delay=spec.get('delay', 0.0)))
+
+    store_config = dict(config.get('store', {}))
+    store_type = store_config.pop('type', 'csv')
+    data_dir = _resolve_path(config, store_config.pop('data_dir', 'data'))
+    if store_type == 'csv':
+        store = CsvBarStore(data_dir)
+    elif store_type == 'compressed':
+        from algotrading.storage import CompressedBarStore
+        store = CompressedBarStore(data_dir, **store_config)
+    else:
+        raise ValueError(f"Type de stockage non supporté : {store_type}.")
+    ingestor = MarketDataIngestor(connectors, store,
+                                  queue_size=config.get('queue_size', 10000),
+                                  batch_size=config.get('batch_size', 1000),
+                                  flush_interval=config.get('flush_interval', 1.0))
+    stats = asyncio.run(ingestor.run())
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+    return 0
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    """Sous-commande `bench` : délègue aux benchmarks (`python -m algotrading.benchmark`)."""
+    from algotrading import benchmark
+    return benchmark.main(args.bench_args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Construit l'analyseur d'arguments (sans importer les modules lourds).
+    
+    Returns:
+        Analyseur d'arguments.
+    """
+    parser = argparse.ArgumentParser(prog='algotrading',
+                                     description="Système de trading algorithmique.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    backtest = subparsers.add_parser('backtest', help="Exécuter des backtests à partir de configurations.")
+    backtest.add_argument('configs', nargs='+', help="Fichiers de configuration JSON ou TOML.")
+    backtest.add_argument('-j', '--jobs', type=int, default=1, help="Nombre de processus parallèles.")
+    backtest.add_argument('--profile', default=None,
+                          help="Enregistrer une trace Chrome des étapes (exécution séquentielle).")
+    backtest.add_argument('--profile-memory', action='store_true',
+                          help="Mesurer aussi le pic d'allocation par étape.")
+    backtest.set_defaults(func=cmd_backtest)
+
+    sweep = subparsers.add_parser('sweep', help="Explorer une grille de paramètres.")
+    sweep.add_argument('config', help="Fichier de configuration avec une clé 'grid'.")
+    sweep.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                       help="Nombre de processus parallèles.")
+    sweep.add_argument('--sort-by', default='sharpe_ratio', help="Métrique de classement.")
+    sweep.add_argument('--top', type=int, default=None, help="N'afficher que les N meilleurs.")
+    sweep.add_argument('--output', default=None, help="Fichier JSON des résultats.")
+    sweep.set_defaults(func=cmd_sweep)
+
+    ingest = subparsers.add_parser('ingest', help="Ingérer des données de marché.")
+    ingest.add_argument('config', help="Fichier de configuration des connecteurs et du stockage.")
+    ingest.set_defaults(func=cmd_ingest)
+
+    bench = subparsers.add_parser('bench', add_help=False,
+                                  help="Exécuter les benchmarks (options : algotrading bench --help).")
+    bench.add_argument('bench_args', nargs=argparse.REMAINDER)
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée de la ligne de commande.
+    
+    Args:
+        argv: Arguments (ceux de `sys.argv` par défaut).
+        
+    Returns:
+        Code de sortie.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    # Les options de `bench` sont transmises telles quelles au module de benchmark
+    # (argparse ne sait pas transmettre des options commençant par '-')
+    if argv and argv[0] == 'bench':
+        return cmd_bench(argparse.Namespace(bench_args=list(argv[1:])))
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""
+Module des modèles de coûts de transaction.
+
+Un modèle de coûts donne, pour chaque barre, le coût d'une transaction en
+proportion du montant échangé (commission fixe, demi-écart entre l'achat et
+la vente, impact de marché en racine carrée de la participation au volume)
+et éventuellement la quantité maximale échangeable (limite de capacité).
+Tous les calculs portent sur des tableaux NumPy, pour une seule série de
+positions ou une matrice (jeux de paramètres × barres).
+
+Le montant échangé est exprimé par rapport au capital initial : une
+variation de position de 1 correspond à un échange de `initial_capital`,
+ce qui permet d'observer l'effet de la taille du capital sur les résultats.
+"""
+import pandas as pd
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, List, Union, Tuple, Any
+
+
+def market_arrays(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Extrait les colonnes de marché utilisées par les modèles de coûts.
+    
+    Args:
+        data: DataFrame au format de `prepare_price_data`.
+        
+    Returns:
+        Dictionnaire 'close', 'high', 'low' et 'volume' (NaN si la colonne manque).
+    """
+    n = len(data)
+    arrays = {}
+    for key, column in [('close', 'Close'), ('high', 'High'), ('low', 'Low'), ('volume', 'Volume')]:
+        arrays[key] = data[column].to_numpy(dtype=np.float64) if column in data.columns else np.full(n, np.nan)
+    return arrays
+
+
+class CostModel(ABC):
+    """Interface commune des modèles de coûts de transaction."""
+
+    def params(self) -> Dict[str, Any]:
+        """
+        Description déterministe du modèle (classe et paramètres), sérialisable en JSON.
+        
+        Les modèles combinés sont décrits récursivement ; sert d'identité du
+        modèle dans les clés du cache des backtests.
+        
+        Returns:
+            Dictionnaire avec les clés 'class' et 'params'.
+        """
+        def describe(value: Any) -> Any:
+            if isinstance(value, CostModel):
+                return value.params()
+            if isinstance(value, (list, tuple)):
+                return [describe(v) for v in value]
+            if isinstance(value, np.generic):
+                return value.item()
+            return value
+
+        return {'class': f"{type(self).__module__}.{type(self).__qualname__}",
+                'params': {key: describe(value) for key, value in vars(self).items()}}
+
+    @abstractmethod
+    def cost_rate(self, market: Dict[str, np.ndarray], participation: np.ndarray) -> np.ndarray:
+        """
+        Coût d'une transaction en proportion du montant échangé.
+        
+        Args:
+            market: Colonnes de marché (voir `market_arrays`).
+            participation: Part du volume de la barre échangée (même forme que
+                           les positions, 0 sans volume connu).
+                           
+        Returns:
+            Taux de coût, diffusable sur la forme de `participation`.
+        """
+        pass
+
+    def capacity(self, market: Dict[str, np.ndarray], notional: float) -> Optional[np.ndarray]:
+        """
+        Variation maximale de position exécutable sur chaque barre.
+        
+        Args:
+            market: Colonnes de marché.
+            notional: Montant échangé pour une variation de position de 1.
+            
+        Returns:
+            Variation maximale par barre, ou None sans limite.
+        """
+        return None
+
+
+class FixedBps(CostModel):
+    """Coût fixe en points de base du montant échangé."""
+
+    def __init__(self, bps: float = 5.0):
+        """
+        Initialise le modèle.
+        
+        Args:
+            bps: Coût en points de base (0,01 %).
+        """
+        self.bps = bps
+
+    def cost_rate(self, market: Dict[str, np.ndarray], participation: np.ndarray) -> np.ndarray:
+        return np.asarray(self.bps * 1e-4)
+
+
+class SpreadCost(CostModel):
+    """Coût du demi-écart entre prix d'achat et de vente."""
+
+    def __init__(self, spread_bps: Optional[float] = None, range_fraction: float = 0.1):
+        """
+        Initialise le modèle.
+        
+        Args:
+            spread_bps: Écart fixe en points de base ; sinon l'écart est
+                        estimé par barre comme une fraction de l'amplitude
+                        (High - Low) / Close.
+            range_fraction: Fraction de l'amplitude de la barre retenue comme écart.
+        """
+        self.spread_bps = spread_bps
+        self.range_fraction = range_fraction
+
+    def cost_rate(self, market: Dict[str, np.ndarray], participation: np.ndarray) -> np.ndarray:
+        if self.spread_bps is not None:
+            return np.asarray(0.5 * self.spread_bps * 1e-4)
+        spread = self.range_fraction * (market['high'] - market['low']) / market['close']
+        return 0.5 * np.nan_to_num(spread)
+
+
+class SquareRootImpact(CostModel):
+    """Impact de marché proportionnel à la racine carrée de la participation au volume."""
+
+    def __init__(self, coefficient: float = 1.0, volatility_window: int = 20):
+        """
+        Initialise le modèle (coût = coefficient × volatilité × √participation).
+        
+        Args:
+            coefficient: Coefficient d'impact (de l'ordre de 1 en pratique).
+            volatility_window: Fenêtre de la volatilité des rendements par barre.
+        """
+        self.coefficient = coefficient
+        self.volatility_window = volatility_window
+
+    def cost_rate(self, market: Dict[str, np.ndarray], participation: np.ndarray) -> np.ndarray:
+        returns = pd.Series(market['close']).pct_change()
+        # Volatilité des seuls rendements passés ; nulle tant que moins de deux rendements sont connus
+        volatility = returns.rolling(self.volatility_window, min_periods=2).std().fillna(0.0)
+        return self.coefficient * volatility.to_numpy() * np.sqrt(participation)
+
+
+class CapacityLimit(CostModel):
+    """Limite la part du volume de chaque barre pouvant être échangée."""
+
+    def __init__(self, max_participation: float = 0.1):
+        """
+        Initialise le modèle.
+        
+        Args:
+            max_participation: Part maximale du volume d'une barre.
+        """
+        self.max_participation = max_participation
+
+    def cost_rate(self, market: Dict[str, np.ndarray], participation: np.ndarray) -> np.ndarray:
+        return np.asarray(0.0)
+
+    def capacity(self, market: Dict[str, np.ndarray], notional: float) -> Optional[np.ndarray]:
+        # Sans volume connu, aucune limite
+        tradable = self.max_participation * market['volume'] * market['close'] / notional
+        return np.where(np.isnan(tradable), np.inf, tradable)
+
+
+class CompositeCostModel(CostModel):
+    """Somme de plusieurs modèles de coûts (la capacité est la plus restrictive)."""
+
+    def __init__(self, models: List[CostModel]):
+        """
+        Initialise le modèle.
+        
+        Args:
+            models: Modèles combinés.
+        """
+        self.models = list(models)
+
+    def cost_rate(self, market: Dict[str, np.ndarray], participation: np.ndarray) -> np.ndarray:
+        return sum((model.cost_rate(market, participation) for model in self.models), np.asarray(0.0))
+
+    def capacity(self, market: Dict[str, np.ndarray], notional: float) -> Optional[np.ndarray]:
+        capacities = [c for c in (model.capacity(market, notional) for model in self.models) if c is not None]
+        return np.minimum.reduce(capacities) if capacities else None
+
+
+def apply_capacity(target: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+    """
+    Calcule la position exécutée sous une limite de variation par barre.
+    
+    La position exécutée se rapproche de la position voulue d'au plus
+    `capacity` par barre. Sur un segment où la position voulue T est
+    constante, partant de la position x, la position exécutée après les
+    barres du segment vaut clip(T, x - C, x + C), où C est la somme des
+    capacités depuis le début du segment (sommes cumulées des capacités).
+    Seule la position de départ de chaque segment dépend du segment
+    précédent : la boucle porte sur le rang des segments, chaque itération
+    traitant toutes les lignes à la fois, puis les positions de toutes les
+    barres sont calculées en une opération vectorisée.
+    
+    Args:
+        target: Positions voulues (barres, ou jeux de paramètres × barres).
+        capacity: Variation maximale par barre (une valeur par barre, inf sans limite).
+        
+    Returns:
+        Positions exécutées, de la forme de `target`.
+    """
+    target = np.asarray(target, dtype=np.float64)
+    one_dimensional = target.ndim == 1
+    target = np.atleast_2d(target)
+    n_rows, n_bars = target.shape
+
+    # Sommes cumulées des capacités finies et du nombre de barres sans limite
+    capacity = np.asarray(capacity, dtype=np.float64)
+    unlimited = np.isinf(capacity)
+    finite_sum = np.concatenate([[0.0], np.cumsum(np.where(unlimited, 0.0, capacity))])
+    unlimited_sum = np.concatenate([[0], np.cumsum(unlimited)])
+
+    # Segments de position voulue constante (la première barre ouvre toujours un segment)
+    starts = np.ones_like(target, dtype=bool)
+    starts[:, 1:] = target[:, 1:] != target[:, :-1]
+    segment = np.cumsum(starts, axis=1) - 1
+    rows, begins = np.nonzero(starts)
+    ranks = segment[rows, begins]
+    ends = np.append(begins[1:], n_bars)
+    ends[np.append(rows[1:] != rows[:-1], True)] = n_bars
+
+    # Segments par ligne complétés à la même longueur (capacité nulle au-delà)
+    n_segments = int(ranks.max()) + 1 if len(ranks) else 0
+    segment_target = np.zeros((n_rows, n_segments))
+    segment_reach = np.zeros((n_rows, n_segments))
+    segment_begin = np.zeros((n_rows, n_segments), dtype=np.int64)
+    segment_target[rows, ranks] = target[rows, begins]
+    segment_reach[rows, ranks] = np.where(unlimited_sum[ends] > unlimited_sum[begins], np.inf,
+                                          finite_sum[ends] - finite_sum[begins])
+    segment_begin[rows, ranks] = begins
+
+    # Position de départ de chaque segment (dépend de la fin du segment précédent)
+    segment_start = np.zeros((n_rows, n_segments))
+    current = np.zeros(n_rows)
+    for k in range(n_segments):
+        segment_start[:, k] = current
+        # Lignes sans segment de ce rang : capacité nulle, position inchangée
+        reach = segment_reach[:, k]
+        current = np.clip(segment_target[:, k], current - reach, current + reach)
+
+    # Position de chaque barre : départ du segment borné par la capacité cumulée
+    begin = segment_begin[np.arange(n_rows)[:, None], segment]
+    reach = np.where(unlimited_sum[1:][None, :] > unlimited_sum[begin], np.inf,
+                     finite_sum[1:][None, :] - finite_sum[begin])
+    start = segment_start[np.arange(n_rows)[:, None], segment]
+    executed = np.clip(target, start - reach, start + reach)
+    return executed[0] if one_dimensional else executed
+
+
+def apply_costs(position: np.ndarray, market: Dict[str, np.ndarray], cost_model: CostModel,
+                notional: float) -> Dict[str, np.ndarray]:
+    """
+    Applique un modèle de coûts à des positions voulues.
+    
+    Args:
+        position: Positions voulues (barres, ou jeux de paramètres × barres) ;
+                  une position indéfinie (NaN) vaut 0.
+        market: Colonnes de marché (voir `market_arrays`).
+        cost_model: Modèle de coûts.
+        notional: Montant échangé pour une variation de position de 1.
+        
+    Returns:
+        Dictionnaire de tableaux de la forme de `position` : 'executed'
+        (positions exécutées), 'trade' (variations exécutées), 'participation'
+        (part du volume) et 'cost' (coût en proportion du capital).
+    """
+    target = np.nan_to_num(np.asarray(position, dtype=np.float64))
+    two_dimensional = target.ndim == 2
+    target = np.atleast_2d(target)
+
+    capacity = cost_model.capacity(market, notional)
+    if capacity is None:
+        executed = target
+    else:
+        executed = apply_capacity(target, capacity)
+
+    trade = np.abs(np.diff(executed, axis=1, prepend=0.0))
+    # Part du volume échangée (0 si le volume n'est pas connu)
+    shares_volume = market['volume'] * market['close']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        participation = np.where(shares_volume > 0, trade * notional / shares_volume, 0.0)
+    cost = trade * cost_model.cost_rate(market, participation)
+
+    results = {'executed': executed, 'trade': trade, 'participation': participation, 'cost': cost}
+    return results if two_dimensional else {key: values[0] for key, values in results.items()}
@@ -0,0 +1,268 @@
+"""
+Module de calcul incrémental des matrices de covariance des rendements.
+
+Les matrices sont mises à jour à chaque nouvelle barre par des corrections
+de rang un (O(N²) par barre au lieu de O(N²·fenêtre)), sur une fenêtre
+glissante ou avec une pondération exponentielle. Un mode par lot parcourt
+une matrice de rendements historique (dates × symboles) pour les
+backtests, et les matrices obtenues alimentent une allocation pondérée par
+la volatilité.
+"""
+import pandas as pd
+import numpy as np
+from typing import Optional, Dict, List, Union, Tuple, Iterator
+
+
+class RollingCovariance:
+    """Covariance sur une fenêtre glissante, mise à jour barre par barre."""
+
+    def __init__(self, n_assets: int, window: int, recompute_every: Optional[int] = None):
+        """
+        Initialise la covariance glissante.
+        
+        Args:
+            n_assets: Nombre de symboles.
+            window: Taille de la fenêtre (en barres).
+            recompute_every: Nombre de mises à jour entre deux recalculs
+                             exacts depuis la fenêtre, qui éliminent la
+                             dérive numérique des corrections successives
+                             (la taille de la fenêtre par défaut).
+                             
+        Raises:
+            ValueError: Si la fenêtre est inférieure à 2.
+        """
+        if window < 2:
+            raise ValueError("La fenêtre doit contenir au moins 2 barres.")
+        self.n_assets = n_assets
+        self.window = window
+        self.recompute_every = recompute_every or window
+        self._buffer = np.zeros((window, n_assets))
+        self._sum = np.zeros(n_assets)
+        self._products = np.zeros((n_assets, n_assets))
+        self._position = 0
+        self._updates = 0
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        """Indique si la fenêtre est complète."""
+        return self.count >= self.window
+
+    def update(self, returns: np.ndarray) -> None:
+        """
+        Ajoute les rendements d'une nouvelle barre.
+        
+        Les rendements manquants (NaN) sont comptés comme nuls.
+        
+        Args:
+            returns: Rendements des symboles pour la barre.
+        """
+        x = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+        old = self._buffer[self._position]
+
+        # Correction de rang un : ajout de la nouvelle barre, retrait de la plus ancienne
+        self._sum += x - old
+        self._products += np.outer(x, x) - np.outer(old, old)
+        self._buffer[self._position] = x
+        self._position = (self._position + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+
+        self._updates += 1
+        if self._updates % self.recompute_every == 0:
+            self._recompute()
+
+    def _recompute(self) -> None:
+        """Recalcule exactement les sommes depuis la fenêtre."""
+        self._sum = self._buffer.sum(axis=0)
+        self._products = self._buffer.T @ self._buffer
+
+    def mean(self) -> np.ndarray:
+        """Moyenne des rendements sur la fenêtre."""
+        return self._sum / max(self.count, 1)
+
+    def covariance(self, ddof: int = 1) -> np.ndarray:
+        """
+        Matrice de covariance sur la fenêtre.
+        
+        Args:
+            ddof: Correction du nombre de degrés de liberté.
+            
+        Returns:
+            Matrice N × N (NaN si la fenêtre contient trop peu de barres).
+        """
+        n = self.count
+        if n <= ddof:
+            return np.full((self.n_assets, self.n_assets), np.nan)
+        mean = self._sum / n
+        return (self._products - n * np.outer(mean, mean)) / (n - ddof)
+
+    def correlation(self) -> np.ndarray:
+        """Matrice de corrélation sur la fenêtre."""
+        return covariance_to_correlation(self.covariance())
+
+
+class EWMACovariance:
+    """Covariance à pondération exponentielle, mise à jour barre par barre."""
+
+    def __init__(self, n_assets: int, alpha: Optional[float] = None,
+                 halflife: Optional[float] = None, span: Optional[float] = None):
+        """
+        Initialise la covariance exponentielle.
+        
+        Un seul des paramètres alpha, halflife ou span doit être fourni,
+        avec la même signification que dans `pandas.DataFrame.ewm`.
+        
+        Args:
+            n_assets: Nombre de symboles.
+            alpha: Facteur de lissage (0 < alpha <= 1).
+            halflife: Demi-vie en barres.
+            span: Portée en barres.
+            
+        Raises:
+            ValueError: Si le nombre de paramètres de lissage n'est pas 1.
+        """
+        given = [value is not None for value in (alpha, halflife, span)]
+        if sum(given) != 1:
+            raise ValueError("Fournir exactement un paramètre parmi alpha, halflife et span.")
+        if halflife is not None:
+            alpha = 1 - np.exp(-np.log(2) / halflife)
+        elif span is not None:
+            alpha = 2 / (span + 1)
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha doit être dans ]0, 1].")
+
+        self.n_assets = n_assets
+        self.alpha = float(alpha)
+        self._mean = np.zeros(n_assets)
+        self._covariance = np.zeros((n_assets, n_assets))
+        self.count = 0
+
+    def update(self, returns: np.ndarray) -> None:
+        """
+        Ajoute les rendements d'une nouvelle barre.
+        
+        Les rendements manquants (NaN) sont comptés comme nuls.
+        
+        Args:
+            returns: Rendements des symboles pour la barre.
+        """
+        x = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+        if self.count == 0:
+            self._mean = x.copy()
+        else:
+            deviation = x - self._mean
+            self._mean += self.alpha * deviation
+            self._covariance = (1 - self.alpha) * (self._covariance
+                                                   + self.alpha * np.outer(deviation, deviation))
+        self.count += 1
+
+    def mean(self) -> np.ndarray:
+        """Moyenne exponentielle des rendements."""
+        return self._mean.copy()
+
+    def covariance(self) -> np.ndarray:
+        """Matrice de covariance exponentielle (NaN avant deux barres)."""
+        if self.count < 2:
+            return np.full((self.n_assets, self.n_assets), np.nan)
+        return self._covariance.copy()
+
+    def correlation(self) -> np.ndarray:
+        """Matrice de corrélation exponentielle."""
+        return covariance_to_correlation(self.covariance())
+
+
+def covariance_to_correlation(covariance: np.ndarray) -> np.ndarray:
+    """
+    Convertit une matrice de covariance en matrice de corrélation.
+    
+    Args:
+        covariance: Matrice N × N.
+        
+    Returns:
+        Matrice de corrélation (NaN pour les symboles de variance nulle).
+    """
+    std = np.sqrt(np.diag(covariance))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = covariance / np.outer(std, std)
+    return np.where(np.outer(std, std) > 0, correlation, np.nan)
+
+
+def iter_covariances(returns: pd.DataFrame, window: Optional[int] = None,
+                     halflife: Optional[float] = None, step: int = 1,
+                     min_periods: Optional[int] = None) -> Iterator[Tuple[pd.Timestamp, np.ndarray]]:
+    """
+    Parcourt une matrice de rendements historique et produit les covariances.
+    
+    Les matrices sont mises à jour de façon incrémentale ; seules celles
+    d'une barre sur `step` sont produites, sans jamais matérialiser le
+    tableau dates × N × N.
+    
+    Args:
+        returns: Rendements (dates × symboles).
+        window: Taille de la fenêtre glissante.
+        halflife: Demi-vie de la pondération exponentielle (à la place de `window`).
+        step: Intervalle (en barres) entre deux matrices produites.
+        min_periods: Nombre de barres avant la première matrice produite
+                     (la fenêtre, ou 2 en exponentiel, par défaut).
+                     
+    Yields:
+        Tuples (date, matrice de covariance N × N).
+        
+    Raises:
+        ValueError: Si ni `window` ni `halflife` (ou les deux) n'est fourni.
+    """
+    if (window is None) == (halflife is None):
+        raise ValueError("Fournir exactement un paramètre parmi window et halflife.")
+
+    n_assets = returns.shape[1]
+    if window is not None:
+        engine: Union[RollingCovariance, EWMACovariance] = RollingCovariance(n_assets, window)
+        min_periods = window if min_periods is None else min_periods
+    else:
+        engine = EWMACovariance(n_assets, halflife=halflife)
+        min_periods = 2 if min_periods is None else min_periods
+
+    values = returns.to_numpy(dtype=np.float64)
+    for i, date in enumerate(returns.index):
+        engine.update(values[i])
+        if i + 1 >= min_periods and (i + 1 - min_periods) % step == 0:
+            yield date, engine.covariance()
+
+
+def volatility_scaled_weights(covariance: np.ndarray, target_volatility: float = 0.10,
+                              weights: Optional[np.ndarray] = None, periods_per_year: int = 252,
+                              max_leverage: float = 1.0) -> np.ndarray:
+    """
+    Calcule des poids de portefeuille ajustés à une volatilité cible.
+    
+    Sans poids de départ, chaque symbole est pondéré par l'inverse de sa
+    volatilité. Les poids sont ensuite mis à l'échelle pour que la
+    volatilité annualisée du portefeuille atteigne la cible, dans la limite
+    du levier maximal (somme des valeurs absolues des poids).
+    
+    Args:
+        covariance: Matrice de covariance des rendements par barre.
+        target_volatility: Volatilité annualisée visée.
+        weights: Poids de départ (inverse de la volatilité par défaut).
+        periods_per_year: Nombre de barres par an.
+        max_leverage: Levier maximal.
+        
+    Returns:
+        Poids des symboles (nuls pour les symboles sans covariance définie).
+    """
+    covariance = np.nan_to_num(np.asarray(covariance, dtype=np.float64))
+    volatility = np.sqrt(np.diag(covariance))
+
+    if weights is None:
+        weights = np.divide(1.0, volatility, out=np.zeros_like(volatility), where=volatility > 0)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    portfolio_volatility = np.sqrt(max(weights @ covariance @ weights, 0.0) * periods_per_year)
+    if portfolio_volatility == 0:
+        return np.zeros_like(weights)
+
+    scaled = weights * target_volatility / portfolio_volatility
+    leverage = np.abs(scaled).sum()
+    if leverage > max_leverage:
+        scaled *= max_leverage / leverage
+    return scaled
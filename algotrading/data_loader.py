@@ -4,7 +4,10 @@ Module pour charger et préparer les données financières.
 import os
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict, List, Union, Tuple
+from typing import Optional, Dict, List, Union, Tuple, Iterator, Any
+
+from algotrading.profiling import instrument
+from algotrading.validation import validate_price_data, repair_price_data
 
 
 class DataLoader:
@@ -19,6 +22,7 @@ class DataLoader:
         """
         self.data_dir = data_dir
         
+    @instrument('load_csv')
     def load_csv(self, filename: str) -> pd.DataFrame:
         """
         Charge les données à partir d'un fichier CSV.
@@ -49,9 +53,47 @@ class DataLoader:
                 
         return df
     
+    def iter_csv_chunks(self, filename: str, chunksize: int = 100000,
+                        date_col: str = 'date',
+                        ohlcv_cols: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Lit un fichier CSV par blocs et prépare chaque bloc pour l'analyse.
+        
+        Le fichier doit être trié par date : chaque bloc est trié
+        indépendamment par `prepare_price_data`.
+        
+        Args:
+            filename: Nom du fichier dans le répertoire de données.
+            chunksize: Nombre de lignes par bloc.
+            date_col: Nom de la colonne contenant les dates.
+            ohlcv_cols: Dictionnaire mappant les types de colonnes aux noms de colonnes.
+            
+        Returns:
+            Itérateur de DataFrames préparés.
+            
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas.
+        """
+        file_path = os.path.join(self.data_dir, filename)
+        
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Le fichier {file_path} n'existe pas.")
+        
+        with pd.read_csv(file_path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                # Conversion des dates comme dans load_csv
+                for col in [col for col in chunk.columns if 'date' in col.lower()]:
+                    try:
+                        chunk[col] = pd.to_datetime(chunk[col])
+                    except (ValueError, TypeError):
+                        pass
+                yield self.prepare_price_data(chunk, date_col=date_col, ohlcv_cols=ohlcv_cols)
+    
+    @instrument('prepare_price_data')
     def prepare_price_data(self, df: pd.DataFrame, 
                           date_col: str = 'date',
-                          ohlcv_cols: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+                          ohlcv_cols: Optional[Dict[str, str]] = None,
+                          validate: bool = False, repair: bool = False) -> pd.DataFrame:
         """
         Prépare les données de prix pour l'analyse.
         
@@ -60,9 +102,19 @@ class DataLoader:
             date_col: Nom de la colonne contenant les dates.
             ohlcv_cols: Dictionnaire mappant les types de colonnes aux noms de colonnes.
                         Doit contenir les clés 'open', 'high', 'low', 'close', 'volume'.
+            validate: Contrôler la qualité des données (voir `validate_price_data`,
+                      qui retourne le rapport complet) et lever une erreur si
+                      elles ne sont pas valides. Seules les colonnes présentes
+                      sont contrôlées.
+            repair: Corriger les données (voir `repair_price_data`) au lieu de
+                    lever une erreur.
                         
         Returns:
             DataFrame préparé pour l'analyse.
+            
+        Raises:
+            ValueError: Si une colonne n'existe pas, ou si `validate` est
+                demandé sans `repair` et que les données ne sont pas valides.
         """
         # Colonnes par défaut si non spécifiées
         if ohlcv_cols is None:
@@ -87,6 +139,16 @@ class DataLoader:
         rename_dict = {v: k.capitalize() for k, v in ohlcv_cols.items()}
         df = df.rename(columns=rename_dict)
         
+        # Corriger, ou contrôler avant le tri pour détecter les dates désordonnées
+        if repair:
+            return repair_price_data(df)
+        if validate:
+            report = validate_price_data(df)
+            if not report['valid']:
+                problems = ', '.join(f"{check} : {count}" for check, count in report['counts'].items() if count)
+                raise ValueError(f"Données de prix invalides ({problems}) ; "
+                                 "voir validate_price_data ou utiliser repair=True.")
+        
         # Trier par date
         df = df.sort_index()
         
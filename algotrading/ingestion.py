@@ -0,0 +1,381 @@
+"""
+Module d'ingestion asynchrone des données de marché.
+
+Les connecteurs produisent des messages bruts (Binance, Oanda ou format
+générique) qui sont normalisés au format de `DataLoader.prepare_price_data`,
+regroupés par lots puis ajoutés au stockage sur disque. Les files d'attente
+sont bornées : un consommateur lent ralentit les producteurs au lieu de
+faire croître la mémoire sans limite.
+"""
+import asyncio
+import json
+import os
+import pandas as pd
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, List, Union, Tuple, Any, AsyncIterator
+
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Alias acceptés pour les messages au format générique
+_FIELD_ALIASES = {
+    'symbol': ('symbol', 's', 'instrument'),
+    'date': ('date', 'timestamp', 'time', 't'),
+    'Open': ('open', 'Open', 'o'),
+    'High': ('high', 'High', 'h'),
+    'Low': ('low', 'Low', 'l'),
+    'Close': ('close', 'Close', 'c'),
+    'Volume': ('volume', 'Volume', 'v'),
+}
+
+
+def _first_present(message: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """Retourne la valeur de la première clé présente dans le message."""
+    for key in keys:
+        if key in message:
+            return message[key]
+    return None
+
+
+def _parse_timestamp(value: Any) -> pd.Timestamp:
+    """Convertit un horodatage (ISO, secondes ou millisecondes epoch) en Timestamp."""
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # Les horodatages Binance sont en millisecondes
+        unit = 'ms' if value > 1e11 else 's'
+        return pd.Timestamp(value, unit=unit)
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return timestamp
+
+
+def normalize_message(message: Dict[str, Any],
+                      default_symbol: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Normalise un message brut en une barre OHLCV.
+    
+    Formats reconnus :
+        - Binance kline : {"e": "kline", "s": ..., "k": {"t", "o", "h", "l", "c", "v"}}
+        - Oanda candle : {"instrument": ..., "time": ..., "mid": {"o", "h", "l", "c"}, "volume": ...}
+        - Générique : {"symbol", "date"/"timestamp", "open", "high", "low", "close", "volume"}
+        
+    Args:
+        message: Message brut reçu du connecteur.
+        default_symbol: Symbole utilisé si le message n'en contient pas.
+        
+    Returns:
+        Dictionnaire avec les clés 'symbol', 'date', 'Open', 'High', 'Low',
+        'Close', 'Volume', ou None si le message n'est pas une barre de prix.
+    """
+    # Binance : les données de la bougie sont dans la clé 'k'
+    if isinstance(message.get('k'), dict):
+        kline = message['k']
+        fields = dict(kline)
+        fields.setdefault('s', message.get('s'))
+    # Oanda : les prix sont dans 'mid' (ou 'bid'/'ask')
+    elif any(isinstance(message.get(key), dict) for key in ('mid', 'bid', 'ask')):
+        prices = next(message[key] for key in ('mid', 'bid', 'ask')
+                      if isinstance(message.get(key), dict))
+        fields = dict(message)
+        fields.update(prices)
+    else:
+        fields = message
+
+    symbol = _first_present(fields, _FIELD_ALIASES['symbol']) or default_symbol
+    timestamp = _first_present(fields, _FIELD_ALIASES['date'])
+    close = _first_present(fields, _FIELD_ALIASES['Close'])
+
+    if symbol is None or timestamp is None or close is None:
+        return None
+
+    bar = {'symbol': str(symbol), 'date': _parse_timestamp(timestamp)}
+    for column in OHLCV_COLUMNS:
+        value = _first_present(fields, _FIELD_ALIASES[column])
+        if value is None:
+            # Un tick sans OHLC complet devient une barre plate
+            value = 0.0 if column == 'Volume' else close
+        bar[column] = float(value)
+
+    return bar
+
+
+def bars_to_frame(bars: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Convertit une liste de barres normalisées d'un même symbole en DataFrame.
+    
+    Les mises à jour successives d'une même barre (même horodatage) sont
+    fusionnées : la dernière reçue l'emporte, comme pour les klines Binance
+    non clôturées.
+    
+    Args:
+        bars: Barres normalisées par `normalize_message`.
+        
+    Returns:
+        DataFrame indexé par 'date', trié, au format de `prepare_price_data`.
+    """
+    df = pd.DataFrame(bars, columns=['date'] + OHLCV_COLUMNS)
+    df = df.drop_duplicates(subset='date', keep='last')
+    df = df.set_index('date').sort_index()
+    return df
+
+
+class CsvBarStore:
+    """Stockage sur disque des barres, un fichier CSV par symbole."""
+
+    def __init__(self, data_dir: str = "data"):
+        """
+        Initialise le stockage.
+        
+        Args:
+            data_dir: Répertoire contenant les fichiers CSV (lisibles par `DataLoader`).
+        """
+        self.data_dir = data_dir
+        self._last_dates: Dict[str, Optional[pd.Timestamp]] = {}
+        os.makedirs(data_dir, exist_ok=True)
+
+    def path_for(self, symbol: str) -> str:
+        """Retourne le chemin du fichier associé à un symbole."""
+        return os.path.join(self.data_dir, f"{symbol}.csv")
+
+    def _last_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Dernière date écrite pour un symbole (lue une fois dans le fichier existant)."""
+        if symbol not in self._last_dates:
+            path = self.path_for(symbol)
+            dates = pd.read_csv(path, usecols=['date'], parse_dates=['date'])['date'] \
+                if os.path.exists(path) else pd.Series(dtype='datetime64[ns]')
+            self._last_dates[symbol] = dates.max() if not dates.empty else None
+        return self._last_dates[symbol]
+
+    def append(self, symbol: str, bars: pd.DataFrame) -> None:
+        """
+        Ajoute des barres à la fin du fichier du symbole.
+        
+        Les barres arrivées en retard (à une date déjà écrite ou antérieure)
+        sont fusionnées avec le fichier, qui est réécrit trié : une barre de
+        même date remplace la barre stockée. Les barres postérieures sont
+        simplement ajoutées en fin de fichier.
+        
+        Args:
+            symbol: Symbole concerné.
+            bars: DataFrame indexé par 'date' avec les colonnes OHLCV.
+        """
+        if bars.empty:
+            return
+        bars = bars[OHLCV_COLUMNS].sort_index(kind='stable')
+        path = self.path_for(symbol)
+        last = self._last_date(symbol)
+
+        if last is not None and bars.index[0] <= last:
+            # Barres tardives : réécriture du fichier fusionné et trié
+            stored = pd.read_csv(path, index_col='date', parse_dates=['date'])
+            merged = pd.concat([stored[~stored.index.isin(bars.index)], bars]).sort_index(kind='stable')
+            merged.to_csv(path, index=True, index_label='date')
+            self._last_dates[symbol] = merged.index[-1]
+        else:
+            bars.to_csv(path, mode='a', header=not os.path.exists(path),
+                        index=True, index_label='date')
+            self._last_dates[symbol] = bars.index[-1]
+
+    def remove(self, symbol: str) -> None:
+        """Supprime le fichier d'un symbole (sans effet s'il n'existe pas)."""
+        path = self.path_for(symbol)
+        if os.path.exists(path):
+            os.remove(path)
+        self._last_dates.pop(symbol, None)
+
+
+class MarketDataConnector(ABC):
+    """Interface commune des connecteurs de données de marché."""
+
+    def __init__(self, name: str, symbol: Optional[str] = None):
+        """
+        Initialise le connecteur.
+        
+        Args:
+            name: Nom du connecteur (utilisé dans les statistiques).
+            symbol: Symbole par défaut des messages qui n'en contiennent pas
+                    (appliqué lors de la normalisation).
+        """
+        self.name = name
+        self.symbol = symbol
+
+    @abstractmethod
+    def messages(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Produit les messages bruts reçus de la source.
+        
+        Returns:
+            Itérateur asynchrone de messages (dictionnaires).
+        """
+        pass
+
+
+class FileReplayConnector(MarketDataConnector):
+    """
+    Connecteur rejouant un fichier local, en remplacement d'un flux websocket.
+    
+    Le fichier contient un message JSON par ligne (format Binance, Oanda ou
+    générique) ; les fichiers CSV sont rejoués ligne par ligne.
+    """
+
+    def __init__(self, path: str, symbol: Optional[str] = None, delay: float = 0.0):
+        """
+        Initialise le connecteur de rejeu.
+        
+        Args:
+            path: Chemin du fichier JSON lines ou CSV.
+            symbol: Symbole par défaut si les messages n'en contiennent pas.
+            delay: Pause (en secondes) entre deux messages pour simuler un flux.
+        """
+        super().__init__(f"replay:{os.path.basename(path)}", symbol)
+        self.path = path
+        self.delay = delay
+
+    async def messages(self) -> AsyncIterator[Dict[str, Any]]:
+        """Produit les messages du fichier un par un."""
+        for row in self._rows():
+            yield row
+            # Rendre la main à la boucle pour laisser travailler le consommateur
+            await asyncio.sleep(self.delay)
+
+    def _rows(self):
+        """Lit le fichier ligne par ligne sans le charger entièrement."""
+        if self.path.endswith('.csv'):
+            for chunk in pd.read_csv(self.path, chunksize=10000):
+                yield from chunk.to_dict(orient='records')
+        else:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+
+class MarketDataIngestor:
+    """Pipeline asynchrone connecteurs -> normalisation -> écritures par lots."""
+
+    def __init__(self, connectors: List[MarketDataConnector], store: Any,
+                 queue_size: int = 10000, batch_size: int = 1000,
+                 flush_interval: float = 1.0):
+        """
+        Initialise l'ingestion.
+        
+        Args:
+            connectors: Connecteurs à consommer en parallèle.
+            store: Stockage disposant d'une méthode `append(symbol, bars)`.
+            queue_size: Taille maximale de la file (contre-pression au-delà).
+            batch_size: Nombre de messages au-delà duquel un lot est écrit.
+            flush_interval: Délai maximal (en secondes) avant l'écriture d'un lot.
+        """
+        if queue_size <= 0:
+            raise ValueError("queue_size doit être strictement positif.")
+        self.connectors = connectors
+        self.store = store
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = {
+            'messages': 0,
+            'rejected': 0,
+            'bars_written': 0,
+            'batches': 0,
+            'max_queue_depth': 0,
+        }
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+    async def _produce(self, connector: MarketDataConnector, queue: asyncio.Queue) -> None:
+        """Normalise les messages d'un connecteur et les place dans la file."""
+        async for message in connector.messages():
+            bar = normalize_message(message, connector.symbol)
+            if bar is None:
+                self.stats['rejected'] += 1
+                continue
+            # Bloque tant que la file est pleine : contre-pression
+            await queue.put(bar)
+            self.stats['messages'] += 1
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], queue.qsize())
+
+    async def _flush(self, batch: List[Dict[str, Any]], final: bool = False) -> None:
+        """
+        Regroupe un lot par symbole et l'écrit hors de la boucle d'événements.
+        
+        La barre la plus récente de chaque symbole est conservée en attente
+        (elle peut encore recevoir des mises à jour) et n'est écrite qu'avec
+        le lot suivant ou à la fin du flux.
+        """
+        by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+        for bar in batch:
+            by_symbol.setdefault(bar['symbol'], []).append(bar)
+        if final:
+            for symbol in self._pending:
+                by_symbol.setdefault(symbol, [])
+
+        loop = asyncio.get_running_loop()
+        for symbol, bars in by_symbol.items():
+            pending = self._pending.pop(symbol, None)
+            frame = bars_to_frame(([pending] if pending is not None else []) + bars)
+            if not final:
+                last = frame.iloc[-1]
+                self._pending[symbol] = dict(last, symbol=symbol, date=frame.index[-1])
+                frame = frame.iloc[:-1]
+            if frame.empty:
+                continue
+            await loop.run_in_executor(None, self.store.append, symbol, frame)
+            self.stats['bars_written'] += len(frame)
+        self.stats['batches'] += 1
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        """Vide la file par lots jusqu'à la réception du marqueur de fin."""
+        loop = asyncio.get_running_loop()
+        batch: List[Dict[str, Any]] = []
+        deadline = loop.time() + self.flush_interval
+        done = False
+
+        while not done:
+            timeout = max(deadline - loop.time(), 0.0)
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                item = None
+            else:
+                if item is _END:
+                    done = True
+                else:
+                    batch.append(item)
+                    # Récupérer sans attendre ce qui est déjà disponible
+                    while len(batch) < self.batch_size and not queue.empty():
+                        next_item = queue.get_nowait()
+                        if next_item is _END:
+                            done = True
+                            break
+                        batch.append(next_item)
+
+            if batch and (len(batch) >= self.batch_size or loop.time() >= deadline):
+                await self._flush(batch)
+                batch = []
+            if done:
+                await self._flush(batch, final=True)
+            if loop.time() >= deadline:
+                deadline = loop.time() + self.flush_interval
+
+    async def run(self) -> Dict[str, int]:
+        """
+        Exécute l'ingestion jusqu'à épuisement de tous les connecteurs.
+        
+        Returns:
+            Statistiques de l'ingestion (messages, lots, barres écrites...).
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        consumer = asyncio.create_task(self._consume(queue))
+        try:
+            await asyncio.gather(*(self._produce(c, queue) for c in self.connectors))
+            await queue.put(_END)
+            await consumer
+        finally:
+            if not consumer.done():
+                consumer.cancel()
+        return dict(self.stats)
+
+
+# Marqueur de fin de flux placé dans la file
+_END = object()
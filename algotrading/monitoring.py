@@ -0,0 +1,386 @@
+"""
+Module de suivi en temps réel des stratégies en cours d'exécution.
+
+Un `StrategyMonitor` collecte, barre par barre ou bloc par bloc, les
+positions, le capital, le drawdown, les latences par étape et le débit
+d'événements. Les historiques sont conservés dans des tampons circulaires
+de taille fixe : l'enregistrement coûte quelques microsecondes et la
+mémoire reste constante quelle que soit la durée d'exécution.
+`MetricsServer` expose ces mesures sur un petit serveur HTTP local, au
+format JSON (/snapshot) ou texte Prometheus (/metrics).
+"""
+import json
+import math
+import threading
+import time
+import pandas as pd
+import numpy as np
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, List, Union, Tuple, Any, Iterator
+
+
+class RingBuffer:
+    """Tampon circulaire de valeurs numériques de taille fixe."""
+
+    __slots__ = ('capacity', '_data', '_count')
+
+    def __init__(self, capacity: int = 1024, dtype: Any = np.float64):
+        """
+        Initialise le tampon.
+        
+        Args:
+            capacity: Nombre maximal de valeurs conservées.
+            dtype: Type des valeurs.
+        """
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._count = 0
+
+    def append(self, value: float) -> None:
+        """Ajoute une valeur, en remplaçant la plus ancienne si le tampon est plein."""
+        self._data[self._count % self.capacity] = value
+        self._count += 1
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Nombre de valeurs ajoutées depuis la création."""
+        return self._count
+
+    def last(self) -> Optional[float]:
+        """Dernière valeur ajoutée (None si le tampon est vide)."""
+        return self._data[(self._count - 1) % self.capacity] if self._count else None
+
+    def values(self) -> np.ndarray:
+        """Copie des valeurs conservées, de la plus ancienne à la plus récente."""
+        if self._count <= self.capacity:
+            return self._data[:self._count].copy()
+        start = self._count % self.capacity
+        return np.concatenate([self._data[start:], self._data[:start]])
+
+
+def _clean(value: Any) -> Any:
+    """Convertit une valeur NumPy en valeur JSON (NaN devient None)."""
+    if isinstance(value, (np.floating, float)):
+        value = float(value)
+        return None if math.isnan(value) or math.isinf(value) else value
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+class StrategyMonitor:
+    """Collecteur des mesures d'une stratégie en cours d'exécution."""
+
+    def __init__(self, name: str, capacity: int = 1024, initial_capital: Optional[float] = None):
+        """
+        Initialise le collecteur.
+        
+        Args:
+            name: Nom de la stratégie (étiquette des métriques).
+            capacity: Taille des tampons circulaires (historique du capital,
+                      des latences et des événements).
+            initial_capital: Capital initial (plus haut du capital de départ).
+        """
+        self.name = name
+        self.capacity = capacity
+        self.positions: Dict[str, float] = {}
+        self.equity = initial_capital if initial_capital is not None else np.nan
+        self.peak_equity = self.equity
+        self.max_drawdown = 0.0
+        self.events = 0
+        self.equity_history = RingBuffer(capacity)
+        self._latencies: Dict[str, RingBuffer] = {}
+        self._latency_sums: Dict[str, float] = {}
+        self._event_times = RingBuffer(capacity)
+        self._event_counts = RingBuffer(capacity)
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def drawdown(self) -> float:
+        """Drawdown courant par rapport au plus haut du capital."""
+        if not self.peak_equity > 0:
+            return 0.0
+        return (self.equity - self.peak_equity) / self.peak_equity
+
+    def record_bar(self, symbol: str, position: float, equity: float, n_events: int = 1) -> None:
+        """
+        Enregistre l'état après une barre (ou un bloc de barres).
+        
+        Args:
+            symbol: Symbole concerné.
+            position: Position courante.
+            equity: Capital courant.
+            n_events: Nombre de barres traitées depuis le dernier enregistrement.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            self.positions[symbol] = position
+            self.equity = equity
+            if not self.peak_equity >= equity:
+                self.peak_equity = equity
+            drawdown = self.drawdown
+            if drawdown < self.max_drawdown:
+                self.max_drawdown = drawdown
+            self.equity_history.append(equity)
+            self.events += n_events
+            self._event_times.append(now)
+            self._event_counts.append(n_events)
+
+    def record_results(self, results: pd.DataFrame, symbol: str = 'default') -> None:
+        """
+        Enregistre un bloc de résultats de backtest (par exemple de `backtest_chunked`).
+        
+        Args:
+            results: Résultats avec les colonnes 'Position' et 'Capital'.
+            symbol: Symbole concerné.
+        """
+        if results.empty:
+            return
+        drawdown = results['Drawdown'].min() if 'Drawdown' in results.columns else np.nan
+        self.record_bar(symbol, results['Position'].iloc[-1], results['Capital'].iloc[-1], len(results))
+        # Le plus bas du bloc peut être antérieur à sa dernière barre
+        with self._lock:
+            if drawdown < self.max_drawdown:
+                self.max_drawdown = drawdown
+
+    def record_latency(self, stage: str, seconds: float) -> None:
+        """
+        Enregistre la durée d'une étape.
+        
+        Args:
+            stage: Nom de l'étape.
+            seconds: Durée en secondes.
+        """
+        with self._lock:
+            buffer = self._latencies.get(stage)
+            if buffer is None:
+                buffer = self._latencies[stage] = RingBuffer(self.capacity)
+                self._latency_sums[stage] = 0.0
+            buffer.append(seconds)
+            self._latency_sums[stage] += seconds
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """
+        Mesure la durée d'un bloc de code.
+        
+        Args:
+            stage: Nom de l'étape.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_latency(stage, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retourne l'état courant des mesures.
+        
+        Les statistiques de latence et le débit portent sur les derniers
+        enregistrements conservés dans les tampons.
+        
+        Returns:
+            Dictionnaire sérialisable en JSON.
+        """
+        with self._lock:
+            latencies = {}
+            for stage, buffer in self._latencies.items():
+                values = buffer.values()
+                latencies[stage] = {
+                    'count': buffer.total,
+                    'total_s': self._latency_sums[stage],
+                    'mean_s': float(values.mean()),
+                    'p50_s': float(np.percentile(values, 50)),
+                    'p99_s': float(np.percentile(values, 99)),
+                    'max_s': float(values.max()),
+                }
+
+            times = self._event_times.values()
+            counts = self._event_counts.values()
+            # Débit sur la fenêtre des enregistrements conservés (le premier sert d'origine)
+            elapsed = times[-1] - times[0] if len(times) > 1 else 0.0
+            throughput = counts[1:].sum() / elapsed if elapsed > 0 else 0.0
+
+            return {
+                'strategy': self.name,
+                'uptime_s': time.perf_counter() - self._started,
+                'events': self.events,
+                'records': self._event_times.total,
+                'positions': {symbol: _clean(position) for symbol, position in self.positions.items()},
+                'equity': _clean(self.equity),
+                'peak_equity': _clean(self.peak_equity),
+                'drawdown': _clean(self.drawdown),
+                'max_drawdown': _clean(self.max_drawdown),
+                'throughput_per_s': float(throughput),
+                'latencies': latencies,
+            }
+
+    def prometheus_text(self) -> str:
+        """
+        Retourne les mesures au format texte Prometheus.
+        
+        Returns:
+            Lignes `# TYPE` et `métrique{étiquettes} valeur` (voir `prometheus_text`).
+        """
+        return prometheus_text([self])
+
+    def prometheus_samples(self) -> List[Tuple[str, str]]:
+        """
+        Retourne les échantillons Prometheus des mesures courantes.
+        
+        Returns:
+            Liste de (famille de métriques, ligne `métrique{étiquettes} valeur`).
+        """
+        snapshot = self.snapshot()
+        label = f'strategy="{_escape_label(self.name)}"'
+        samples = []
+
+        def add(family: str, value: Any, labels: str = label, suffix: str = '') -> None:
+            samples.append((family, f"algotrading_{family}{suffix}{{{labels}}} "
+                                    f"{'NaN' if value is None else value}"))
+
+        add('uptime_seconds', snapshot['uptime_s'])
+        add('events_total', snapshot['events'])
+        add('equity', snapshot['equity'])
+        add('peak_equity', snapshot['peak_equity'])
+        add('drawdown', snapshot['drawdown'])
+        add('max_drawdown', snapshot['max_drawdown'])
+        add('throughput_per_second', snapshot['throughput_per_s'])
+        for symbol, position in snapshot['positions'].items():
+            add('position', position, f'{label},symbol="{_escape_label(symbol)}"')
+        for stage, stats in snapshot['latencies'].items():
+            stage_label = f'{label},stage="{_escape_label(stage)}"'
+            for key, quantile in (('p50_s', '0.5'), ('p99_s', '0.99')):
+                add('stage_latency_seconds', stats[key], f'{stage_label},quantile="{quantile}"')
+            add('stage_latency_seconds', stats['total_s'], stage_label, '_sum')
+            add('stage_latency_seconds', stats['count'], stage_label, '_count')
+        return samples
+
+
+# Familles de métriques Prometheus exposées, dans l'ordre de sortie, et leur type
+PROMETHEUS_TYPES = {
+    'uptime_seconds': 'gauge',
+    'events_total': 'counter',
+    'equity': 'gauge',
+    'peak_equity': 'gauge',
+    'drawdown': 'gauge',
+    'max_drawdown': 'gauge',
+    'throughput_per_second': 'gauge',
+    'position': 'gauge',
+    'stage_latency_seconds': 'summary',
+}
+
+
+def _escape_label(value: Any) -> str:
+    """Échappe une valeur d'étiquette Prometheus (barre oblique inverse, guillemet et saut de ligne)."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(monitors: List[StrategyMonitor]) -> str:
+    """
+    Retourne les mesures de plusieurs collecteurs au format texte Prometheus.
+    
+    Les échantillons de tous les collecteurs sont regroupés par famille de
+    métriques, chaque famille étant précédée d'une seule ligne `# TYPE`.
+    
+    Args:
+        monitors: Collecteurs exposés.
+        
+    Returns:
+        Texte d'exposition Prometheus.
+    """
+    families: Dict[str, List[str]] = {family: [] for family in PROMETHEUS_TYPES}
+    for monitor in monitors:
+        for family, line in monitor.prometheus_samples():
+            families[family].append(line)
+
+    lines = []
+    for family, samples in families.items():
+        if samples:
+            lines.append(f"# TYPE algotrading_{family} {PROMETHEUS_TYPES[family]}")
+            lines.extend(samples)
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """Serveur HTTP local exposant les mesures de plusieurs stratégies."""
+
+    def __init__(self, monitors: Union[StrategyMonitor, List[StrategyMonitor]],
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialise le serveur (sans le démarrer).
+        
+        Args:
+            monitors: Collecteur ou liste de collecteurs exposés.
+            host: Adresse d'écoute (locale par défaut).
+            port: Port d'écoute (0 pour un port libre choisi par le système).
+        """
+        self.monitors = [monitors] if isinstance(monitors, StrategyMonitor) else list(monitors)
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _handler(self) -> type:
+        """Crée la classe de traitement des requêtes liée à ce serveur."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                path = self.path.split('?')[0]
+                if path == '/metrics':
+                    body = prometheus_text(server.monitors).encode()
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif path == '/snapshot':
+                    body = json.dumps([monitor.snapshot() for monitor in server.monitors]).encode()
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # Pas de journal par requête
+                pass
+
+        return Handler
+
+    @property
+    def url(self) -> str:
+        """Adresse du serveur démarré."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MetricsServer':
+        """Démarre le serveur dans un thread démon."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='algotrading-metrics',
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Arrête le serveur."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> 'MetricsServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
@@ -0,0 +1,252 @@
+"""
+Module pour calculer des indicateurs sur des unités de temps supérieures.
+
+Les données OHLCV de base sont agrégées en une seule passe par unité de
+temps, les indicateurs sont calculés sur les barres agrégées puis réalignés
+sur l'index de base. Une barre agrégée n'est visible qu'à partir de la barre
+de base qui la termine : aucune information future n'est utilisée. Les
+nouvelles barres de base peuvent être ajoutées de façon incrémentale sans
+recalculer la série complète.
+"""
+import pandas as pd
+import numpy as np
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+from typing import Optional, Dict, List, Union, Tuple, Callable
+
+OHLCV_AGGREGATION = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum',
+}
+
+IndicatorFunction = Callable[[pd.DataFrame], Union[pd.Series, pd.DataFrame]]
+
+
+def resample_ohlcv(data: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """
+    Agrège des barres OHLCV dans une unité de temps supérieure.
+    
+    Chaque barre agrégée couvre l'intervalle [début, fin) et est indexée
+    par sa date de fin. Les règles de durée fixe ('4h', '1D') découpent le
+    temps à partir de l'époque ; les règles calendaires ('W', 'ME', 'MS')
+    couvrent des jours entiers, la barre mensuelle de janvier est ainsi
+    indexée au 1er février. Les intervalles sans barre de base sont
+    supprimés.
+    
+    Args:
+        data: DataFrame OHLCV indexé par date.
+        rule: Unité de temps pandas ('4h', '1D', 'W', ...).
+        
+    Returns:
+        DataFrame des barres agrégées.
+    """
+    aggregation = {column: how for column, how in OHLCV_AGGREGATION.items() if column in data.columns}
+    columns = data[list(aggregation)]
+    offset = to_offset(rule)
+    if isinstance(offset, pd.offsets.Day):
+        offset = to_offset(pd.Timedelta(days=offset.n))
+    if isinstance(offset, Tick):
+        # Intervalles de durée fixe ancrés sur l'époque : le découpage ne dépend
+        # pas de la première date, ce qui permet de réagréger une fin de série
+        resampled = columns.resample(offset, label='right', closed='left', origin='epoch').agg(aggregation)
+        return resampled.dropna(subset=['Close'])
+
+    # Périodes calendaires ('W', 'ME', 'MS', 'B', ...) : les barres sont
+    # rattachées à leur jour calendaire et regroupées selon les conventions
+    # pandas de l'offset, puis indexées par la fin de la période (minuit du
+    # jour qui suit son dernier jour)
+    grouper = pd.Grouper(freq=offset)
+    resampled = columns.set_axis(data.index.normalize()).resample(offset).agg(aggregation)
+    if grouper.label == 'right':
+        resampled.index = resampled.index + pd.Timedelta(days=1)
+    else:
+        resampled.index = resampled.index + offset
+    return resampled.dropna(subset=['Close'])
+
+
+def infer_bar_duration(index: pd.DatetimeIndex) -> pd.Timedelta:
+    """
+    Estime la durée d'une barre de base (médiane des écarts entre dates).
+    
+    Args:
+        index: Index de dates des barres de base.
+        
+    Returns:
+        Durée estimée (nulle si l'index a moins de deux dates).
+    """
+    if len(index) < 2:
+        return pd.Timedelta(0)
+    return pd.Series(index[:1001]).diff().median()
+
+
+def align_to_base(values: Union[pd.Series, pd.DataFrame], base_index: pd.DatetimeIndex,
+                  bar_duration: pd.Timedelta) -> Union[pd.Series, pd.DataFrame]:
+    """
+    Réaligne des valeurs calculées sur des barres agrégées sur l'index de base.
+    
+    La barre de base datée t se termine à t + bar_duration ; elle ne voit que
+    les barres agrégées dont la date de fin est antérieure ou égale.
+    
+    Args:
+        values: Valeurs indexées par date de fin des barres agrégées.
+        base_index: Index des barres de base.
+        bar_duration: Durée d'une barre de base.
+        
+    Returns:
+        Valeurs alignées sur l'index de base (NaN avant la première barre terminée).
+    """
+    if len(values) == 0:
+        return values.reindex(base_index)
+
+    ends = values.index.as_unit('ns').asi8
+    closes = (base_index + bar_duration).as_unit('ns').asi8
+    positions = np.searchsorted(ends, closes, side='right') - 1
+
+    taken = values.iloc[np.maximum(positions, 0)]
+    taken.index = base_index
+    visible = pd.Series(positions >= 0, index=base_index)
+    return taken.where(visible, axis=0) if isinstance(taken, pd.DataFrame) else taken.where(visible)
+
+
+class MultiTimeframeIndicators:
+    """Classe pour calculer des indicateurs sur plusieurs unités de temps."""
+
+    def __init__(self, timeframes: Dict[str, Dict[str, IndicatorFunction]],
+                 bar_duration: Optional[Union[str, pd.Timedelta]] = None,
+                 lookback: Optional[int] = None):
+        """
+        Initialise le calcul multi-unités de temps.
+        
+        Args:
+            timeframes: Indicateurs par unité de temps, par exemple
+                        {'1D': {'RSI': lambda d: TechnicalIndicators.rsi(d)}}.
+                        Une fonction retournant un DataFrame produit une
+                        colonne par colonne du résultat.
+            bar_duration: Durée d'une barre de base (déduite de l'index sinon).
+            lookback: Nombre maximal de barres agrégées utilisées pour
+                      recalculer les indicateurs lors d'une mise à jour
+                      (toutes par défaut).
+        """
+        self.timeframes = timeframes
+        self.bar_duration = pd.Timedelta(bar_duration) if bar_duration is not None else None
+        self.lookback = lookback
+        self.bars: Dict[str, pd.DataFrame] = {}
+        self.indicators: Dict[str, pd.DataFrame] = {}
+        self._pending: Optional[pd.DataFrame] = None
+
+    @staticmethod
+    def column_name(rule: str, name: str, column: Optional[str] = None) -> str:
+        """Nom de la colonne produite pour un indicateur."""
+        return f"{rule}_{name}" if column is None else f"{rule}_{name}_{column}"
+
+    def _compute_indicators(self, rule: str, bars: pd.DataFrame) -> pd.DataFrame:
+        """Calcule les indicateurs d'une unité de temps sur ses barres agrégées."""
+        columns = {}
+        for name, function in self.timeframes[rule].items():
+            values = function(bars)
+            if isinstance(values, pd.DataFrame):
+                for column in values.columns:
+                    columns[self.column_name(rule, name, column)] = values[column]
+            else:
+                columns[self.column_name(rule, name)] = values
+        return pd.DataFrame(columns, index=bars.index)
+
+    def _split_completed(self, bars: pd.DataFrame, last_close: pd.Timestamp) -> pd.DataFrame:
+        """Ne garde que les barres agrégées terminées à la clôture de la dernière barre de base."""
+        return bars[bars.index <= last_close]
+
+    def _align(self, base_index: pd.DatetimeIndex) -> pd.DataFrame:
+        """Réaligne les indicateurs de toutes les unités de temps sur un index de base."""
+        frames = [align_to_base(self.indicators[rule], base_index, self.bar_duration)
+                  for rule in self.timeframes]
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame(index=base_index)
+
+    def _keep_pending(self, data: pd.DataFrame) -> None:
+        """Conserve les barres de base appartenant à des barres agrégées non terminées."""
+        ends = [self.bars[rule].index[-1] if len(self.bars[rule]) else None for rule in self.timeframes]
+        if any(end is None for end in ends):
+            self._pending = data
+        else:
+            self._pending = data[data.index >= min(ends, default=data.index[-1])]
+
+    def compute(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcule les indicateurs sur toutes les unités de temps.
+        
+        Args:
+            data: DataFrame OHLCV de base indexé par date.
+            
+        Returns:
+            DataFrame des indicateurs alignés sur l'index de base.
+        """
+        if self.bar_duration is None:
+            self.bar_duration = infer_bar_duration(data.index)
+
+        last_close = data.index[-1] + self.bar_duration
+        for rule in self.timeframes:
+            self.bars[rule] = self._split_completed(resample_ohlcv(data, rule), last_close)
+            self.indicators[rule] = self._compute_indicators(rule, self.bars[rule])
+
+        self._keep_pending(data)
+        return self._align(data.index)
+
+    def add_to(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ajoute les indicateurs multi-unités de temps au DataFrame.
+        
+        Args:
+            data: DataFrame OHLCV de base indexé par date.
+            
+        Returns:
+            Copie du DataFrame avec les colonnes des indicateurs.
+        """
+        result = data.copy()
+        aligned = self.compute(data)
+        for column in aligned.columns:
+            result[column] = aligned[column]
+        return result
+
+    def update(self, new_bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ajoute de nouvelles barres de base et retourne leurs indicateurs.
+        
+        Seules les barres de base des barres agrégées non terminées sont
+        réagrégées ; les indicateurs sont recalculés sur les barres
+        agrégées (au plus `lookback`), jamais sur la série de base.
+        
+        Args:
+            new_bars: Nouvelles barres OHLCV, postérieures aux précédentes.
+            
+        Returns:
+            DataFrame des indicateurs alignés sur l'index des nouvelles barres.
+            
+        Raises:
+            RuntimeError: Si `compute` n'a pas été appelé auparavant.
+        """
+        if self._pending is None:
+            raise RuntimeError("compute doit être appelé avant update.")
+        if new_bars.empty:
+            return self._align(new_bars.index)
+
+        pending = pd.concat([self._pending, new_bars])
+        last_close = pending.index[-1] + self.bar_duration
+
+        for rule in self.timeframes:
+            bars = self.bars[rule]
+            completed = self._split_completed(resample_ohlcv(pending, rule), last_close)
+            if len(bars):
+                completed = completed[completed.index > bars.index[-1]]
+            if completed.empty:
+                continue
+
+            bars = pd.concat([bars, completed])
+            if self.lookback is not None:
+                bars = bars.iloc[-self.lookback:]
+            self.bars[rule] = bars
+            self.indicators[rule] = self._compute_indicators(rule, bars)
+
+        self._keep_pending(pending)
+        return self._align(new_bars.index)
@@ -0,0 +1,262 @@
+"""
+Module d'instrumentation des étapes du pipeline de backtest.
+
+L'instrumentation est désactivée par défaut : les fonctions décorées par
+`instrument` ne font alors qu'un test sur une variable globale. Elle s'active
+dans un bloc `with Profiler() as profiler:` qui collecte, pour chaque étape,
+le temps réel, le temps CPU, le nombre de lignes traitées et le pic
+d'allocation, puis exporte un résumé JSON ou une trace Chrome
+(chrome://tracing, Perfetto).
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import pandas as pd
+import numpy as np
+from contextlib import contextmanager, nullcontext
+from typing import Optional, Dict, List, Union, Tuple, Any, Callable, Iterator
+
+
+# Profileur actif (None lorsque l'instrumentation est désactivée)
+_ACTIVE: Optional['Profiler'] = None
+
+
+class _Frame:
+    """État d'une étape en cours d'exécution."""
+
+    __slots__ = ('stage', 'start', 'cpu_start', 'mem_start', 'peak')
+
+    def __init__(self, stage: str, start: float, cpu_start: float, mem_start: int):
+        self.stage = stage
+        self.start = start
+        self.cpu_start = cpu_start
+        self.mem_start = mem_start
+        self.peak = mem_start
+
+
+class Profiler:
+    """Collecteur des mesures par étape."""
+
+    def __init__(self, track_memory: bool = False):
+        """
+        Initialise le profileur.
+        
+        Args:
+            track_memory: Mesurer le pic d'allocation de chaque étape avec
+                          `tracemalloc` (ralentit sensiblement l'exécution).
+        """
+        self.track_memory = track_memory
+        self.events: List[Dict[str, Any]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._started_tracemalloc = False
+        self._previous: Optional[Profiler] = None
+
+    def __enter__(self) -> 'Profiler':
+        global _ACTIVE
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._previous = _ACTIVE
+        _ACTIVE = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        global _ACTIVE
+        _ACTIVE = self._previous
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _stack(self) -> List[_Frame]:
+        """Pile des étapes en cours pour le thread courant."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, stage: str, rows: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Mesure un bloc de code.
+        
+        Args:
+            stage: Nom de l'étape.
+            rows: Nombre de lignes traitées (modifiable via le dictionnaire produit).
+            
+        Yields:
+            Dictionnaire de l'événement, dont la clé 'rows' peut être renseignée
+            dans le bloc.
+        """
+        stack = self._stack()
+        tracking = self.track_memory and tracemalloc.is_tracing()
+        mem_start = 0
+        if tracking:
+            mem_start, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+
+        frame = _Frame(stage, time.perf_counter(), time.process_time(), mem_start)
+        event = {'stage': stage, 'rows': rows}
+        stack.append(frame)
+        try:
+            yield event
+        finally:
+            end = time.perf_counter()
+            cpu_end = time.process_time()
+            stack.pop()
+
+            peak_bytes = None
+            if tracking:
+                _, peak = tracemalloc.get_traced_memory()
+                absolute_peak = max(frame.peak, peak)
+                peak_bytes = absolute_peak - frame.mem_start
+                if stack:
+                    stack[-1].peak = max(stack[-1].peak, absolute_peak)
+
+            event.update({
+                'start': frame.start - self._origin,
+                'wall_s': end - frame.start,
+                'cpu_s': cpu_end - frame.cpu_start,
+                'peak_bytes': peak_bytes,
+                'depth': len(stack),
+                'thread': threading.get_ident(),
+            })
+            with self._lock:
+                self.events.append(event)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Agrège les mesures par étape.
+        
+        Returns:
+            Dictionnaire étape -> {'calls', 'wall_s', 'cpu_s', 'rows',
+            'rows_per_s', 'peak_mb'}.
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+        for event in self.events:
+            stats = stages.setdefault(event['stage'], {
+                'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rows': 0, 'peak_mb': None,
+            })
+            stats['calls'] += 1
+            stats['wall_s'] += event['wall_s']
+            stats['cpu_s'] += event['cpu_s']
+            stats['rows'] += event['rows'] or 0
+            if event['peak_bytes'] is not None:
+                peak_mb = event['peak_bytes'] / 1024 ** 2
+                stats['peak_mb'] = peak_mb if stats['peak_mb'] is None else max(stats['peak_mb'], peak_mb)
+
+        for stats in stages.values():
+            stats['rows_per_s'] = stats['rows'] / stats['wall_s'] if stats['wall_s'] > 0 else None
+        return stages
+
+    def to_json(self, path: str) -> None:
+        """
+        Exporte le résumé par étape et les événements bruts au format JSON.
+        
+        Args:
+            path: Chemin du fichier de sortie.
+        """
+        _write_json(path, {'summary': self.summary(), 'events': self.events})
+
+    def to_chrome_trace(self, path: str) -> None:
+        """
+        Exporte les événements au format Chrome Trace (chrome://tracing, Perfetto).
+        
+        Args:
+            path: Chemin du fichier de sortie.
+        """
+        pid = os.getpid()
+        trace_events = []
+        for event in self.events:
+            args = {'rows': event['rows'], 'cpu_ms': event['cpu_s'] * 1e3}
+            if event['peak_bytes'] is not None:
+                args['peak_mb'] = event['peak_bytes'] / 1024 ** 2
+            trace_events.append({
+                'name': event['stage'],
+                'cat': 'algotrading',
+                'ph': 'X',
+                'ts': event['start'] * 1e6,
+                'dur': event['wall_s'] * 1e6,
+                'pid': pid,
+                'tid': event['thread'],
+                'args': args,
+            })
+        _write_json(path, {'traceEvents': trace_events, 'displayTimeUnit': 'ms'})
+
+
+def _write_json(path: str, payload: Dict[str, Any]) -> None:
+    """Écrit un fichier JSON en créant le répertoire si nécessaire."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+
+
+def active_profiler() -> Optional[Profiler]:
+    """Retourne le profileur actif, ou None si l'instrumentation est désactivée."""
+    return _ACTIVE
+
+
+def span(stage: str, rows: Optional[int] = None):
+    """
+    Mesure un bloc de code avec le profileur actif (sans effet s'il n'y en a pas).
+    
+    Args:
+        stage: Nom de l'étape.
+        rows: Nombre de lignes traitées.
+        
+    Returns:
+        Gestionnaire de contexte.
+    """
+    profiler = _ACTIVE
+    if profiler is None:
+        return nullcontext({'stage': stage, 'rows': rows})
+    return profiler.span(stage, rows)
+
+
+def _count_rows(value: Any) -> Optional[int]:
+    """Retourne le nombre de lignes d'un DataFrame ou d'une Series."""
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(value)
+    return None
+
+
+def instrument(stage: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Décorateur mesurant chaque appel d'une fonction avec le profileur actif.
+    
+    Le nombre de lignes est celui du premier DataFrame passé en argument, ou
+    à défaut du résultat.
+    
+    Args:
+        stage: Nom de l'étape (nom de la fonction par défaut).
+        
+    Returns:
+        Décorateur.
+    """
+    def decorator(func: Callable) -> Callable:
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _ACTIVE
+            if profiler is None:
+                return func(*args, **kwargs)
+
+            rows = next((n for n in map(_count_rows, args) if n is not None), None)
+            with profiler.span(name, rows) as event:
+                result = func(*args, **kwargs)
+                if event['rows'] is None:
+                    event['rows'] = _count_rows(result)
+            return result
+
+        return wrapper
+
+    return decorator
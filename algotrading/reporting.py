@@ -0,0 +1,274 @@
+"""
+Module de génération des graphiques de backtest.
+
+Les séries sont sous-échantillonnées avant le tracé en préservant leur forme
+(minimum et maximum par colonne de pixels, ou LTTB), si bien que le coût du
+rendu et la taille des images ne dépendent plus du nombre de barres. Le
+rendu se fait sans affichage (backend Agg) et plusieurs rapports peuvent
+être produits en parallèle dans un pool de processus.
+"""
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, List, Union, Tuple, Any
+
+
+def minmax_indices(values: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Sélectionne le minimum et le maximum de chaque intervalle de points.
+    
+    Avec un intervalle par colonne de pixels, le tracé obtenu est identique
+    au tracé de tous les points.
+    
+    Args:
+        values: Valeurs de la série.
+        n_buckets: Nombre d'intervalles.
+        
+    Returns:
+        Indices triés des points conservés (premier et dernier inclus).
+    """
+    n = len(values)
+    if n_buckets <= 0 or n <= 2 * n_buckets:
+        return np.arange(n)
+
+    values = np.asarray(values, dtype=np.float64)
+    bucket_size = int(np.ceil(n / n_buckets))
+    n_buckets = int(np.ceil(n / bucket_size))
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = values
+    buckets = padded.reshape(n_buckets, bucket_size)
+
+    # Les NaN sont ignorés ; un intervalle entièrement NaN garde son premier point
+    all_nan = np.isnan(buckets).all(axis=1)
+    lows = np.where(np.isnan(buckets), np.inf, buckets).argmin(axis=1)
+    highs = np.where(np.isnan(buckets), -np.inf, buckets).argmax(axis=1)
+    lows[all_nan] = 0
+    highs[all_nan] = 0
+
+    offsets = np.arange(n_buckets) * bucket_size
+    indices = np.concatenate([offsets + lows, offsets + highs, [0, n - 1]])
+    indices = indices[indices < n]
+    return np.unique(indices)
+
+
+def lttb_indices(values: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Sélectionne des points par l'algorithme Largest-Triangle-Three-Buckets.
+    
+    Les valeurs NaN sont ignorées.
+    
+    Args:
+        values: Valeurs de la série (abscisses implicites 0..n-1).
+        n_out: Nombre de points à conserver.
+        
+    Returns:
+        Indices triés des points conservés.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(values))
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+
+    x = valid.astype(np.float64)
+    y = values[valid]
+    # Bornes des intervalles intermédiaires (le premier et le dernier point sont fixes)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        # Point moyen de l'intervalle suivant
+        avg_x = x[next_start:next_end].mean() if next_end > next_start else x[-1]
+        avg_y = y[next_start:next_end].mean() if next_end > next_start else y[-1]
+        # Aire du triangle (point précédent, candidat, point moyen suivant)
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(area.argmax())
+        selected[i + 1] = previous
+
+    return valid[selected]
+
+
+def downsample(series: pd.Series, n_points: int, method: str = 'minmax') -> pd.Series:
+    """
+    Sous-échantillonne une série en préservant sa forme.
+    
+    `n_points` est le budget de points de la série produite. En 'minmax',
+    chaque intervalle fournit deux points (minimum et maximum) : la série
+    est découpée en n_points // 2 intervalles, et pour obtenir un intervalle
+    par colonne de pixels il faut donc n_points = 2 × largeur du tracé.
+    
+    Args:
+        series: Série à réduire.
+        n_points: Nombre maximal de points conservés (hors premier et dernier
+                  points, toujours conservés en 'minmax').
+        method: 'minmax' (min et max par intervalle) ou 'lttb'.
+        
+    Returns:
+        Série réduite, avec l'index d'origine des points conservés.
+        
+    Raises:
+        ValueError: Si la méthode est inconnue.
+    """
+    if method == 'minmax':
+        indices = minmax_indices(series.to_numpy(dtype=np.float64), n_points // 2)
+    elif method == 'lttb':
+        indices = lttb_indices(series.to_numpy(dtype=np.float64), n_points)
+    else:
+        raise ValueError(f"Méthode de sous-échantillonnage inconnue : {method}.")
+    return series.iloc[indices]
+
+
+def prepare_report(data: pd.DataFrame, results: Dict[str, pd.DataFrame],
+                   n_points: int = 1600, method: str = 'minmax') -> Dict[str, Dict[str, pd.Series]]:
+    """
+    Sélectionne et sous-échantillonne les séries à tracer.
+    
+    Args:
+        data: DataFrame des prix et indicateurs.
+        results: Résultats de backtest par nom de stratégie.
+        n_points: Budget de points par série (voir `downsample` : 2 × largeur
+                  du tracé en pixels pour un intervalle min/max par colonne).
+        method: Méthode de sous-échantillonnage.
+        
+    Returns:
+        Séries réduites par panneau ('price', 'rsi', 'capital', 'drawdown').
+    """
+    panels: Dict[str, Dict[str, pd.Series]] = {'price': {}, 'rsi': {}, 'capital': {}, 'drawdown': {}}
+
+    for column, label in [('Close', 'Prix de clôture'), ('SMA20', 'SMA 20'), ('SMA50', 'SMA 50')]:
+        if column in data.columns:
+            panels['price'][label] = downsample(data[column], n_points, method)
+    if 'RSI' in data.columns:
+        panels['rsi']['RSI'] = downsample(data['RSI'], n_points, method)
+
+    for name, result in results.items():
+        panels['capital'][name] = downsample(result['Capital'], n_points, method)
+        if 'Drawdown' in result.columns:
+            panels['drawdown'][name] = downsample(result['Drawdown'], n_points, method)
+
+    return {panel: series for panel, series in panels.items() if series}
+
+
+def render_prepared(panels: Dict[str, Dict[str, pd.Series]], output_file: str,
+                    title: Optional[str] = None, width_px: int = 1600,
+                    height_px: int = 1000, dpi: int = 100) -> str:
+    """
+    Trace des séries déjà réduites dans un fichier image, sans affichage.
+    
+    Args:
+        panels: Séries par panneau (voir `prepare_report`).
+        output_file: Chemin de l'image produite.
+        title: Titre de la figure.
+        width_px: Largeur de l'image en pixels.
+        height_px: Hauteur de l'image en pixels.
+        dpi: Résolution de l'image.
+        
+    Returns:
+        Chemin de l'image produite.
+    """
+    # API objet de matplotlib : aucun état global pyplot ni fenêtre
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    titles = {
+        'price': 'Prix et moyennes mobiles',
+        'rsi': 'RSI',
+        'capital': 'Performance des stratégies',
+        'drawdown': 'Drawdown',
+    }
+
+    figure = Figure(figsize=(width_px / dpi, height_px / dpi), dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.subplots(len(panels), 1, sharex=True, squeeze=False)[:, 0]
+
+    for ax, (panel, series_by_label) in zip(axes, panels.items()):
+        for label, series in series_by_label.items():
+            ax.plot(series.index, series.values, label=label, linewidth=0.8)
+        if panel == 'rsi':
+            ax.axhline(y=70, color='r', linestyle='-', alpha=0.3)
+            ax.axhline(y=30, color='g', linestyle='-', alpha=0.3)
+        ax.set_title(titles.get(panel, panel))
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc='upper left')
+
+    if title:
+        figure.suptitle(title)
+    figure.tight_layout()
+
+    directory = os.path.dirname(output_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    figure.savefig(output_file)
+    return output_file
+
+
+def render_report(data: pd.DataFrame, results: Dict[str, pd.DataFrame], output_file: str,
+                  title: Optional[str] = None, width_px: int = 1600, height_px: int = 1000,
+                  dpi: int = 100, method: str = 'minmax') -> str:
+    """
+    Produit le rapport graphique d'un ou plusieurs backtests.
+    
+    Args:
+        data: DataFrame des prix et indicateurs.
+        results: Résultats de backtest par nom de stratégie.
+        output_file: Chemin de l'image produite.
+        title: Titre de la figure.
+        width_px: Largeur de l'image en pixels (fixe le nombre de points
+                  tracés : un intervalle min/max par colonne de pixels).
+        height_px: Hauteur de l'image en pixels.
+        dpi: Résolution de l'image.
+        method: Méthode de sous-échantillonnage ('minmax' ou 'lttb').
+        
+    Returns:
+        Chemin de l'image produite.
+    """
+    panels = prepare_report(data, results, 2 * width_px, method)
+    return render_prepared(panels, output_file, title, width_px, height_px, dpi)
+
+
+def _render_job(job: Dict[str, Any]) -> str:
+    """Rend un rapport préparé dans un processus de travail."""
+    return render_prepared(**job)
+
+
+def render_reports(reports: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[str]:
+    """
+    Produit plusieurs rapports en parallèle.
+    
+    Le sous-échantillonnage est fait dans le processus courant : seules les
+    séries réduites sont transmises aux processus de rendu.
+    
+    Args:
+        reports: Liste de dictionnaires avec les clés 'data', 'results' et
+                 'output_file', et optionnellement 'title', 'width_px',
+                 'height_px', 'dpi' et 'method'.
+        max_workers: Nombre de processus de rendu (tous les cœurs par défaut).
+        
+    Returns:
+        Chemins des images produites, dans l'ordre des rapports.
+    """
+    jobs = []
+    for report in reports:
+        width_px = report.get('width_px', 1600)
+        jobs.append({
+            'panels': prepare_report(report['data'], report['results'], 2 * width_px,
+                                     report.get('method', 'minmax')),
+            'output_file': report['output_file'],
+            'title': report.get('title'),
+            'width_px': width_px,
+            'height_px': report.get('height_px', 1000),
+            'dpi': report.get('dpi', 100),
+        })
+
+    if max_workers == 1 or len(jobs) <= 1:
+        return [_render_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_job, jobs))
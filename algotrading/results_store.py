@@ -0,0 +1,364 @@
+"""
+Module de stockage indexé des résultats de backtest.
+
+Chaque exécution est enregistrée dans une base SQLite locale avec ses
+métriques, ses paramètres, sa plage de données et une courbe de capital
+compressée. Les métriques et les paramètres sont indexés pour que les
+requêtes de classement restent rapides sur des centaines de milliers
+d'exécutions.
+"""
+import json
+import sqlite3
+import zlib
+import hashlib
+import datetime
+import pandas as pd
+import numpy as np
+from typing import Optional, Dict, List, Union, Tuple, Any, Iterable
+
+from algotrading.strategy import Strategy, _param_value
+
+
+METRIC_COLUMNS = [
+    'total_return',
+    'annual_return',
+    'annual_volatility',
+    'sharpe_ratio',
+    'max_drawdown',
+    'n_trades',
+    'win_rate',
+]
+
+_RUN_COLUMNS = [
+    'run_id', 'strategy', 'strategy_class', 'params', 'params_hash',
+    'data_start', 'data_end', 'n_bars', 'data_fingerprint', 'created_at',
+] + METRIC_COLUMNS
+
+_OPERATORS = {'<', '<=', '>', '>=', '=', '!='}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    strategy_class TEXT NOT NULL,
+    params TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    data_start TEXT,
+    data_end TEXT,
+    n_bars INTEGER,
+    data_fingerprint TEXT,
+    created_at TEXT NOT NULL,
+    {', '.join(f'{name} REAL' for name in METRIC_COLUMNS)},
+    extra_metrics TEXT
+);
+CREATE TABLE IF NOT EXISTS run_params (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value_num REAL,
+    value_text TEXT
+);
+CREATE TABLE IF NOT EXISTS equity_curves (
+    run_id INTEGER PRIMARY KEY REFERENCES runs(run_id) ON DELETE CASCADE,
+    n_points INTEGER NOT NULL,
+    timestamps BLOB,
+    capital BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_class ON runs(strategy_class);
+CREATE INDEX IF NOT EXISTS idx_runs_params_hash ON runs(params_hash);
+{''.join(f'CREATE INDEX IF NOT EXISTS idx_runs_{name} ON runs({name});' + chr(10) for name in METRIC_COLUMNS)}
+CREATE INDEX IF NOT EXISTS idx_params_num ON run_params(name, value_num, run_id);
+CREATE INDEX IF NOT EXISTS idx_params_text ON run_params(name, value_text, run_id);
+"""
+
+
+def strategy_params(strategy: Strategy) -> Dict[str, Any]:
+    """
+    Extrait les paramètres d'une stratégie (attributs d'instance hors nom).
+    
+    Args:
+        strategy: Stratégie dont on veut les paramètres.
+        
+    Returns:
+        Dictionnaire des paramètres sérialisables en JSON (voir `Strategy.params`).
+    """
+    return strategy.params()
+
+
+def _encode_equity(capital: pd.Series) -> Tuple[Optional[bytes], bytes]:
+    """Compresse une courbe de capital (horodatages en deltas, valeurs en float64)."""
+    values = np.ascontiguousarray(capital.to_numpy(dtype=np.float64))
+    timestamps = None
+    if isinstance(capital.index, pd.DatetimeIndex):
+        ns = capital.index.as_unit('ns').asi8
+        deltas = np.diff(ns, prepend=0)
+        timestamps = zlib.compress(deltas.astype(np.int64).tobytes(), 6)
+    return timestamps, zlib.compress(values.tobytes(), 6)
+
+
+def _decode_equity(timestamps: Optional[bytes], capital: bytes) -> pd.Series:
+    """Décompresse une courbe de capital."""
+    values = np.frombuffer(zlib.decompress(capital), dtype=np.float64)
+    if timestamps is None:
+        return pd.Series(values, name='Capital')
+    ns = np.cumsum(np.frombuffer(zlib.decompress(timestamps), dtype=np.int64))
+    return pd.Series(values, index=pd.DatetimeIndex(ns, name='date'), name='Capital')
+
+
+def _param_db_values(value: Any) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Convertit la valeur d'un paramètre en colonnes (value_num, value_text) de `run_params`.
+    
+    Utilisé à l'enregistrement et pour les filtres de `ResultsStore.query`,
+    afin que les deux côtés de la comparaison soient codés de la même façon
+    (listes et dictionnaires en JSON à clés triées).
+    """
+    value = _param_value(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value), None
+    if isinstance(value, (list, dict)):
+        return None, json.dumps(value, sort_keys=True)
+    return None, str(value)
+
+
+def _to_db_value(value: Any) -> Optional[float]:
+    """Convertit une métrique en valeur SQL (NaN et infinis deviennent NULL)."""
+    if value is None:
+        return None
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+class ResultsStore:
+    """Base locale des résultats de backtest, indexée par stratégie, paramètres et métriques."""
+
+    def __init__(self, path: str = "results.db"):
+        """
+        Ouvre (ou crée) la base de résultats.
+        
+        Args:
+            path: Chemin du fichier SQLite (':memory:' pour une base temporaire).
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if path != ':memory:':
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Ferme la connexion à la base."""
+        self.connection.close()
+
+    def __enter__(self) -> 'ResultsStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _insert(self, strategy: Strategy, results: pd.DataFrame,
+                metrics: Optional[Dict[str, float]], data_fingerprint: Optional[str],
+                store_equity: bool) -> int:
+        """Insère une exécution sans valider la transaction."""
+        if metrics is None:
+            metrics = strategy.calculate_metrics(results)
+        params = strategy_params(strategy)
+        params_json = json.dumps(params, sort_keys=True)
+        strategy_class = f"{type(strategy).__module__}.{type(strategy).__qualname__}"
+        params_hash = hashlib.sha1(f"{strategy_class}:{params_json}".encode()).hexdigest()
+
+        index = results.index
+        data_start = str(index[0]) if len(index) else None
+        data_end = str(index[-1]) if len(index) else None
+        extra = {k: v for k, v in metrics.items() if k not in METRIC_COLUMNS}
+
+        cursor = self.connection.execute(
+            f"INSERT INTO runs (strategy, strategy_class, params, params_hash, data_start, "
+            f"data_end, n_bars, data_fingerprint, created_at, {', '.join(METRIC_COLUMNS)}, "
+            f"extra_metrics) VALUES ({', '.join('?' * (10 + len(METRIC_COLUMNS)))})",
+            (strategy.name, strategy_class, params_json, params_hash, data_start, data_end,
+             len(results), data_fingerprint,
+             datetime.datetime.now(datetime.timezone.utc).isoformat(),
+             *(_to_db_value(metrics.get(name)) for name in METRIC_COLUMNS),
+             json.dumps(extra, default=float) if extra else None)
+        )
+        run_id = cursor.lastrowid
+
+        self.connection.executemany(
+            "INSERT INTO run_params (run_id, name, value_num, value_text) VALUES (?, ?, ?, ?)",
+            [(run_id, name, *_param_db_values(value)) for name, value in params.items()]
+        )
+
+        if store_equity and 'Capital' in results.columns:
+            timestamps, capital = _encode_equity(results['Capital'])
+            self.connection.execute(
+                "INSERT INTO equity_curves (run_id, n_points, timestamps, capital) VALUES (?, ?, ?, ?)",
+                (run_id, len(results), timestamps, capital)
+            )
+        return run_id
+
+    def record(self, strategy: Strategy, results: pd.DataFrame,
+               metrics: Optional[Dict[str, float]] = None,
+               data_fingerprint: Optional[str] = None, store_equity: bool = True) -> int:
+        """
+        Enregistre une exécution de backtest.
+        
+        Args:
+            strategy: Stratégie testée.
+            results: DataFrame des résultats du backtest.
+            metrics: Métriques déjà calculées (calculées si absentes).
+            data_fingerprint: Empreinte optionnelle des données utilisées.
+            store_equity: Enregistrer la courbe de capital compressée.
+            
+        Returns:
+            Identifiant de l'exécution.
+        """
+        with self.connection:
+            return self._insert(strategy, results, metrics, data_fingerprint, store_equity)
+
+    def record_many(self, runs: Iterable[Tuple[Strategy, pd.DataFrame, Optional[Dict[str, float]]]],
+                    data_fingerprint: Optional[str] = None, store_equity: bool = True) -> List[int]:
+        """
+        Enregistre plusieurs exécutions dans une seule transaction.
+        
+        Args:
+            runs: Itérable de tuples (stratégie, résultats, métriques ou None).
+            data_fingerprint: Empreinte optionnelle des données utilisées.
+            store_equity: Enregistrer les courbes de capital compressées.
+            
+        Returns:
+            Identifiants des exécutions, dans l'ordre.
+        """
+        with self.connection:
+            return [self._insert(strategy, results, metrics, data_fingerprint, store_equity)
+                    for strategy, results, metrics in runs]
+
+    def query(self, order_by: Optional[str] = 'sharpe_ratio', limit: Optional[int] = None,
+              ascending: bool = False, where: Optional[List[Tuple[str, str, Any]]] = None,
+              strategy_class: Optional[str] = None,
+              params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Recherche des exécutions.
+        
+        Args:
+            order_by: Colonne de tri (métrique ou colonne de `runs`).
+            limit: Nombre maximal de lignes.
+            ascending: Tri croissant si True.
+            where: Filtres (colonne, opérateur, valeur), par exemple
+                   [('max_drawdown', '>', -0.2)].
+            strategy_class: Nom de classe (court ou qualifié) pour filtrer.
+            params: Valeurs exactes de paramètres, par exemple {'window': 14}.
+            
+        Returns:
+            DataFrame des exécutions indexé par 'run_id' (paramètres décodés
+            dans la colonne 'params').
+            
+        Raises:
+            ValueError: Si une colonne ou un opérateur n'est pas autorisé.
+        """
+        clauses = []
+        args: List[Any] = []
+
+        for column, operator, value in where or []:
+            if column not in _RUN_COLUMNS:
+                raise ValueError(f"La colonne {column} n'existe pas dans le stockage des résultats.")
+            if operator not in _OPERATORS:
+                raise ValueError(f"L'opérateur {operator} n'est pas supporté.")
+            clauses.append(f"{column} {operator} ?")
+            args.append(value)
+
+        if strategy_class is not None:
+            clauses.append("(strategy_class = ? OR strategy_class LIKE ?)")
+            args.extend([strategy_class, f"%.{strategy_class}"])
+
+        for name, value in (params or {}).items():
+            value_num, value_text = _param_db_values(value)
+            column = 'value_num' if value_text is None else 'value_text'
+            clauses.append(f"run_id IN (SELECT run_id FROM run_params WHERE name = ? AND {column} = ?)")
+            args.extend([name, value_num if value_text is None else value_text])
+
+        if order_by is not None and order_by not in _RUN_COLUMNS:
+            raise ValueError(f"La colonne {order_by} n'existe pas dans le stockage des résultats.")
+
+        def select(extra_clause: Optional[str], n: Optional[int]) -> pd.DataFrame:
+            all_clauses = clauses + ([extra_clause] if extra_clause else [])
+            sql = f"SELECT {', '.join(_RUN_COLUMNS)} FROM runs"
+            if all_clauses:
+                sql += " WHERE " + " AND ".join(all_clauses)
+            if order_by is not None:
+                sql += f" ORDER BY {order_by} {'ASC' if ascending else 'DESC'}"
+            query_args = list(args)
+            if n is not None:
+                sql += " LIMIT ?"
+                query_args.append(int(n))
+            return pd.read_sql_query(sql, self.connection, params=query_args, index_col='run_id')
+
+        # Les métriques non définies (NULL) sont toujours classées en dernier. En
+        # tri décroissant, SQLite les place déjà en dernier ; en tri croissant,
+        # elles sont lues à part, pour que le tri utilise l'index de la colonne
+        # (un terme `IS NULL` dans ORDER BY imposerait un tri complet).
+        if order_by is None or not ascending:
+            df = select(None, limit)
+        else:
+            df = select(f"{order_by} IS NOT NULL", limit)
+            if limit is None or len(df) < limit:
+                remaining = None if limit is None else limit - len(df)
+                nulls = select(f"{order_by} IS NULL", remaining)
+                if not nulls.empty:
+                    df = pd.concat([df, nulls]) if not df.empty else nulls
+
+        df['params'] = df['params'].map(json.loads)
+        return df
+
+    def top(self, metric: str = 'sharpe_ratio', n: int = 20, **filters: Any) -> pd.DataFrame:
+        """
+        Retourne les meilleures exécutions selon une métrique.
+        
+        Args:
+            metric: Métrique de classement.
+            n: Nombre d'exécutions à retourner.
+            **filters: Arguments `where`, `strategy_class` et `params` de `query`.
+            
+        Returns:
+            DataFrame des n meilleures exécutions.
+        """
+        ascending = metric == 'annual_volatility'
+        return self.query(order_by=metric, limit=n, ascending=ascending, **filters)
+
+    def load_equity(self, run_id: int) -> pd.Series:
+        """
+        Charge la courbe de capital d'une exécution.
+        
+        Args:
+            run_id: Identifiant de l'exécution.
+            
+        Returns:
+            Série du capital indexée par date.
+            
+        Raises:
+            KeyError: Si aucune courbe n'est enregistrée pour cette exécution.
+        """
+        row = self.connection.execute(
+            "SELECT timestamps, capital FROM equity_curves WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Aucune courbe de capital pour l'exécution {run_id}.")
+        return _decode_equity(row[0], row[1])
+
+    def delete(self, run_ids: Iterable[int]) -> int:
+        """
+        Supprime des exécutions et leurs données associées.
+        
+        Args:
+            run_ids: Identifiants à supprimer.
+            
+        Returns:
+            Nombre d'exécutions supprimées.
+        """
+        with self.connection:
+            cursor = self.connection.executemany("DELETE FROM runs WHERE run_id = ?",
+                                                 [(int(run_id),) for run_id in run_ids])
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
@@ -0,0 +1,300 @@
+"""
+Module de recherche adaptative des paramètres de stratégie.
+
+Plutôt que d'évaluer toute une grille sur l'historique complet, les
+candidats sont évalués sur des portions croissantes de l'historique et les
+moins bons sont abandonnés tôt (successive halving). Une recherche
+aléatoire et une recherche bayésienne simplifiée (estimateur de Parzen
+structuré en arbre, TPE) sont aussi disponibles. Les indicateurs sont
+calculés une seule fois sur l'historique complet puis réutilisés d'un
+palier à l'autre.
+"""
+import math
+import pandas as pd
+import numpy as np
+from typing import Optional, Dict, List, Union, Tuple, Any, Callable
+
+from algotrading.strategy import Strategy
+
+
+def _space_values(spec: Union[List[Any], Tuple[Any, Any]], n_float_values: int = 21) -> List[Any]:
+    """Convertit la description d'un paramètre en liste de valeurs possibles."""
+    if isinstance(spec, tuple):
+        low, high = spec
+        if isinstance(low, int) and isinstance(high, int):
+            return list(range(low, high + 1))
+        return list(np.linspace(low, high, n_float_values))
+    return list(spec)
+
+
+class ParameterSearch:
+    """Recherche de paramètres avec évaluation sur des portions croissantes de l'historique."""
+
+    def __init__(self, strategy_class: type, space: Dict[str, Union[List[Any], Tuple[Any, Any]]],
+                 data: pd.DataFrame, metric: Union[str, Callable[[Dict[str, float]], float]] = 'sharpe_ratio',
+                 backtest_kwargs: Optional[Dict[str, Any]] = None,
+                 constraint: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 seed: int = 0):
+        """
+        Initialise la recherche.
+        
+        Args:
+            strategy_class: Classe de stratégie, instanciée avec les paramètres en arguments nommés.
+            space: Valeurs possibles par paramètre : liste de valeurs, ou
+                   tuple (min, max) d'entiers (bornes incluses) ou de réels.
+            data: DataFrame contenant les données de prix.
+            metric: Métrique de `calculate_metrics` à maximiser, ou fonction
+                    des métriques retournant le score.
+            backtest_kwargs: Arguments supplémentaires de `backtest`.
+            constraint: Fonction écartant les combinaisons invalides
+                        (par exemple oversold < overbought).
+            seed: Graine du générateur aléatoire.
+        """
+        self.strategy_class = strategy_class
+        self.space = {name: _space_values(spec) for name, spec in space.items()}
+        self.data = data
+        self.metric = metric
+        self.backtest_kwargs = backtest_kwargs or {}
+        self.constraint = constraint
+        self.rng = np.random.default_rng(seed)
+        self.history: List[Dict[str, Any]] = []
+        self.bars_evaluated = 0
+        self._scores: Dict[Tuple[Tuple[str, Any], ...], Dict[int, float]] = {}
+        self._indicators: Dict[Any, pd.Series] = {}
+
+    @property
+    def grid_size(self) -> int:
+        """Nombre de combinaisons de la grille complète (avant contrainte)."""
+        return math.prod(len(values) for values in self.space.values())
+
+    def _key(self, params: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+        return tuple(sorted(params.items()))
+
+    def _is_valid(self, params: Dict[str, Any]) -> bool:
+        return self.constraint is None or bool(self.constraint(params))
+
+    def _prepared_data(self, params: Dict[str, Any]) -> pd.DataFrame:
+        """Retourne les données avec les indicateurs de la stratégie, calculés une seule fois."""
+        indicators = self.strategy_class(**params).required_indicators()
+        if not indicators:
+            return self.data
+
+        columns = {}
+        for column, (cache_key, compute) in indicators.items():
+            if cache_key not in self._indicators:
+                self._indicators[cache_key] = compute(self.data)
+            columns[column] = self._indicators[cache_key]
+        return self.data.assign(**columns)
+
+    def _score(self, metrics: Dict[str, float]) -> float:
+        value = self.metric(metrics) if callable(self.metric) else metrics[self.metric]
+        value = float(value)
+        return value if np.isfinite(value) else -np.inf
+
+    def evaluate(self, params: Dict[str, Any], n_bars: Optional[int] = None, rung: int = 0) -> float:
+        """
+        Évalue une combinaison de paramètres sur les `n_bars` barres les plus récentes.
+        
+        Les indicateurs étant calculés sur l'historique complet puis tronqués,
+        ils sont déjà définis dès la première barre de la portion (la période
+        de chauffe est prise sur les barres qui la précèdent) ; la position
+        de départ est celle voulue par la stratégie sur cette première barre.
+        
+        Args:
+            params: Paramètres de la stratégie.
+            n_bars: Nombre de barres (historique complet par défaut).
+            rung: Palier de la recherche (pour l'historique).
+            
+        Returns:
+            Score (-inf si la métrique n'est pas définie).
+        """
+        n_bars = len(self.data) if n_bars is None else min(int(n_bars), len(self.data))
+        key = self._key(params)
+        cached = self._scores.setdefault(key, {})
+        if n_bars in cached:
+            return cached[n_bars]
+
+        data = self._prepared_data(params).iloc[len(self.data) - n_bars:]
+        strategy = self.strategy_class(**params)
+        results = strategy.backtest(data, **self.backtest_kwargs)
+        score = self._score(strategy.calculate_metrics(results))
+
+        cached[n_bars] = score
+        self.bars_evaluated += n_bars
+        self.history.append(dict(params, n_bars=n_bars, rung=rung, score=score))
+        return score
+
+    def sample(self, n: int) -> List[Dict[str, Any]]:
+        """
+        Tire des combinaisons distinctes et valides au hasard.
+        
+        Args:
+            n: Nombre de combinaisons souhaitées.
+            
+        Returns:
+            Liste de combinaisons (moins de n si l'espace est plus petit).
+        """
+        candidates: Dict[Tuple[Tuple[str, Any], ...], Dict[str, Any]] = {}
+        attempts = 0
+        while len(candidates) < n and attempts < 50 * n:
+            attempts += 1
+            params = {name: values[self.rng.integers(len(values))] for name, values in self.space.items()}
+            params = {k: v.item() if isinstance(v, np.generic) else v for k, v in params.items()}
+            if self._is_valid(params):
+                candidates.setdefault(self._key(params), params)
+        return list(candidates.values())
+
+    def _result(self) -> Dict[str, Any]:
+        """Construit le résultat à partir des évaluations sur l'historique complet."""
+        n_total = len(self.data)
+        best_key, best_score = None, None
+        for key, scores in self._scores.items():
+            # Les combinaisons sans évaluation complète ne sont retenues qu'à défaut
+            n_bars = n_total if n_total in scores else max(scores)
+            candidate = (n_bars == n_total, scores[n_bars])
+            if best_key is None or candidate > best_score:
+                best_key, best_score = key, candidate
+        return {
+            'best_params': dict(best_key) if best_key is not None else None,
+            'best_score': best_score[1] if best_key is not None else None,
+            'history': pd.DataFrame(self.history),
+            'n_evaluations': len(self.history),
+            'bars_evaluated': self.bars_evaluated,
+            'grid_cost': self.grid_size * n_total,
+        }
+
+    def random_search(self, n_candidates: int = 50, n_bars: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Recherche aléatoire.
+        
+        Args:
+            n_candidates: Nombre de combinaisons évaluées.
+            n_bars: Nombre de barres par évaluation (historique complet par défaut).
+            
+        Returns:
+            Dictionnaire avec 'best_params', 'best_score', 'history',
+            'n_evaluations', 'bars_evaluated' et 'grid_cost'.
+        """
+        for params in self.sample(n_candidates):
+            self.evaluate(params, n_bars)
+        return self._result()
+
+    def successive_halving(self, n_candidates: int = 81, eta: int = 3, min_fraction: float = 1 / 9,
+                           candidates: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Successive halving : évaluation sur des portions croissantes de l'historique.
+        
+        Au palier r, les candidats restants sont évalués sur
+        min_fraction * eta^r de l'historique et seul le meilleur tiers
+        (1/eta) passe au palier suivant, jusqu'à l'historique complet.
+        
+        Args:
+            n_candidates: Nombre de candidats tirés au hasard (si `candidates` est absent).
+            eta: Facteur de réduction entre deux paliers.
+            min_fraction: Portion de l'historique utilisée au premier palier.
+            candidates: Candidats explicites (par exemple une grille).
+            
+        Returns:
+            Dictionnaire de résultat (voir `random_search`).
+            
+        Raises:
+            ValueError: Si eta < 2 ou si min_fraction n'est pas dans ]0, 1].
+        """
+        if eta < 2:
+            raise ValueError("eta doit être supérieur ou égal à 2.")
+        if not 0 < min_fraction <= 1:
+            raise ValueError("min_fraction doit être dans ]0, 1].")
+
+        survivors = candidates if candidates is not None else self.sample(n_candidates)
+        survivors = [p for p in survivors if self._is_valid(p)]
+        n_total = len(self.data)
+        n_rungs = int(round(math.log(1 / min_fraction, eta))) + 1
+
+        for rung in range(n_rungs):
+            fraction = min(1.0, min_fraction * eta ** rung)
+            # Le dernier candidat restant passe directement à l'historique complet
+            last = rung == n_rungs - 1 or len(survivors) <= 1
+            n_bars = n_total if last else max(int(n_total * fraction), 2)
+            scores = [self.evaluate(params, n_bars, rung) for params in survivors]
+            if last:
+                break
+            n_keep = max(1, len(survivors) // eta)
+            order = np.argsort(scores, kind='stable')[::-1][:n_keep]
+            survivors = [survivors[i] for i in order]
+
+        return self._result()
+
+    def bayesian_search(self, n_iterations: int = 50, n_initial: int = 10, gamma: float = 0.25,
+                        n_samples: int = 64, n_bars: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Recherche bayésienne simplifiée (TPE sur des valeurs discrètes).
+        
+        Après `n_initial` tirages aléatoires, chaque itération sépare les
+        évaluations en « bonnes » (fraction gamma) et « mauvaises », estime
+        pour chaque paramètre la fréquence lissée de chaque valeur dans les
+        deux groupes, tire des candidats selon les fréquences des bonnes et
+        évalue celui qui maximise le rapport bonnes / mauvaises.
+        
+        Args:
+            n_iterations: Nombre total d'évaluations.
+            n_initial: Nombre d'évaluations aléatoires initiales.
+            gamma: Fraction des évaluations considérées comme bonnes.
+            n_samples: Nombre de candidats tirés par itération.
+            n_bars: Nombre de barres par évaluation (historique complet par défaut).
+            
+        Returns:
+            Dictionnaire de résultat (voir `random_search`).
+        """
+        evaluated: List[Tuple[Dict[str, Any], float]] = []
+        seen = set()
+        for params in self.sample(min(n_initial, n_iterations)):
+            evaluated.append((params, self.evaluate(params, n_bars)))
+            seen.add(self._key(params))
+
+        while len(evaluated) < n_iterations:
+            ranked = sorted(evaluated, key=lambda item: item[1], reverse=True)
+            n_good = max(1, int(math.ceil(gamma * len(ranked))))
+            good = [p for p, _ in ranked[:n_good]]
+            bad = [p for p, _ in ranked[n_good:]]
+
+            densities = {}
+            for name, values in self.space.items():
+                index = {self._value_key(v): i for i, v in enumerate(values)}
+                good_counts = np.ones(len(values))
+                bad_counts = np.ones(len(values))
+                for p in good:
+                    good_counts[index[self._value_key(p[name])]] += 1
+                for p in bad:
+                    bad_counts[index[self._value_key(p[name])]] += 1
+                densities[name] = (good_counts / good_counts.sum(), bad_counts / bad_counts.sum())
+
+            best_candidate, best_ratio = None, -np.inf
+            for _ in range(n_samples):
+                params, ratio = {}, 0.0
+                for name, values in self.space.items():
+                    l_density, g_density = densities[name]
+                    i = self.rng.choice(len(values), p=l_density)
+                    value = values[i]
+                    params[name] = value.item() if isinstance(value, np.generic) else value
+                    ratio += np.log(l_density[i]) - np.log(g_density[i])
+                if self._key(params) in seen or not self._is_valid(params):
+                    continue
+                if ratio > best_ratio:
+                    best_candidate, best_ratio = params, ratio
+
+            if best_candidate is None:
+                # Aucun nouveau candidat : compléter par un tirage aléatoire
+                fresh = [p for p in self.sample(n_samples) if self._key(p) not in seen]
+                if not fresh:
+                    break
+                best_candidate = fresh[0]
+
+            seen.add(self._key(best_candidate))
+            evaluated.append((best_candidate, self.evaluate(best_candidate, n_bars)))
+
+        return self._result()
+
+    @staticmethod
+    def _value_key(value: Any) -> Any:
+        """Clé de comparaison d'une valeur (les réels numpy et Python sont confondus)."""
+        return round(float(value), 12) if isinstance(value, (float, np.floating)) else value
@@ -0,0 +1,303 @@
+"""
+Module de partage des données de prix entre processus.
+
+Les données sont chargées une seule fois par le processus principal puis
+publiées dans des segments de mémoire partagée (`multiprocessing.shared_memory`)
+décrits par un petit manifeste sérialisable. Les processus de travail
+s'y attachent sans copie et obtiennent des vues NumPy en lecture seule ou
+des DataFrames construits sur ces vues.
+
+Le processus principal libère les segments à sa sortie (gestionnaire de
+contexte, `close` ou atexit) ; s'il est tué, le gestionnaire de ressources
+de multiprocessing les supprime. Seul le processus qui publie est
+responsable des segments : les processus qui s'y attachent ne les
+suppriment jamais, et leurs vues sont en lecture seule pour qu'un
+processus ne puisse pas modifier les données vues par les autres.
+"""
+import atexit
+import sys
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import pandas as pd
+import numpy as np
+from typing import Optional, Dict, List, Union, Tuple, Any
+
+from algotrading.data_loader import DataLoader
+from algotrading.indicators import TechnicalIndicators
+
+# Segments créés par le processus courant (jamais désenregistrés à l'attachement)
+_PUBLISHED: set = set()
+
+# État des processus de travail (voir `init_worker`)
+_WORKER_MANIFEST: Optional[Dict[str, Any]] = None
+_WORKER_ATTACHED: Dict[str, 'AttachedDataset'] = {}
+
+
+def _create_segment(nbytes: int) -> SharedMemory:
+    """Crée un segment de mémoire partagée d'au moins un octet."""
+    segment = SharedMemory(create=True, size=max(nbytes, 1))
+    _PUBLISHED.add(segment.name)
+    return segment
+
+
+def _attach_segment(name: str) -> SharedMemory:
+    """
+    S'attache à un segment existant sans en devenir responsable.
+    
+    Avant Python 3.13, l'attachement enregistre le segment auprès du
+    gestionnaire de ressources, qui le supprimerait à la sortie d'un
+    processus indépendant. Les processus lancés par multiprocessing
+    partagent le gestionnaire du processus principal et n'ont rien à faire.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    segment = SharedMemory(name=name)
+    if multiprocessing.parent_process() is None and segment.name not in _PUBLISHED:
+        resource_tracker.unregister(segment._name, 'shared_memory')
+    return segment
+
+
+class AttachedDataset:
+    """Jeu de données attaché à des segments de mémoire partagée."""
+
+    def __init__(self, entry: Dict[str, Any]):
+        """
+        S'attache aux segments d'un jeu de données.
+        
+        Args:
+            entry: Entrée du manifeste décrivant le jeu de données.
+        """
+        self.entry = entry
+        self.columns: List[str] = list(entry['columns'])
+        self._values_segment = _attach_segment(entry['values'])
+        self._index_segment = _attach_segment(entry['index'])
+
+        n_rows = entry['n_rows']
+        self.values = np.ndarray((n_rows, len(self.columns)), dtype=np.float64,
+                                 buffer=self._values_segment.buf)
+        self.values.flags.writeable = False
+        index_values = np.ndarray((n_rows,), dtype=np.int64, buffer=self._index_segment.buf)
+        index_values.flags.writeable = False
+
+        if entry['index_kind'] == 'datetime':
+            index = pd.DatetimeIndex(index_values.view(f"M8[{entry['unit']}]"), name=entry['index_name'])
+            if entry['tz'] is not None:
+                index = index.tz_localize('UTC').tz_convert(entry['tz'])
+        else:
+            index = pd.Index(index_values, name=entry['index_name'])
+        self.index = index
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Retourne la vue en lecture seule d'une colonne.
+        
+        Args:
+            name: Nom de la colonne.
+            
+        Returns:
+            Vue NumPy (sans copie).
+        """
+        return self.values[:, self.columns.index(name)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Construit un DataFrame sur les vues partagées, sans copie.
+        
+        Les valeurs partagées sont en lecture seule : une écriture en place
+        (par exemple `df.iloc[0, 0] = x` ou `df.loc[...] = x`) lève
+        `ValueError: assignment destination is read-only`. Remplacer ou
+        ajouter une colonne entière (`df['Close'] = ...`) fonctionne, et
+        `to_frame().copy()` donne un DataFrame modifiable.
+        
+        Returns:
+            DataFrame sur les valeurs partagées en lecture seule.
+        """
+        return pd.DataFrame(self.values, index=self.index, columns=self.columns, copy=False)
+
+    def close(self) -> None:
+        """Détache les segments (les vues ne doivent plus être utilisées)."""
+        self.values = None
+        for segment in (self._values_segment, self._index_segment):
+            segment.close()
+
+
+class SharedDataset:
+    """Publication de DataFrames de prix en mémoire partagée."""
+
+    def __init__(self):
+        """Initialise un ensemble vide de jeux de données publiés."""
+        self._segments: List[SharedMemory] = []
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._closed = False
+        atexit.register(self.close)
+
+    @classmethod
+    def from_csv(cls, loader: DataLoader, files: Dict[str, str], indicators: bool = False,
+                 date_col: str = 'date', ohlcv_cols: Optional[Dict[str, str]] = None) -> 'SharedDataset':
+        """
+        Charge des fichiers CSV avec un `DataLoader` et les publie.
+        
+        Args:
+            loader: Chargeur de données.
+            files: Nom de fichier par clé de jeu de données (par exemple par symbole).
+            indicators: Ajouter tous les indicateurs techniques avant publication.
+            date_col: Nom de la colonne contenant les dates.
+            ohlcv_cols: Correspondance des colonnes OHLCV (voir `prepare_price_data`).
+            
+        Returns:
+            Jeux de données publiés.
+        """
+        dataset = cls()
+        try:
+            for key, filename in files.items():
+                df = loader.prepare_price_data(loader.load_csv(filename), date_col=date_col,
+                                               ohlcv_cols=ohlcv_cols)
+                if indicators:
+                    df = TechnicalIndicators.add_all_indicators(df)
+                dataset.publish(key, df)
+        except Exception:
+            dataset.close()
+            raise
+        return dataset
+
+    def publish(self, key: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Copie un DataFrame dans des segments de mémoire partagée.
+        
+        Les colonnes sont publiées en float64 dans un bloc contigu et l'index
+        en entiers (dates en UTC dans leur unité d'origine).
+        
+        Args:
+            key: Clé du jeu de données dans le manifeste.
+            df: DataFrame à publier (colonnes numériques uniquement).
+            
+        Returns:
+            Entrée du manifeste du jeu de données.
+            
+        Raises:
+            ValueError: Si la clé existe déjà ou si une colonne ou l'index n'est pas numérique.
+            RuntimeError: Si les segments ont déjà été libérés.
+        """
+        if self._closed:
+            raise RuntimeError("Les segments de ce jeu de données ont été libérés.")
+        if key in self._entries:
+            raise ValueError(f"Le jeu de données {key} est déjà publié.")
+        non_numeric = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+        if non_numeric:
+            raise ValueError(f"Colonnes non numériques : {non_numeric}.")
+
+        if isinstance(df.index, pd.DatetimeIndex):
+            index_kind, unit = 'datetime', df.index.unit
+            tz = str(df.index.tz) if df.index.tz is not None else None
+            index_values = df.index.asi8
+        elif pd.api.types.is_integer_dtype(df.index):
+            index_kind, unit, tz = 'integer', None, None
+            index_values = df.index.to_numpy(dtype=np.int64)
+        else:
+            raise ValueError("L'index doit être un index de dates ou d'entiers.")
+
+        values = df.to_numpy(dtype=np.float64)
+        values_segment = _create_segment(values.nbytes)
+        self._segments.append(values_segment)
+        index_segment = _create_segment(index_values.nbytes)
+        self._segments.append(index_segment)
+
+        np.ndarray(values.shape, dtype=np.float64, buffer=values_segment.buf)[:] = values
+        np.ndarray(index_values.shape, dtype=np.int64, buffer=index_segment.buf)[:] = index_values
+
+        entry = {
+            'values': values_segment.name,
+            'index': index_segment.name,
+            'n_rows': len(df),
+            'columns': [str(col) for col in df.columns],
+            'index_kind': index_kind,
+            'index_name': df.index.name,
+            'unit': unit,
+            'tz': tz,
+        }
+        self._entries[key] = entry
+        return entry
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """Manifeste sérialisable (JSON ou pickle) à transmettre aux processus de travail."""
+        return {'datasets': {key: dict(entry) for key, entry in self._entries.items()}}
+
+    @property
+    def nbytes(self) -> int:
+        """Taille totale des segments publiés."""
+        return sum(segment.size for segment in self._segments)
+
+    def close(self) -> None:
+        """Libère tous les segments (sans effet s'ils le sont déjà)."""
+        if self._closed:
+            return
+        self._closed = True
+        for segment in self._segments:
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+            _PUBLISHED.discard(segment.name)
+        self._segments = []
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> 'SharedDataset':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def attach(manifest: Dict[str, Any], key: str) -> AttachedDataset:
+    """
+    S'attache à un jeu de données publié.
+    
+    Args:
+        manifest: Manifeste produit par `SharedDataset.manifest`.
+        key: Clé du jeu de données.
+        
+    Returns:
+        Jeu de données attaché.
+        
+    Raises:
+        KeyError: Si la clé n'est pas dans le manifeste.
+    """
+    return AttachedDataset(manifest['datasets'][key])
+
+
+def init_worker(manifest: Dict[str, Any]) -> None:
+    """
+    Initialise un processus de travail (argument `initializer` des pools).
+    
+    Args:
+        manifest: Manifeste des jeux de données publiés.
+    """
+    global _WORKER_MANIFEST
+    _WORKER_MANIFEST = manifest
+    _WORKER_ATTACHED.clear()
+
+
+def worker_frame(key: str) -> pd.DataFrame:
+    """
+    Retourne le DataFrame partagé d'une clé dans un processus de travail.
+    
+    L'attachement est fait une seule fois par processus.
+    
+    Args:
+        key: Clé du jeu de données.
+        
+    Returns:
+        DataFrame construit sur la mémoire partagée.
+        
+    Raises:
+        RuntimeError: Si `init_worker` n'a pas été appelé.
+    """
+    if _WORKER_MANIFEST is None:
+        raise RuntimeError("init_worker doit être appelé dans le processus de travail.")
+    if key not in _WORKER_ATTACHED:
+        _WORKER_ATTACHED[key] = attach(_WORKER_MANIFEST, key)
+    return _WORKER_ATTACHED[key].to_frame()
@@ -0,0 +1,360 @@
+"""
+Module de stockage compressé des barres OHLCV.
+
+Chaque symbole est stocké dans un fichier de blocs. Dans un bloc, les dates
+sont codées par différences successives et les prix en nombres entiers de
+ticks (clôture par différences, ouverture, plus haut et plus bas relatifs à
+la clôture) ; chaque colonne est réduite au plus petit type entier suffisant,
+ses octets sont regroupés par rang (byte shuffle) puis compressés avec zlib.
+L'en-tête de chaque bloc contient ses dates minimale et maximale : les
+lectures sur une période ne décompressent que les blocs concernés et
+décodent directement en tableaux NumPy. Les ajouts complètent le dernier
+bloc jusqu'à sa taille maximale, si bien que des écritures fréquentes de
+quelques barres gardent des blocs de taille utile.
+"""
+import os
+import struct
+import zlib
+import pandas as pd
+import numpy as np
+from typing import Optional, Dict, List, Union, Tuple, Any
+
+from algotrading.ingestion import OHLCV_COLUMNS
+
+# En-tête de bloc : signature, nombre de barres, dates min et max (ns),
+# première clôture (ticks), taille du tick de prix et de volume, taille en
+# octets des 6 colonnes codées, taille des données compressées
+_HEADER = struct.Struct('<4sIqqqdd6BQ')
+_MAGIC = b'ATB1'
+_ENCODED_COLUMNS = ('date', 'Close', 'Open', 'High', 'Low', 'Volume')
+_INT_TYPES = {1: np.int8, 2: np.int16, 4: np.int32, 8: np.int64}
+
+
+def _smallest_int(values: np.ndarray) -> np.ndarray:
+    """Convertit des entiers dans le plus petit type entier suffisant."""
+    if len(values) == 0:
+        return values.astype(np.int8)
+    low, high = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values.astype(np.int64)
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    """Regroupe les octets de même rang (améliore la compression des petits entiers)."""
+    return values.view(np.uint8).reshape(len(values), values.itemsize).T.tobytes()
+
+
+def _unshuffle(data: memoryview, n_rows: int, itemsize: int) -> np.ndarray:
+    """Opération inverse de `_shuffle`."""
+    planes = np.frombuffer(data, dtype=np.uint8, count=n_rows * itemsize).reshape(itemsize, n_rows)
+    return np.ascontiguousarray(planes.T).view(_INT_TYPES[itemsize]).reshape(n_rows)
+
+
+def _to_ticks(values: np.ndarray, tick: float, column: str) -> np.ndarray:
+    """Arrondit des valeurs au pas le plus proche, en refusant les valeurs manquantes ou infinies."""
+    values = np.asarray(values, dtype=np.float64)
+    if not np.isfinite(values).all():
+        # Converti en entier, NaN deviendrait silencieusement INT64_MIN
+        raise ValueError(f"Valeurs manquantes ou infinies dans la colonne {column}.")
+    return np.rint(values / tick).astype(np.int64)
+
+
+def encode_block(timestamps: np.ndarray, prices: Dict[str, np.ndarray], volume: np.ndarray,
+                 tick_size: float, volume_tick: float, compression_level: int = 6) -> bytes:
+    """
+    Code un bloc de barres.
+    
+    Args:
+        timestamps: Dates en nanosecondes (int64, croissantes).
+        prices: Prix par colonne ('Open', 'High', 'Low', 'Close').
+        volume: Volumes.
+        tick_size: Pas de prix ; les prix sont arrondis au tick le plus proche.
+        volume_tick: Pas de volume.
+        compression_level: Niveau de compression zlib.
+        
+    Returns:
+        Bloc codé (en-tête et données compressées).
+        
+    Raises:
+        ValueError: Si un prix ou un volume est manquant ou infini.
+    """
+    ticks = {column: _to_ticks(prices[column], tick_size, column) for column in ('Open', 'High', 'Low', 'Close')}
+    close = ticks['Close']
+    encoded = {
+        'date': _smallest_int(np.diff(timestamps, prepend=timestamps[:1])),
+        'Close': _smallest_int(np.diff(close, prepend=close[:1])),
+        'Open': _smallest_int(ticks['Open'] - close),
+        'High': _smallest_int(ticks['High'] - close),
+        'Low': _smallest_int(ticks['Low'] - close),
+        'Volume': _smallest_int(_to_ticks(volume, volume_tick, 'Volume')),
+    }
+    # Les premières date et clôture sont conservées en absolu dans l'en-tête
+    payload = zlib.compress(b''.join(_shuffle(encoded[column]) for column in _ENCODED_COLUMNS),
+                            compression_level)
+    header = _HEADER.pack(_MAGIC, len(timestamps), int(timestamps[0]), int(timestamps[-1]), int(close[0]),
+                          tick_size, volume_tick,
+                          *(encoded[column].itemsize for column in _ENCODED_COLUMNS), len(payload))
+    return header + payload
+
+
+def decode_block(header: Tuple[Any, ...], payload: bytes) -> Dict[str, np.ndarray]:
+    """
+    Décode un bloc en tableaux NumPy.
+    
+    Args:
+        header: En-tête décodé (voir `_HEADER`).
+        payload: Données compressées du bloc.
+        
+    Returns:
+        Dictionnaire avec 'date' (int64, ns) et les colonnes OHLCV (float64).
+    """
+    _, n_rows, min_ts, _, first_close, tick_size, volume_tick, *sizes, _ = header
+    raw = memoryview(zlib.decompress(payload))
+
+    columns = {}
+    offset = 0
+    for column, itemsize in zip(_ENCODED_COLUMNS, sizes):
+        length = n_rows * itemsize
+        columns[column] = _unshuffle(raw[offset:offset + length], n_rows, itemsize).astype(np.int64)
+        offset += length
+
+    close = first_close + np.cumsum(columns['Close'])
+    return {
+        'date': min_ts + np.cumsum(columns['date']),
+        'Open': (columns['Open'] + close) * tick_size,
+        'High': (columns['High'] + close) * tick_size,
+        'Low': (columns['Low'] + close) * tick_size,
+        'Close': close * tick_size,
+        'Volume': columns['Volume'] * volume_tick,
+    }
+
+
+class CompressedBarStore:
+    """Stockage compressé des barres, un fichier de blocs par symbole."""
+
+    def __init__(self, data_dir: str = "data", tick_size: float = 1e-6, volume_tick: float = 1.0,
+                 block_size: int = 65536, compression_level: int = 6):
+        """
+        Initialise le stockage.
+        
+        Args:
+            data_dir: Répertoire des fichiers.
+            tick_size: Pas de prix (les prix sont arrondis au tick le plus proche).
+            volume_tick: Pas de volume (1 pour des volumes entiers).
+            block_size: Nombre maximal de barres par bloc.
+            compression_level: Niveau de compression zlib (0 à 9).
+        """
+        self.data_dir = data_dir
+        self.tick_size = tick_size
+        self.volume_tick = volume_tick
+        self.block_size = block_size
+        self.compression_level = compression_level
+        self._index: Dict[str, List[Tuple[int, Tuple[Any, ...]]]] = {}
+        os.makedirs(data_dir, exist_ok=True)
+
+    def path_for(self, symbol: str) -> str:
+        """Retourne le chemin du fichier associé à un symbole."""
+        return os.path.join(self.data_dir, f"{symbol}.bars")
+
+    def remove(self, symbol: str) -> None:
+        """Supprime le fichier d'un symbole (sans effet s'il n'existe pas)."""
+        path = self.path_for(symbol)
+        if os.path.exists(path):
+            os.remove(path)
+        self._index.pop(symbol, None)
+
+    def symbols(self) -> List[str]:
+        """Liste les symboles stockés."""
+        return sorted(name[:-5] for name in os.listdir(self.data_dir) if name.endswith('.bars'))
+
+    def block_index(self, symbol: str) -> List[Tuple[int, Tuple[Any, ...]]]:
+        """
+        Retourne l'index des blocs d'un symbole (lu une fois depuis les en-têtes).
+        
+        Args:
+            symbol: Symbole concerné.
+            
+        Returns:
+            Liste de (position des données compressées, en-tête) par bloc.
+            
+        Raises:
+            ValueError: Si le fichier est corrompu.
+        """
+        if symbol in self._index:
+            return self._index[symbol]
+
+        index = []
+        path = self.path_for(symbol)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                while True:
+                    raw = f.read(_HEADER.size)
+                    if not raw:
+                        break
+                    if len(raw) < _HEADER.size:
+                        raise ValueError(f"Bloc tronqué dans {path}.")
+                    header = _HEADER.unpack(raw)
+                    if header[0] != _MAGIC:
+                        raise ValueError(f"Signature de bloc invalide dans {path}.")
+                    index.append((f.tell(), header))
+                    f.seek(header[-1], os.SEEK_CUR)
+        self._index[symbol] = index
+        return index
+
+    def append(self, symbol: str, bars: pd.DataFrame) -> None:
+        """
+        Ajoute des barres à la fin du fichier du symbole.
+        
+        Tant que le dernier bloc compte moins de `block_size` barres, les
+        nouvelles barres y sont fusionnées et le bloc est réécrit : des
+        écritures fréquentes de quelques barres (ingestion en continu) ne
+        produisent pas une multitude de petits blocs. Une barre tardive
+        (correction d'une barre déjà écrite) est acceptée de la même façon si
+        elle tombe dans le dernier bloc ; elle remplace la barre de même date.
+        Rien n'est écrit si une barre est refusée.
+        
+        Les dates sont stockées sans fuseau horaire ; les index avec fuseau
+        sont refusés plutôt que convertis silencieusement (convertir d'abord
+        en UTC avec `tz_convert('UTC').tz_localize(None)`, comme l'ingestion).
+        
+        Args:
+            symbol: Symbole concerné.
+            bars: DataFrame indexé par date (sans fuseau) avec les colonnes OHLCV.
+            
+        Raises:
+            ValueError: Si l'index a un fuseau horaire, si des barres sont
+                antérieures au dernier bloc stocké, ou si un prix ou un volume
+                est manquant ou infini.
+        """
+        if bars.empty:
+            return
+        if getattr(bars.index, 'tz', None) is not None:
+            raise ValueError(f"Les dates de {symbol} ont un fuseau horaire ({bars.index.tz}) ; "
+                             "convertir en UTC sans fuseau avant l'écriture.")
+        bars = bars.sort_index()
+        timestamps = pd.DatetimeIndex(bars.index).as_unit('ns').asi8
+        columns = {column: bars[column].to_numpy(dtype=np.float64) for column in OHLCV_COLUMNS}
+        index = self.block_index(symbol)
+        path = self.path_for(symbol)
+
+        replaced = None
+        if index and (timestamps[0] <= index[-1][1][3] or index[-1][1][1] < self.block_size):
+            position, header = index[-1]
+            if timestamps[0] < header[2]:
+                raise ValueError(f"Les barres de {symbol} doivent être postérieures aux barres stockées.")
+            # Dernier bloc incomplet ou correction tardive : fusion avec le dernier bloc, réécrit
+            with open(path, 'rb') as f:
+                f.seek(position)
+                stored = decode_block(header, f.read(header[-1]))
+            keep = ~np.isin(stored['date'], timestamps)
+            timestamps = np.concatenate([stored['date'][keep], timestamps])
+            order = np.argsort(timestamps, kind='stable')
+            timestamps = timestamps[order]
+            columns = {column: np.concatenate([stored[column][keep], values])[order]
+                       for column, values in columns.items()}
+            replaced = position - _HEADER.size
+
+        # Tous les blocs sont codés avant l'écriture : une erreur laisse le fichier intact
+        blocks = [encode_block(timestamps[begin:begin + self.block_size],
+                               {column: columns[column][begin:begin + self.block_size]
+                                for column in ('Open', 'High', 'Low', 'Close')},
+                               columns['Volume'][begin:begin + self.block_size],
+                               self.tick_size, self.volume_tick, self.compression_level)
+                  for begin in range(0, len(timestamps), self.block_size)]
+
+        if replaced is not None:
+            with open(path, 'r+b') as f:
+                f.truncate(replaced)
+            index.pop()
+        with open(path, 'ab') as f:
+            for block in blocks:
+                f.write(block)
+                index.append((f.tell() - len(block) + _HEADER.size, _HEADER.unpack(block[:_HEADER.size])))
+
+    def read_arrays(self, symbol: str, start: Optional[Union[str, pd.Timestamp]] = None,
+                    end: Optional[Union[str, pd.Timestamp]] = None) -> Dict[str, np.ndarray]:
+        """
+        Lit les barres d'une période sous forme de tableaux NumPy.
+        
+        Seuls les blocs dont l'intervalle de dates recoupe la période sont
+        lus et décompressés.
+        
+        Args:
+            symbol: Symbole concerné.
+            start: Date de début incluse (début de l'historique par défaut).
+            end: Date de fin incluse (fin de l'historique par défaut).
+            
+        Returns:
+            Dictionnaire avec 'date' (int64, ns) et les colonnes OHLCV.
+            
+        Raises:
+            FileNotFoundError: Si le symbole n'est pas stocké.
+        """
+        path = self.path_for(symbol)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Le fichier {path} n'existe pas.")
+
+        low = pd.Timestamp(start).as_unit('ns').value if start is not None else np.iinfo(np.int64).min
+        high = pd.Timestamp(end).as_unit('ns').value if end is not None else np.iinfo(np.int64).max
+
+        parts = []
+        with open(path, 'rb') as f:
+            for position, header in self.block_index(symbol):
+                if header[3] < low or header[2] > high:
+                    continue
+                f.seek(position)
+                block = decode_block(header, f.read(header[-1]))
+                mask = (block['date'] >= low) & (block['date'] <= high)
+                parts.append({column: values[mask] for column, values in block.items()}
+                             if not mask.all() else block)
+
+        columns = ('date',) + tuple(OHLCV_COLUMNS)
+        if not parts:
+            return {column: np.empty(0, dtype=np.int64 if column == 'date' else np.float64)
+                    for column in columns}
+        return {column: np.concatenate([part[column] for part in parts]) for column in columns}
+
+    def read(self, symbol: str, start: Optional[Union[str, pd.Timestamp]] = None,
+             end: Optional[Union[str, pd.Timestamp]] = None) -> pd.DataFrame:
+        """
+        Lit les barres d'une période au format de `prepare_price_data`.
+        
+        Args:
+            symbol: Symbole concerné.
+            start: Date de début incluse.
+            end: Date de fin incluse.
+            
+        Returns:
+            DataFrame indexé par 'date' avec les colonnes OHLCV.
+        """
+        arrays = self.read_arrays(symbol, start, end)
+        index = pd.DatetimeIndex(arrays['date'].view('M8[ns]'), name='date')
+        return pd.DataFrame({column: arrays[column] for column in OHLCV_COLUMNS}, index=index)
+
+    def import_csv(self, symbol: str, loader: Any, filename: str, chunksize: int = 100000, **kwargs) -> int:
+        """
+        Convertit un fichier CSV dans le stockage, bloc par bloc.
+        
+        Args:
+            symbol: Symbole concerné.
+            loader: `DataLoader` du répertoire du fichier.
+            filename: Nom du fichier CSV.
+            chunksize: Nombre de lignes lues à la fois.
+            **kwargs: Arguments transmis à `DataLoader.iter_csv_chunks`.
+            
+        Returns:
+            Nombre de barres importées.
+        """
+        n_bars = 0
+        for chunk in loader.iter_csv_chunks(filename, chunksize=chunksize, **kwargs):
+            self.append(symbol, chunk)
+            n_bars += len(chunk)
+        return n_bars
+
+    def size(self, symbol: str) -> int:
+        """Taille du fichier d'un symbole, en octets."""
+        path = self.path_for(symbol)
+        return os.path.getsize(path) if os.path.exists(path) else 0
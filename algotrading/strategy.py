@@ -4,8 +4,14 @@ Module définissant les stratégies de trading.
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, List, Union, Tuple
+from typing import Optional, Dict, List, Union, Tuple, Iterable, Iterator, Any, Callable
 from enum import Enum
+from contextlib import nullcontext
+
+from algotrading.profiling import instrument, span
+from algotrading.vectorized import backtest_matrix, metrics_matrix, batch_size_for
+from algotrading.costs import CostModel, apply_costs, market_arrays
+from algotrading.monitoring import StrategyMonitor
 
 
 class Position(Enum):
@@ -15,6 +21,25 @@ class Position(Enum):
     SHORT = -1
 
 
+def _param_value(value: Any) -> Any:
+    """Convertit la valeur d'un paramètre en valeur déterministe sérialisable en JSON."""
+    if isinstance(value, Strategy):
+        return {'class': f"{type(value).__module__}.{type(value).__qualname__}", 'params': value.params()}
+    if isinstance(value, np.ndarray):
+        return [_param_value(v) for v in value.tolist()]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_param_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _param_value(v) for k, v in value.items()}
+    if isinstance(value, (int, float, str, bool, type(None))):
+        return value
+    return repr(value)
+
+
 class Strategy(ABC):
     """Classe abstraite pour toutes les stratégies de trading."""
     
@@ -27,6 +52,43 @@ class Strategy(ABC):
         """
         self.name = name
     
+    def params(self) -> Dict[str, Any]:
+        """
+        Paramètres de la stratégie (attributs d'instance hors nom).
+        
+        Les valeurs sont déterministes et sérialisables en JSON : les
+        stratégies filles sont décrites récursivement par leur classe et leurs
+        paramètres, les tableaux NumPy par des listes. Sert d'identité de la
+        configuration au cache et au stockage des résultats.
+        
+        Returns:
+            Dictionnaire nom -> valeur.
+        """
+        return {key: _param_value(value) for key, value in vars(self).items()
+                if key != 'name' and not key.startswith('_')}
+    
+    @property
+    def warmup_period(self) -> Optional[int]:
+        """
+        Nombre de barres d'historique nécessaires pour calculer le signal d'une barre.
+        
+        Utilisé par `backtest_chunked` pour reprendre le calcul des signaux à
+        la frontière entre deux blocs. None si la stratégie ne le déclare pas.
+        """
+        return None
+    
+    def required_indicators(self) -> Dict[str, Tuple[Any, Callable[[pd.DataFrame], pd.Series]]]:
+        """
+        Colonnes d'indicateurs lues par `generate_signals` lorsqu'elles existent.
+        
+        Permet de calculer une seule fois les indicateurs partagés par
+        plusieurs stratégies ou évaluations.
+        
+        Returns:
+            Dictionnaire nom de colonne -> (clé de cache, fonction de calcul).
+        """
+        return {}
+    
     @abstractmethod
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
         """
@@ -40,16 +102,27 @@ class Strategy(ABC):
         """
         pass
     
+    @instrument('backtest')
     def backtest(self, data: pd.DataFrame, initial_capital: float = 10000.0,
-                position_size: float = 1.0, commission: float = 0.0) -> pd.DataFrame:
+                position_size: float = 1.0, commission: float = 0.0,
+                cost_model: Optional[CostModel] = None) -> pd.DataFrame:
         """
         Effectue un backtest de la stratégie.
         
+        Le compte part d'une position nulle avant la première barre : le
+        rendement de la première barre est nul (le capital y vaut le capital
+        initial), et une position ouverte dès la première barre compte comme
+        une transaction et paie sa commission. `backtest_chunked` et
+        `backtest_matrix` suivent les mêmes conventions.
+        
         Args:
             data: DataFrame contenant les données de prix.
             initial_capital: Capital initial.
             position_size: Taille de la position (proportion du capital).
             commission: Commission par transaction (proportion).
+            cost_model: Modèle de coûts de transaction (voir `algotrading.costs`) ;
+                        la position exécutée peut alors différer de la position
+                        voulue ('Target_Position') sous une limite de capacité.
             
         Returns:
             DataFrame contenant les résultats du backtest.
@@ -73,17 +146,29 @@ class Strategy(ABC):
             1: Position.LONG.value
         })
         
+        # Appliquer le modèle de coûts (positions exécutées et coût par barre)
+        if cost_model is not None:
+            applied = apply_costs(results['Position'].to_numpy(), market_arrays(data), cost_model,
+                                  initial_capital)
+            results['Target_Position'] = results['Position']
+            results['Position'] = applied['executed']
+            results['Participation'] = applied['participation']
+            results['Cost'] = applied['cost']
+        
         # Calculer les rendements de la stratégie
         results['Returns'] = results['Price'].pct_change()
         
-        # Calculer les rendements de la stratégie
-        results['Strategy_Returns'] = results['Position'].shift(1) * results['Returns']
+        # Calculer les rendements de la stratégie (nuls sur la première barre,
+        # sans position ni rendement connus)
+        results['Strategy_Returns'] = (results['Position'].shift(1) * results['Returns']).fillna(0)
+        if cost_model is not None:
+            results['Strategy_Returns'] -= results['Cost']
         
         # Calculer le capital
         results['Capital'] = initial_capital * (1 + results['Strategy_Returns']).cumprod()
         
-        # Calculer les transactions
-        results['Trade'] = results['Position'].diff().abs()
+        # Calculer les transactions (la première barre part d'une position nulle)
+        results['Trade'] = results['Position'].diff().fillna(results['Position']).abs()
         
         # Calculer le coût des commissions
         results['Commission'] = results['Trade'] * results['Price'] * commission
@@ -98,6 +183,205 @@ class Strategy(ABC):
         
         return results
     
+    def backtest_chunked(self, chunks: Iterable[pd.DataFrame], initial_capital: float = 10000.0,
+                         position_size: float = 1.0, commission: float = 0.0,
+                         warmup: Optional[int] = None,
+                         monitor: Optional[StrategyMonitor] = None,
+                         symbol: str = 'default') -> Iterator[pd.DataFrame]:
+        """
+        Effectue un backtest bloc par bloc, sans charger tout l'historique en mémoire.
+        
+        Les dernières barres de chaque bloc (période de chauffe des indicateurs)
+        sont conservées pour calculer les signaux du bloc suivant, et l'état du
+        compte (position, dernier prix, capital, commissions cumulées, plus haut
+        du capital) est reporté d'un bloc à l'autre. La concaténation des blocs
+        produits est identique au résultat de `backtest` sur les données complètes.
+        
+        Args:
+            chunks: Itérable de DataFrames de prix consécutifs et triés par date.
+            initial_capital: Capital initial.
+            position_size: Taille de la position (proportion du capital).
+            commission: Commission par transaction (proportion).
+            warmup: Nombre de barres d'historique à conserver entre les blocs
+                    (par défaut `warmup_period` de la stratégie).
+            monitor: Collecteur de suivi en temps réel (voir `algotrading.monitoring`) :
+                     latences des étapes 'signals' et 'accounting', position et
+                     capital à la fin de chaque bloc.
+            symbol: Instrument négocié (étiquette 'symbol' de la position suivie
+                    par `monitor`).
+            
+        Returns:
+            Itérateur de DataFrames de résultats, un par bloc.
+            
+        Raises:
+            ValueError: Si la période de chauffe n'est pas connue.
+        """
+        if warmup is None:
+            warmup = self.warmup_period
+        if warmup is None:
+            raise ValueError(f"La stratégie {self.name} ne déclare pas de période de chauffe ; "
+                             "préciser l'argument warmup.")
+        
+        tail = None
+        state = {
+            'signal_sum': 0,
+            'price': np.nan,
+            'position': np.nan,
+            'growth': 1.0,
+            'commission_sum': 0.0,
+            'cummax': np.nan,
+        }
+        
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            
+            with span('backtest_chunk', rows=len(chunk)):
+                # Calculer les signaux avec l'historique de chauffe du bloc précédent
+                with monitor.timed('signals') if monitor is not None else nullcontext():
+                    window = chunk if tail is None else pd.concat([tail, chunk])
+                    signals = self.generate_signals(window).iloc[len(window) - len(chunk):]
+                    tail = window.iloc[-warmup:] if warmup > 0 else window.iloc[:0]
+                
+                with monitor.timed('accounting') if monitor is not None else nullcontext():
+                    results = self._backtest_chunk(chunk, signals, state, initial_capital, commission)
+            
+            if monitor is not None:
+                monitor.record_results(results, symbol)
+            yield results
+    
+    @staticmethod
+    def _backtest_chunk(chunk: pd.DataFrame, signals: pd.Series, state: Dict[str, float],
+                        initial_capital: float, commission: float) -> pd.DataFrame:
+        """
+        Calcule les résultats d'un bloc en reprenant l'état du bloc précédent.
+        
+        Reproduit exactement les opérations de `backtest` : chaque cumul est
+        prolongé à partir de sa dernière valeur plutôt que recalculé.
+        
+        Args:
+            chunk: DataFrame de prix du bloc.
+            signals: Signaux du bloc.
+            state: État reporté, mis à jour en place.
+            initial_capital: Capital initial.
+            commission: Commission par transaction (proportion).
+            
+        Returns:
+            DataFrame contenant les résultats du bloc.
+        """
+        def carried_cumulative(series: pd.Series, carry: float, op: str) -> pd.Series:
+            # Prolonger un cumul en ajoutant la valeur reportée en tête
+            extended = pd.concat([pd.Series([carry]), series.reset_index(drop=True)])
+            values = getattr(extended, op)().iloc[1:].to_numpy()
+            return pd.Series(values, index=series.index)
+        
+        results = pd.DataFrame(index=chunk.index)
+        results['Signal'] = signals
+        results['Price'] = chunk['Close']
+        
+        signal_sum = carried_cumulative(signals, state['signal_sum'], 'cumsum')
+        results['Position'] = signal_sum.map({
+            -1: Position.SHORT.value,
+            0: Position.NONE.value,
+            1: Position.LONG.value
+        })
+        
+        previous_position = results['Position'].shift(1, fill_value=state['position'])
+        results['Returns'] = results['Price'] / results['Price'].shift(1, fill_value=state['price']) - 1
+        results['Strategy_Returns'] = (previous_position * results['Returns']).fillna(0)
+        
+        growth = carried_cumulative(1 + results['Strategy_Returns'], state['growth'], 'cumprod')
+        results['Capital'] = initial_capital * growth
+        
+        results['Trade'] = (results['Position'] - previous_position).fillna(results['Position']).abs()
+        results['Commission'] = results['Trade'] * results['Price'] * commission
+        
+        commission_sum = carried_cumulative(results['Commission'], state['commission_sum'], 'cumsum')
+        if commission > 0:
+            results['Capital'] = results['Capital'] - commission_sum
+        
+        results['Cummax'] = carried_cumulative(results['Capital'], state['cummax'], 'cummax')
+        results['Drawdown'] = (results['Capital'] - results['Cummax']) / results['Cummax']
+        
+        # Reporter l'état (dernières valeurs valides des cumuls)
+        state['signal_sum'] = signal_sum.iloc[-1]
+        state['price'] = results['Price'].iloc[-1]
+        state['position'] = results['Position'].iloc[-1]
+        state['growth'] = growth.iloc[-1]
+        last_commission = commission_sum.dropna()
+        if not last_commission.empty:
+            state['commission_sum'] = last_commission.iloc[-1]
+        last_cummax = results['Cummax'].dropna()
+        if not last_cummax.empty:
+            state['cummax'] = last_cummax.iloc[-1]
+        
+        return results
+    
+    def calculate_metrics_chunked(self, result_chunks: Iterable[pd.DataFrame]) -> Dict[str, float]:
+        """
+        Calcule les métriques de performance sur des résultats produits par blocs.
+        
+        Les agrégats sont mis à jour bloc par bloc (la variance par fusion de
+        moments), ce qui garde la mémoire bornée par la taille d'un bloc.
+        
+        Args:
+            result_chunks: Itérable de DataFrames de résultats (voir `backtest_chunked`).
+            
+        Returns:
+            Dictionnaire contenant les mêmes métriques que `calculate_metrics`.
+        """
+        first_capital = None
+        last_capital = np.nan
+        n_rows = 0
+        count, mean, m2 = 0, 0.0, 0.0
+        max_drawdown = np.nan
+        n_trades = 0.0
+        winning_trades = 0
+        losing_trades = 0
+        
+        for results in result_chunks:
+            if results.empty:
+                continue
+            if first_capital is None:
+                first_capital = results['Capital'].iloc[0]
+            last_capital = results['Capital'].iloc[-1]
+            n_rows += len(results)
+            
+            # Fusion des moments (Chan et al.) pour l'écart-type
+            returns = results['Strategy_Returns'].dropna().to_numpy()
+            if len(returns):
+                chunk_mean = returns.mean()
+                chunk_m2 = ((returns - chunk_mean) ** 2).sum()
+                total = count + len(returns)
+                delta = chunk_mean - mean
+                m2 += chunk_m2 + delta ** 2 * count * len(returns) / total
+                mean += delta * len(returns) / total
+                count = total
+                winning_trades += int((returns > 0).sum())
+                losing_trades += int((returns < 0).sum())
+            
+            chunk_drawdown = results['Drawdown'].min()
+            if not np.isnan(chunk_drawdown):
+                max_drawdown = chunk_drawdown if np.isnan(max_drawdown) else min(max_drawdown, chunk_drawdown)
+            n_trades += results['Trade'].sum()
+        
+        total_return = (last_capital / first_capital) - 1 if first_capital is not None else np.nan
+        n_years = n_rows / 252  # Supposer 252 jours de trading par an
+        annual_return = (1 + total_return) ** (1 / n_years) - 1 if n_years > 0 else np.nan
+        annual_volatility = np.sqrt(m2 / (count - 1)) * np.sqrt(252) if count > 1 else np.nan
+        sharpe_ratio = annual_return / annual_volatility if annual_volatility > 0 else 0
+        win_rate = winning_trades / (winning_trades + losing_trades) if (winning_trades + losing_trades) > 0 else 0
+        
+        return {
+            'total_return': total_return,
+            'annual_return': annual_return,
+            'annual_volatility': annual_volatility,
+            'sharpe_ratio': sharpe_ratio,
+            'max_drawdown': max_drawdown,
+            'n_trades': n_trades,
+            'win_rate': win_rate
+        }
+    
     def calculate_metrics(self, results: pd.DataFrame) -> Dict[str, float]:
         """
         Calcule les métriques de performance.
@@ -144,6 +428,66 @@ class Strategy(ABC):
         }
 
 
+    @classmethod
+    def generate_signal_matrix(cls, data: pd.DataFrame, param_sets: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Génère les signaux de plusieurs jeux de paramètres.
+        
+        Par défaut, une stratégie est instanciée par jeu de paramètres ; les
+        sous-classes peuvent calculer toute la matrice en une fois.
+        
+        Args:
+            data: DataFrame contenant les données de prix.
+            param_sets: Jeux de paramètres (arguments du constructeur).
+            
+        Returns:
+            Matrice des signaux (jeux de paramètres × barres).
+        """
+        return np.vstack([cls(**params).generate_signals(data).to_numpy(dtype=np.float64)
+                          for params in param_sets])
+    
+    @classmethod
+    def backtest_matrix(cls, data: pd.DataFrame, param_sets: List[Dict[str, Any]],
+                        initial_capital: float = 10000.0, position_size: float = 1.0,
+                        commission: float = 0.0, batch_size: Optional[int] = None,
+                        cost_model: Optional[CostModel] = None) -> pd.DataFrame:
+        """
+        Effectue le backtest de nombreux jeux de paramètres en une passe vectorisée.
+        
+        Les résultats sont ceux de `backtest` suivi de `calculate_metrics`
+        pour chaque jeu de paramètres, calculés par lots de lignes d'une
+        matrice de signaux.
+        
+        Args:
+            data: DataFrame contenant les données de prix.
+            param_sets: Jeux de paramètres (arguments du constructeur).
+            initial_capital: Capital initial.
+            position_size: Taille de la position (proportion du capital).
+            commission: Commission par transaction (proportion).
+            batch_size: Nombre de jeux de paramètres par lot (borné par la
+                        mémoire disponible par défaut).
+            cost_model: Modèle de coûts de transaction (voir `algotrading.costs`).
+            
+        Returns:
+            DataFrame avec une ligne par jeu de paramètres : les paramètres
+            puis les métriques de performance.
+        """
+        batch_size = batch_size or batch_size_for(len(data))
+        prices = data['Close'].to_numpy(dtype=np.float64)
+        market = market_arrays(data) if cost_model is not None else None
+        
+        tables = []
+        with span('backtest_matrix', rows=len(data) * len(param_sets)):
+            for begin in range(0, len(param_sets), batch_size):
+                batch = param_sets[begin:begin + batch_size]
+                signals = cls.generate_signal_matrix(data, batch)
+                metrics = metrics_matrix(backtest_matrix(signals, prices, initial_capital, commission,
+                                                         cost_model, market))
+                tables.append(pd.concat([pd.DataFrame(batch), pd.DataFrame(metrics)], axis=1))
+        
+        return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+
+
 class MovingAverageCrossover(Strategy):
     """Stratégie de croisement de moyennes mobiles."""
     
@@ -158,7 +502,55 @@ class MovingAverageCrossover(Strategy):
         super().__init__(f"MA_Crossover_{fast_window}_{slow_window}")
         self.fast_window = fast_window
         self.slow_window = slow_window
+    
+    @property
+    def warmup_period(self) -> int:
+        """Historique nécessaire : la fenêtre de la moyenne mobile la plus longue."""
+        return max(self.fast_window, self.slow_window)
+    
+    def required_indicators(self) -> Dict[str, Tuple[Any, Callable[[pd.DataFrame], pd.Series]]]:
+        """Colonnes SMA<période> des deux moyennes mobiles."""
+        from algotrading.indicators import TechnicalIndicators
+        
+        return {
+            f'SMA{window}': (('SMA', window), lambda data, w=window: TechnicalIndicators.sma(data, 'Close', w))
+            for window in (self.fast_window, self.slow_window)
+        }
+    
+    @classmethod
+    def generate_signal_matrix(cls, data: pd.DataFrame, param_sets: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Génère les signaux de plusieurs jeux de paramètres en une fois.
+        
+        Chaque moyenne mobile distincte n'est calculée qu'une fois, puis les
+        croisements de toutes les combinaisons sont évalués sur des matrices.
+        
+        Args:
+            data: DataFrame contenant les données de prix.
+            param_sets: Jeux de paramètres ('fast_window', 'slow_window').
+            
+        Returns:
+            Matrice des signaux (jeux de paramètres × barres).
+        """
+        fast_windows = [params.get('fast_window', 20) for params in param_sets]
+        slow_windows = [params.get('slow_window', 50) for params in param_sets]
+        
+        # Moyennes mobiles distinctes (colonnes SMA<période> déjà calculées sinon)
+        averages = {}
+        for window in set(fast_windows) | set(slow_windows):
+            column = f'SMA{window}'
+            series = data[column] if column in data.columns else data['Close'].rolling(window=window).mean()
+            averages[window] = series.to_numpy(dtype=np.float64)
+        
+        fast_ma = np.stack([averages[window] for window in fast_windows])
+        slow_ma = np.stack([averages[window] for window in slow_windows])
+        
+        # Positions voulues (0 tant qu'une moyenne est indéfinie), puis leurs changements
+        # (la première barre porte la position voulue, comme dans `generate_signals`)
+        states = (fast_ma > slow_ma).astype(np.float64) - (fast_ma < slow_ma)
+        return np.diff(states, axis=1, prepend=0.0)
         
+    @instrument('generate_signals')
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
         """
         Génère les signaux de trading basés sur le croisement des moyennes mobiles.
@@ -169,9 +561,17 @@ class MovingAverageCrossover(Strategy):
         Returns:
             Série pandas contenant les signaux (-1 pour vendre, 0 pour ne rien faire, 1 pour acheter).
         """
-        # Calculer les moyennes mobiles
-        fast_ma = data['Close'].rolling(window=self.fast_window).mean()
-        slow_ma = data['Close'].rolling(window=self.slow_window).mean()
+        # Calculer les moyennes mobiles si nécessaire (colonnes SMA<période> déjà calculées sinon)
+        fast_column = f'SMA{self.fast_window}'
+        slow_column = f'SMA{self.slow_window}'
+        if fast_column in data.columns:
+            fast_ma = data[fast_column]
+        else:
+            fast_ma = data['Close'].rolling(window=self.fast_window).mean()
+        if slow_column in data.columns:
+            slow_ma = data[slow_column]
+        else:
+            slow_ma = data['Close'].rolling(window=self.slow_window).mean()
         
         # Initialiser les signaux à 0
         signals = pd.Series(0, index=data.index)
@@ -183,9 +583,11 @@ class MovingAverageCrossover(Strategy):
         # Supprime les NaN
         signals = signals.fillna(0)
         
-        # Convertir les positions en signaux (uniquement les changements)
-        signals = signals.diff()
-        signals = signals.fillna(0)
+        # Convertir les positions en signaux (uniquement les changements) ; la
+        # première barre porte la position voulue, pour que la somme cumulée des
+        # signaux redonne la position même si les moyennes sont déjà définies
+        # (données tronquées avec des colonnes SMA calculées sur tout l'historique)
+        signals = signals.diff().fillna(signals)
         
         return signals
 
@@ -206,7 +608,19 @@ class RSIStrategy(Strategy):
         self.window = window
         self.overbought = overbought
         self.oversold = oversold
+    
+    @property
+    def warmup_period(self) -> int:
+        """Historique nécessaire : la fenêtre du RSI plus la barre de la première variation."""
+        return self.window + 1
+    
+    def required_indicators(self) -> Dict[str, Tuple[Any, Callable[[pd.DataFrame], pd.Series]]]:
+        """Colonne RSI calculée sur la fenêtre de la stratégie."""
+        from algotrading.indicators import TechnicalIndicators
+        
+        return {'RSI': (('RSI', self.window), lambda data: TechnicalIndicators.rsi(data, 'Close', self.window))}
         
+    @instrument('generate_signals')
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
         """
         Génère les signaux de trading basés sur le RSI.
@@ -246,4 +660,140 @@ class RSIStrategy(Strategy):
             else:
                 previous_position = current_signal
                 
-        return signals 
\ No newline at end of file
+        return signals 
+
+class CompositeStrategy(Strategy):
+    """
+    Stratégie combinant les décisions de plusieurs stratégies.
+    
+    Les indicateurs des stratégies filles sont calculés une seule fois, les
+    positions voulues par chaque fille sont combinées barre par barre et un
+    seul backtest est effectué sur la position combinée.
+    """
+    
+    MODES = ('vote', 'weighted', 'and', 'or')
+    
+    def __init__(self, strategies: List[Strategy], mode: str = 'vote',
+                 weights: Optional[List[float]] = None, threshold: float = 0.5):
+        """
+        Initialise une stratégie composite.
+        
+        Args:
+            strategies: Stratégies filles.
+            mode: Règle de combinaison des positions :
+                  'vote' (majorité, égalité = aucune position),
+                  'weighted' (somme pondérée comparée au seuil),
+                  'and' (toutes les filles dans le même sens),
+                  'or' (au moins une fille en position, sans désaccord).
+            weights: Poids des filles en mode 'weighted' (égaux par défaut).
+            threshold: Score pondéré minimal (en valeur absolue) pour prendre position.
+            
+        Raises:
+            ValueError: Si le mode est inconnu, si aucune fille n'est fournie
+                        ou si le nombre de poids est incorrect.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Mode de combinaison inconnu : {mode}.")
+        if not strategies:
+            raise ValueError("Une stratégie composite doit avoir au moins une stratégie fille.")
+        if weights is not None and len(weights) != len(strategies):
+            raise ValueError("Il faut un poids par stratégie fille.")
+        
+        super().__init__(f"Composite_{mode}_" + "+".join(s.name for s in strategies))
+        self.strategies = list(strategies)
+        self.mode = mode
+        self.weights = np.asarray(weights if weights is not None else [1.0] * len(strategies), dtype=np.float64)
+        self.threshold = threshold
+    
+    @property
+    def warmup_period(self) -> Optional[int]:
+        """Historique nécessaire : le plus long des stratégies filles (None si l'une l'ignore)."""
+        periods = [s.warmup_period for s in self.strategies]
+        return None if any(p is None for p in periods) else max(periods)
+    
+    def required_indicators(self) -> Dict[str, Tuple[Any, Callable[[pd.DataFrame], pd.Series]]]:
+        """Colonnes d'indicateurs de toutes les stratégies filles."""
+        indicators = {}
+        for strategy in self.strategies:
+            indicators.update(strategy.required_indicators())
+        return indicators
+    
+    def child_positions(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcule la position voulue par chaque stratégie fille.
+        
+        La position d'une fille est celle que lui donnerait `backtest`
+        (somme cumulée de ses signaux), une position invalide valant 0.
+        Les indicateurs absents des données sont calculés une seule fois
+        par clé, même si plusieurs filles les utilisent.
+        
+        Args:
+            data: DataFrame contenant les données de prix.
+            
+        Returns:
+            DataFrame des positions (une colonne par fille).
+        """
+        cache: Dict[Any, pd.Series] = {}
+        positions = {}
+        for i, strategy in enumerate(self.strategies):
+            columns = {}
+            for column, (cache_key, compute) in strategy.required_indicators().items():
+                if column in data.columns:
+                    continue
+                if cache_key not in cache:
+                    cache[cache_key] = compute(data)
+                columns[column] = cache[cache_key]
+            child_data = data.assign(**columns) if columns else data
+            
+            signals = strategy.generate_signals(child_data)
+            positions[f"{i}_{strategy.name}"] = signals.cumsum().map({
+                -1: Position.SHORT.value,
+                0: Position.NONE.value,
+                1: Position.LONG.value
+            }).fillna(0)
+        return pd.DataFrame(positions, index=data.index)
+    
+    def combine(self, positions: pd.DataFrame) -> pd.Series:
+        """
+        Combine les positions des stratégies filles.
+        
+        Args:
+            positions: Positions des filles (voir `child_positions`).
+            
+        Returns:
+            Position combinée (-1, 0 ou 1) pour chaque barre.
+        """
+        values = positions.to_numpy(dtype=np.float64)
+        
+        if self.mode == 'vote':
+            combined = np.sign(values.sum(axis=1))
+        elif self.mode == 'weighted':
+            score = values @ self.weights / np.abs(self.weights).sum()
+            combined = np.where(np.abs(score) >= self.threshold, np.sign(score), 0.0)
+        elif self.mode == 'and':
+            agree = (values == values[:, :1]).all(axis=1)
+            combined = np.where(agree, values[:, 0], 0.0)
+        else:
+            longs = (values > 0).any(axis=1)
+            shorts = (values < 0).any(axis=1)
+            combined = longs.astype(np.float64) - shorts.astype(np.float64)
+        
+        return pd.Series(combined, index=positions.index)
+    
+    @instrument('generate_signals')
+    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Génère les signaux correspondant à la position combinée.
+        
+        Args:
+            data: DataFrame contenant les données de prix.
+            
+        Returns:
+            Série pandas contenant les signaux (variations de la position combinée).
+        """
+        position = self.combine(self.child_positions(data))
+        
+        # Convertir la position en signaux dont la somme cumulée redonne la position
+        signals = position.diff()
+        signals.iloc[:1] = position.iloc[:1]
+        return signals
@@ -0,0 +1,272 @@
+"""
+Module de génération vectorisée de données de marché synthétiques.
+
+Les rendements suivent un mouvement brownien géométrique, éventuellement
+avec des sauts (modèle de Merton), des changements de régime (chaîne de
+Markov commune à tous les symboles) et une corrélation entre symboles
+(décomposition de Cholesky). Les barres OHLCV produites sont cohérentes
+(High >= max(Open, Close), Low <= min(Open, Close)).
+
+La génération se fait par blocs de barres : chaque composante aléatoire a
+son propre générateur dérivé de la graine, si bien que le résultat ne
+dépend pas de la taille des blocs. Les blocs peuvent être écrits
+directement dans un stockage par symbole sans tout garder en mémoire.
+"""
+import os
+import pandas as pd
+import numpy as np
+from typing import Optional, Dict, List, Union, Tuple, Any, Iterator
+
+from algotrading.ingestion import CsvBarStore, OHLCV_COLUMNS
+
+# Composantes aléatoires, chacune avec son propre générateur
+_COMPONENTS = ('returns', 'jump_counts', 'jump_sizes', 'regimes', 'ranges', 'volumes')
+
+
+class SyntheticMarketGenerator:
+    """Générateur de barres OHLCV synthétiques pour plusieurs symboles."""
+
+    def __init__(self, symbols: Union[int, List[str]] = 1, drift: float = 0.05,
+                 volatility: float = 0.2, correlation: Union[float, np.ndarray] = 0.0,
+                 jump_intensity: float = 0.0, jump_mean: float = 0.0, jump_std: float = 0.05,
+                 regimes: Optional[List[Dict[str, float]]] = None,
+                 periods_per_year: int = 252, start: str = '2000-01-01', freq: str = 'D',
+                 initial_price: float = 100.0, bar_range: float = 0.5,
+                 base_volume: float = 5000.0, seed: int = 0):
+        """
+        Initialise le générateur.
+        
+        Args:
+            symbols: Nombre de symboles ou liste de leurs noms.
+            drift: Rendement annualisé moyen.
+            volatility: Volatilité annualisée.
+            correlation: Corrélation commune entre symboles, ou matrice de corrélation.
+            jump_intensity: Nombre moyen de sauts par an (0 pour un GBM sans saut).
+            jump_mean: Moyenne du logarithme de la taille des sauts.
+            jump_std: Écart type du logarithme de la taille des sauts.
+            regimes: Régimes de marché, chacun avec les clés 'drift',
+                     'volatility' et 'duration' (durée moyenne en barres).
+                     Remplacent `drift` et `volatility` s'ils sont fournis.
+            periods_per_year: Nombre de barres par an.
+            start: Date de la première barre.
+            freq: Fréquence des barres.
+            initial_price: Prix initial de tous les symboles.
+            bar_range: Amplitude moyenne des mèches, en écarts types du rendement par barre.
+            base_volume: Volume moyen par barre.
+            seed: Graine du générateur aléatoire.
+            
+        Raises:
+            ValueError: Si la matrice de corrélation n'est pas définie positive.
+        """
+        self.symbols = [f"SYN{i:05d}" for i in range(symbols)] if isinstance(symbols, int) else list(symbols)
+        n = len(self.symbols)
+        self.dt = 1.0 / periods_per_year
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+        self.regimes = regimes or [{'drift': drift, 'volatility': volatility, 'duration': np.inf}]
+        self.start = pd.Timestamp(start)
+        self.freq = freq
+        self.initial_price = initial_price
+        self.bar_range = bar_range
+        self.base_volume = base_volume
+        self.seed = seed
+
+        if np.isscalar(correlation):
+            matrix = np.full((n, n), float(correlation))
+            np.fill_diagonal(matrix, 1.0)
+        else:
+            matrix = np.asarray(correlation, dtype=np.float64)
+        try:
+            self._cholesky = None if np.allclose(matrix, np.eye(n)) else np.linalg.cholesky(matrix)
+        except np.linalg.LinAlgError:
+            raise ValueError("La matrice de corrélation doit être définie positive.")
+
+    def _rngs(self) -> Dict[str, np.random.Generator]:
+        """Crée un générateur indépendant par composante aléatoire."""
+        children = np.random.SeedSequence(self.seed).spawn(len(_COMPONENTS))
+        return {name: np.random.default_rng(child) for name, child in zip(_COMPONENTS, children)}
+
+    def _regime_path(self, rng: np.random.Generator, n_bars: int, state: Dict[str, Any]) -> np.ndarray:
+        """
+        Tire les régimes d'un bloc par durées géométriques, sans boucle par barre.
+        
+        L'état (régime courant et barres restantes) est reporté d'un bloc à l'autre.
+        """
+        path = np.empty(n_bars, dtype=np.int64)
+        filled = 0
+        while filled < n_bars:
+            if state['remaining'] == 0:
+                # Changement de régime vers un des autres régimes
+                shift = rng.integers(1, len(self.regimes)) if len(self.regimes) > 1 else 0
+                state['regime'] = (state['regime'] + shift) % len(self.regimes)
+            if state['remaining'] in (0, None):
+                duration = self.regimes[state['regime']]['duration']
+                state['remaining'] = np.iinfo(np.int64).max if np.isinf(duration) else \
+                    int(rng.geometric(1.0 / max(duration, 1.0)))
+            take = min(state['remaining'], n_bars - filled)
+            path[filled:filled + take] = state['regime']
+            filled += take
+            state['remaining'] -= take
+        return path
+
+    def generate_chunks(self, n_bars: int, chunk_size: int = 1000000) -> Iterator[Dict[str, Any]]:
+        """
+        Génère les barres par blocs.
+        
+        La taille des blocs est un nombre de valeurs (barres × symboles) : un
+        bloc compte `chunk_size // nombre de symboles` barres (au moins une),
+        si bien que la mémoire d'un bloc ne croît pas avec le nombre de
+        symboles. Chaque tableau d'un bloc occupe environ `8 × chunk_size`
+        octets (le double pour les mèches). Les dates sont créées bloc par bloc.
+        
+        Args:
+            n_bars: Nombre total de barres par symbole.
+            chunk_size: Nombre de valeurs (barres × symboles) par bloc.
+            
+        Yields:
+            Dictionnaires avec la clé 'index' (dates du bloc), 'regime'
+            (régime de chaque barre) et une matrice barres × symboles par
+            colonne OHLCV.
+        """
+        rngs = self._rngs()
+        n = len(self.symbols)
+        bars_per_chunk = max(chunk_size // n, 1)
+        offset = pd.tseries.frequencies.to_offset(self.freq)
+        next_date = self.start
+        drifts = np.array([r['drift'] for r in self.regimes])
+        vols = np.array([r['volatility'] for r in self.regimes])
+        last_log_close = np.full(n, np.log(self.initial_price))
+        regime_state = {'regime': 0, 'remaining': None}
+
+        for begin in range(0, n_bars, bars_per_chunk):
+            size = min(bars_per_chunk, n_bars - begin)
+            dates = pd.date_range(start=next_date, periods=size, freq=offset, name='date')
+            next_date = dates[-1] + offset
+
+            regime = self._regime_path(rngs['regimes'], size, regime_state)
+            mu = drifts[regime][:, None]
+            sigma = vols[regime][:, None]
+
+            shocks = rngs['returns'].standard_normal((size, n))
+            if self._cholesky is not None:
+                shocks = shocks @ self._cholesky.T
+            log_returns = (mu - 0.5 * sigma ** 2) * self.dt + sigma * np.sqrt(self.dt) * shocks
+
+            if self.jump_intensity > 0:
+                counts = rngs['jump_counts'].poisson(self.jump_intensity * self.dt, (size, n))
+                sizes = rngs['jump_sizes'].standard_normal((size, n))
+                log_returns += counts * self.jump_mean + np.sqrt(counts) * self.jump_std * sizes
+
+            # Somme cumulée poursuivie depuis le bloc précédent (mêmes additions quel que soit le découpage)
+            log_prices = np.cumsum(np.vstack([last_log_close[None, :], log_returns]), axis=0)
+            prices = np.exp(log_prices)
+            open_, close = prices[:-1], prices[1:]
+            last_log_close = log_prices[-1]
+
+            # Mèches proportionnelles à la volatilité par barre
+            wicks = np.abs(rngs['ranges'].standard_normal((size, n, 2)))
+            scale = self.bar_range * sigma * np.sqrt(self.dt)
+            high = np.maximum(open_, close) * np.exp(wicks[:, :, 0] * scale)
+            low = np.minimum(open_, close) * np.exp(-wicks[:, :, 1] * scale)
+
+            # Volume plus élevé lors des fortes variations
+            activity = 1 + np.abs(log_returns) / (sigma * np.sqrt(self.dt))
+            volume = np.rint(self.base_volume * activity
+                             * rngs['volumes'].lognormal(-0.125, 0.5, (size, n))).astype(np.int64)
+
+            yield {
+                'index': dates,
+                'regime': regime,
+                'Open': open_,
+                'High': high,
+                'Low': low,
+                'Close': close,
+                'Volume': volume,
+            }
+
+    def chunk_frames(self, chunk: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+        """
+        Convertit un bloc en un DataFrame par symbole.
+        
+        Args:
+            chunk: Bloc produit par `generate_chunks`.
+            
+        Returns:
+            DataFrame au format de `prepare_price_data` par symbole.
+        """
+        return {
+            symbol: pd.DataFrame({column: chunk[column][:, i] for column in OHLCV_COLUMNS},
+                                 index=chunk['index'])
+            for i, symbol in enumerate(self.symbols)
+        }
+
+    def generate(self, n_bars: int, chunk_size: int = 1000000) -> Dict[str, pd.DataFrame]:
+        """
+        Génère toutes les barres en mémoire.
+        
+        Args:
+            n_bars: Nombre de barres par symbole.
+            chunk_size: Nombre de valeurs (barres × symboles) par bloc de génération.
+            
+        Returns:
+            DataFrame au format de `prepare_price_data` par symbole.
+        """
+        frames: Dict[str, List[pd.DataFrame]] = {symbol: [] for symbol in self.symbols}
+        for chunk in self.generate_chunks(n_bars, chunk_size):
+            for symbol, df in self.chunk_frames(chunk).items():
+                frames[symbol].append(df)
+        return {symbol: pd.concat(parts) for symbol, parts in frames.items()}
+
+    def write(self, store: Any, n_bars: int, chunk_size: int = 1000000, overwrite: bool = True) -> int:
+        """
+        Écrit les barres bloc par bloc dans un stockage par symbole.
+        
+        Les barres générées commencent toujours à la même date : un historique
+        déjà présent pour un symbole est remplacé, sans quoi une nouvelle
+        exécution dupliquerait les dates.
+        
+        Args:
+            store: Stockage exposant `path_for(symbol)`, `remove(symbol)` et
+                   `append(symbol, bars)` (par exemple `CsvBarStore`).
+            n_bars: Nombre de barres par symbole.
+            chunk_size: Nombre de valeurs (barres × symboles) par bloc (borne la mémoire utilisée).
+            overwrite: Remplace les historiques existants (sinon lève une erreur).
+            
+        Returns:
+            Nombre total de barres écrites.
+            
+        Raises:
+            FileExistsError: Si un symbole est déjà stocké et que `overwrite` est faux.
+        """
+        existing = [symbol for symbol in self.symbols if os.path.exists(store.path_for(symbol))]
+        if existing and not overwrite:
+            raise FileExistsError(f"Historique déjà présent pour : {', '.join(existing)}.")
+        for symbol in existing:
+            store.remove(symbol)
+
+        written = 0
+        for chunk in self.generate_chunks(n_bars, chunk_size):
+            for symbol, df in self.chunk_frames(chunk).items():
+                store.append(symbol, df)
+                written += len(df)
+        return written
+
+    def write_csv(self, data_dir: str, n_bars: int, chunk_size: int = 1000000,
+                  overwrite: bool = True) -> int:
+        """
+        Écrit les barres dans un fichier CSV par symbole (lisible par `DataLoader`).
+        
+        Args:
+            data_dir: Répertoire de sortie.
+            n_bars: Nombre de barres par symbole.
+            chunk_size: Nombre de valeurs (barres × symboles) par bloc.
+            overwrite: Remplace les fichiers existants (voir `write`).
+            
+        Returns:
+            Nombre total de barres écrites.
+            
+        Raises:
+            FileExistsError: Si un fichier existe déjà et que `overwrite` est faux.
+        """
+        return self.write(CsvBarStore(data_dir), n_bars, chunk_size, overwrite)
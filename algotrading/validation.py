@@ -0,0 +1,178 @@
+"""
+Module de contrôle de la qualité des données de prix.
+
+Tous les contrôles (ordre et doublons des dates, valeurs manquantes, prix
+nuls ou négatifs, barres incohérentes, volumes négatifs, trous dans les
+dates, pics isolés) sont calculés en une passe vectorisée sur les tableaux
+NumPy des colonnes OHLCV, ce qui permet de les exécuter à chaque
+chargement de fichiers de plusieurs millions de lignes. Le rapport produit
+compte les problèmes et donne quelques dates d'exemple ; `repair_price_data`
+corrige les données (dédoublonnage, bornage, remplissage).
+"""
+import pandas as pd
+import numpy as np
+from typing import Optional, Dict, List, Union, Tuple, Any
+
+# Contrôles effectués, dans l'ordre du rapport
+CHECKS = ('unsorted', 'duplicates', 'missing', 'non_positive', 'inconsistent',
+          'negative_volume', 'gaps', 'spikes')
+
+# Contrôles signalant des lignes à corriger (les trous sont seulement signalés)
+_ERROR_CHECKS = ('unsorted', 'duplicates', 'missing', 'non_positive', 'inconsistent',
+                 'negative_volume', 'spikes')
+
+
+def _check_masks(df: pd.DataFrame, max_gap: Optional[Union[str, pd.Timedelta]],
+                 spike_threshold: float) -> Dict[str, np.ndarray]:
+    """
+    Calcule un masque de lignes par contrôle.
+    
+    Args:
+        df: DataFrame indexé par date avec tout ou partie des colonnes OHLCV
+            (les contrôles portant sur une colonne absente ne signalent rien).
+        max_gap: Écart maximal entre deux dates (5 fois l'écart médian par défaut).
+        spike_threshold: Seuil des pics, en écarts absolus médians des log-rendements.
+        
+    Returns:
+        Dictionnaire contrôle -> masque booléen des lignes concernées.
+    """
+    n = len(df)
+    # Seules les colonnes présentes sont contrôlées (préparation avec une partie des colonnes OHLCV)
+    columns = {column: df[column].to_numpy(dtype=np.float64)
+               for column in ('Open', 'High', 'Low', 'Close', 'Volume') if column in df.columns}
+    high, low, close, volume = (columns.get(column) for column in ('High', 'Low', 'Close', 'Volume'))
+    body = [columns[column] for column in ('Open', 'Close') if column in columns]
+    prices = np.column_stack([columns[column] for column in ('Open', 'High', 'Low', 'Close')
+                              if column in columns] or [np.empty((n, 0))])
+    no_rows = np.zeros(n, dtype=bool)
+
+    masks = {}
+
+    # Dates : ordre, doublons et trous à partir des écarts successifs, dans
+    # l'unité de l'index (sans conversion en nanosecondes)
+    is_datetime = isinstance(df.index, pd.DatetimeIndex)
+    steps = np.diff(df.index.asi8 if is_datetime else np.arange(n))
+    masks['unsorted'] = np.append(False, steps < 0)
+    masks['duplicates'] = np.zeros(n, dtype=bool)
+    masks['duplicates'][np.flatnonzero(df.index.duplicated(keep='last'))] = True
+    positive_steps = steps[steps > 0]
+    if max_gap is not None:
+        limit = pd.Timedelta(max_gap).as_unit(df.index.unit).value if is_datetime else np.inf
+    else:
+        limit = 5 * np.median(positive_steps) if len(positive_steps) else np.inf
+    masks['gaps'] = np.append(False, steps > limit)
+
+    # Valeurs manquantes et prix nuls ou négatifs
+    masks['missing'] = np.isnan(prices).any(axis=1) | (np.isnan(volume) if volume is not None else no_rows)
+    with np.errstate(invalid='ignore'):
+        masks['non_positive'] = (prices <= 0).any(axis=1)
+        # Plus haut et plus bas doivent encadrer l'ouverture et la clôture
+        inconsistent = no_rows.copy()
+        if high is not None and body:
+            inconsistent |= high < np.maximum.reduce(body)
+        if low is not None and body:
+            inconsistent |= low > np.minimum.reduce(body)
+        if high is not None and low is not None:
+            inconsistent |= high < low
+        masks['inconsistent'] = inconsistent
+        masks['negative_volume'] = volume < 0 if volume is not None else no_rows
+
+        # Pics : rendement aberrant immédiatement compensé à la barre suivante
+        if close is None:
+            masks['spikes'] = no_rows
+        else:
+            log_close = np.log(np.where(close > 0, close, np.nan))
+            returns = np.diff(log_close)
+            deviation = np.abs(returns - np.nanmedian(returns)) if n > 1 else returns
+            mad = 1.4826 * np.nanmedian(deviation) if n > 1 else np.nan
+            outlier = deviation > spike_threshold * mad if mad > 0 else np.zeros(len(returns), dtype=bool)
+            reverted = outlier[:-1] & outlier[1:] & (np.sign(returns[:-1]) != np.sign(returns[1:]))
+            masks['spikes'] = np.concatenate([[False], reverted, [False]])[:n]
+
+    return masks
+
+
+def validate_price_data(df: pd.DataFrame, max_gap: Optional[Union[str, pd.Timedelta]] = None,
+                        spike_threshold: float = 10.0, n_examples: int = 5) -> Dict[str, Any]:
+    """
+    Contrôle la qualité de données de prix.
+    
+    Args:
+        df: DataFrame indexé par date avec tout ou partie des colonnes OHLCV, avant tri.
+        max_gap: Écart maximal entre deux dates (5 fois l'écart médian par défaut).
+        spike_threshold: Seuil des pics, en écarts absolus médians des log-rendements.
+        n_examples: Nombre de dates d'exemple conservées par contrôle.
+        
+    Returns:
+        Rapport avec les clés 'n_rows', 'counts' (nombre de lignes par
+        contrôle), 'examples' (premières dates concernées) et 'valid'
+        (aucun problème autre que des trous dans les dates).
+    """
+    masks = _check_masks(df, max_gap, spike_threshold)
+    counts = {check: int(masks[check].sum()) for check in CHECKS}
+    examples = {check: list(df.index[np.flatnonzero(masks[check])[:n_examples]])
+                for check in CHECKS if counts[check]}
+    return {
+        'n_rows': len(df),
+        'counts': counts,
+        'examples': examples,
+        'valid': not any(counts[check] for check in _ERROR_CHECKS),
+    }
+
+
+def repair_price_data(df: pd.DataFrame, max_gap: Optional[Union[str, pd.Timedelta]] = None,
+                      spike_threshold: float = 10.0) -> pd.DataFrame:
+    """
+    Corrige les données de prix.
+    
+    Les pics isolés et les prix nuls ou négatifs sont remplacés par la
+    barre précédente, les dates sont triées et dédoublonnées (la dernière
+    ligne est conservée), les prix manquants sont remplis par la dernière
+    clôture connue, les volumes manquants ou négatifs sont mis à 0 et le
+    plus haut et le plus bas sont bornés pour encadrer l'ouverture et la
+    clôture. Les trous dans les dates ne sont pas comblés. Seules les
+    colonnes OHLCV présentes sont corrigées.
+    
+    Args:
+        df: DataFrame indexé par date avec tout ou partie des colonnes OHLCV.
+        max_gap: Écart maximal entre deux dates (voir `validate_price_data`).
+        spike_threshold: Seuil des pics (voir `validate_price_data`).
+        
+    Returns:
+        DataFrame corrigé, trié par date.
+    """
+    df = df[~df.index.duplicated(keep='last')].sort_index(kind='stable')
+    masks = _check_masks(df, max_gap, spike_threshold)
+    price_columns = [column for column in ('Open', 'High', 'Low', 'Close') if column in df.columns]
+
+    prices = df[price_columns].to_numpy(dtype=np.float64, copy=True)
+    with np.errstate(invalid='ignore'):
+        prices[prices <= 0] = np.nan
+    prices[masks['spikes']] = np.nan
+    columns = dict(zip(price_columns, prices.T))
+
+    # Remplissage par la barre précédente, les prix d'une barre vide valant la dernière clôture
+    if 'Close' in columns:
+        raw_close = columns['Close']
+        close = pd.Series(raw_close).ffill().to_numpy()
+        previous_close = np.append(np.nan, close[:-1])
+        for column in price_columns:
+            values = columns[column]
+            columns[column] = np.where(np.isnan(values), np.where(np.isnan(raw_close), previous_close, close),
+                                       values)
+        columns['Close'] = close
+    else:
+        columns = {column: pd.Series(values).ffill().to_numpy() for column, values in columns.items()}
+    if 'High' in columns:
+        columns['High'] = np.fmax.reduce(list(columns.values()))
+    if 'Low' in columns:
+        columns['Low'] = np.fmin.reduce(list(columns.values()))
+
+    repaired = df.copy()
+    for column, values in columns.items():
+        repaired[column] = values
+    if 'Volume' in df.columns:
+        volume = df['Volume'].to_numpy(dtype=np.float64)
+        volume = np.where(np.isnan(volume) | (volume < 0), 0.0, volume)
+        repaired['Volume'] = volume.astype(df['Volume'].dtype) if df['Volume'].dtype.kind in 'iu' else volume
+    return repaired
@@ -0,0 +1,138 @@
+"""
+Module de backtest vectorisé sur une matrice de signaux.
+
+Une matrice de signaux (jeux de paramètres × barres) est traitée en une
+seule passe : positions, rendements, commissions, capital et drawdown sont
+calculés pour toutes les lignes à la fois avec les mêmes règles que
+`Strategy.backtest`, puis résumés dans une table de métriques identique à
+`Strategy.calculate_metrics`.
+"""
+import pandas as pd
+import numpy as np
+from typing import Optional, Dict, List, Union, Tuple, Any
+
+from algotrading.costs import CostModel, apply_costs
+
+# Nombre d'éléments (jeux de paramètres × barres) traités par lot
+DEFAULT_BATCH_ELEMENTS = 4_000_000
+
+
+def backtest_matrix(signals: np.ndarray, prices: np.ndarray, initial_capital: float = 10000.0,
+                    commission: float = 0.0, cost_model: Optional[CostModel] = None,
+                    market: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+    """
+    Effectue le backtest de plusieurs séries de signaux sur les mêmes prix.
+    
+    Args:
+        signals: Matrice des signaux (jeux de paramètres × barres).
+        prices: Prix de clôture (une valeur par barre).
+        initial_capital: Capital initial.
+        commission: Commission par transaction (proportion).
+        cost_model: Modèle de coûts de transaction (voir `algotrading.costs`).
+        market: Colonnes de marché du modèle de coûts (voir `market_arrays`) ;
+                seuls les prix de clôture sont connus par défaut.
+                
+    Returns:
+        Dictionnaire de matrices (jeux de paramètres × barres) 'Position',
+        'Strategy_Returns', 'Capital', 'Trade' et 'Drawdown', plus 'Cost'
+        avec un modèle de coûts.
+    """
+    signals = np.atleast_2d(np.asarray(signals, dtype=np.float64))
+    prices = np.asarray(prices, dtype=np.float64)
+
+    # Positions : somme cumulée des signaux, hors de {-1, 0, 1} la position est indéfinie
+    cumulative = np.cumsum(signals, axis=1)
+    position = np.where((cumulative == -1) | (cumulative == 0) | (cumulative == 1), cumulative, np.nan)
+
+    if cost_model is not None:
+        if market is None:
+            market = {'close': prices, 'high': np.full_like(prices, np.nan),
+                      'low': np.full_like(prices, np.nan), 'volume': np.full_like(prices, np.nan)}
+        applied = apply_costs(position, market, cost_model, initial_capital)
+        position = applied['executed']
+
+    # Rendements du prix, puis de la stratégie (position de la barre précédente)
+    returns = np.empty_like(prices)
+    returns[:1] = np.nan
+    returns[1:] = prices[1:] / prices[:-1] - 1
+    strategy_returns = np.zeros_like(position)
+    strategy_returns[:, 1:] = position[:, :-1] * returns[1:]
+    strategy_returns[np.isnan(strategy_returns)] = 0.0
+    if cost_model is not None:
+        strategy_returns -= applied['cost']
+
+    capital = initial_capital * np.cumprod(1 + strategy_returns, axis=1)
+
+    # Transactions (la première barre part d'une position nulle)
+    trade = np.empty_like(position)
+    trade[:, :1] = np.abs(position[:, :1])
+    trade[:, 1:] = np.abs(np.diff(position, axis=1))
+
+    if commission > 0:
+        costs = trade * prices * commission
+        # Une commission indéfinie rend le capital indéfini sur cette barre seulement
+        capital = capital - np.nancumsum(costs, axis=1)
+        capital[np.isnan(costs)] = np.nan
+
+    cummax = np.fmax.accumulate(capital, axis=1)
+    cummax[np.isnan(capital)] = np.nan
+    drawdown = (capital - cummax) / cummax
+
+    results = {
+        'Position': position,
+        'Strategy_Returns': strategy_returns,
+        'Capital': capital,
+        'Trade': trade,
+        'Drawdown': drawdown,
+    }
+    if cost_model is not None:
+        results['Cost'] = applied['cost']
+    return results
+
+
+def metrics_matrix(results: Dict[str, np.ndarray], periods_per_year: int = 252) -> Dict[str, np.ndarray]:
+    """
+    Calcule les métriques de performance de chaque ligne d'un backtest matriciel.
+    
+    Args:
+        results: Résultats de `backtest_matrix`.
+        periods_per_year: Nombre de barres par an.
+        
+    Returns:
+        Dictionnaire métrique -> valeurs (une par jeu de paramètres), avec les
+        mêmes clés que `Strategy.calculate_metrics`.
+    """
+    capital = results['Capital']
+    strategy_returns = results['Strategy_Returns']
+    n_bars = capital.shape[1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total_return = capital[:, -1] / capital[:, 0] - 1
+        n_years = n_bars / periods_per_year
+        annual_return = (1 + total_return) ** (1 / n_years) - 1
+        annual_volatility = np.std(strategy_returns, axis=1, ddof=1) * np.sqrt(periods_per_year)
+        sharpe_ratio = np.where(annual_volatility > 0, annual_return / annual_volatility, 0.0)
+
+        winning = (strategy_returns > 0).sum(axis=1)
+        losing = (strategy_returns < 0).sum(axis=1)
+        win_rate = np.where(winning + losing > 0, winning / (winning + losing), 0.0)
+
+    drawdown = results['Drawdown']
+    has_drawdown = ~np.isnan(drawdown).all(axis=1)
+    max_drawdown = np.full(len(drawdown), np.nan)
+    max_drawdown[has_drawdown] = np.nanmin(drawdown[has_drawdown], axis=1)
+
+    return {
+        'total_return': total_return,
+        'annual_return': annual_return,
+        'annual_volatility': annual_volatility,
+        'sharpe_ratio': sharpe_ratio,
+        'max_drawdown': max_drawdown,
+        'n_trades': np.nansum(results['Trade'], axis=1),
+        'win_rate': win_rate,
+    }
+
+
+def batch_size_for(n_bars: int, batch_elements: int = DEFAULT_BATCH_ELEMENTS) -> int:
+    """Nombre de jeux de paramètres par lot pour borner la mémoire utilisée."""
+    return max(1, batch_elements // max(n_bars, 1))
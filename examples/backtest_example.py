@@ -7,9 +7,6 @@ Exemple de backtest d'une stratégie de trading.
 
 import os
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 import sys
 
@@ -19,11 +16,13 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from algotrading.data_loader import DataLoader
 from algotrading.indicators import TechnicalIndicators
 from algotrading.strategy import MovingAverageCrossover, RSIStrategy
+from algotrading.reporting import render_report
+from algotrading.synthetic import SyntheticMarketGenerator
 
 
 def generate_sample_data(output_file: str, periods: int = 1000):
     """
-    Génère des données de prix aléatoires avec une tendance.
+    Génère des données de prix aléatoires alternant phases haussières et baissières.
     
     Args:
         output_file: Chemin du fichier de sortie.
@@ -31,38 +30,23 @@ def generate_sample_data(output_file: str, periods: int = 1000):
     """
     print("Génération de données de test...")
     
-    # Créer des dates
-    dates = pd.date_range(start='2020-01-01', periods=periods)
-    
-    # Simuler un prix avec une tendance et des cycles
-    time = np.arange(periods)
-    trend = 0.1 * time  # Tendance haussière
-    cycle1 = 10 * np.sin(time / 100)  # Cycle long
-    cycle2 = 5 * np.sin(time / 20)  # Cycle moyen
-    noise = np.random.normal(0, 5, periods)  # Bruit aléatoire
-    
-    # Combinaison des composantes
-    close_prices = 100 + trend + cycle1 + cycle2 + noise
-    
-    # Création des autres colonnes de prix
-    data = {
-        'date': dates,
-        'Open': close_prices - np.random.uniform(0, 2, periods),
-        'High': close_prices + np.random.uniform(0, 2, periods),
-        'Low': close_prices - np.random.uniform(0, 2, periods),
-        'Close': close_prices,
-        'Volume': np.random.randint(1000, 10000, periods)
-    }
-    
-    # Création du DataFrame
-    df = pd.DataFrame(data)
-    
-    # Enregistrement des données
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    df.to_csv(output_file, index=False)
+    # Régimes de marché : tendance haussière calme et correction plus volatile
+    generator = SyntheticMarketGenerator(
+        symbols=['sample_prices'],
+        regimes=[{'drift': 0.3, 'volatility': 0.15, 'duration': 120},
+                 {'drift': -0.2, 'volatility': 0.3, 'duration': 60}],
+        jump_intensity=2.0,
+        start='2020-01-01',
+        seed=42
+    )
+    
+    # Enregistrement des données (une colonne 'date' et les colonnes OHLCV)
+    if os.path.exists(output_file):
+        os.remove(output_file)
+    generator.write_csv(os.path.dirname(output_file), periods)
     
     print(f"Données générées et enregistrées dans {output_file}")
-    return df
+    return pd.read_csv(output_file, parse_dates=['date'])
 
 
 def run_backtest():
@@ -71,12 +55,13 @@ def run_backtest():
     data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
     data_file = os.path.join(data_dir, 'sample_prices.csv')
     
+    loader = DataLoader(data_dir)
+    
     # Générer les données si elles n'existent pas
     if not os.path.exists(data_file):
         df_raw = generate_sample_data(data_file)
     else:
         # Charger les données
-        loader = DataLoader()
         df_raw = loader.load_csv('sample_prices.csv')
     
     # Préparer les données
@@ -117,6 +102,9 @@ def visualize_results(df, ma_results, rsi_results):
     """
     Visualise les résultats des backtests.
     
+    Les séries sont sous-échantillonnées avant le tracé et l'image est
+    produite sans affichage.
+    
     Args:
         df: DataFrame contenant les données de prix et les indicateurs.
         ma_results: Résultats du backtest de la stratégie de moyennes mobiles.
@@ -124,46 +112,13 @@ def visualize_results(df, ma_results, rsi_results):
     """
     print("\nCréation des graphiques...")
     
-    # Configuration des graphiques
-    sns.set(style="darkgrid")
-    plt.figure(figsize=(14, 10))
-    
-    # Graphique des prix et des moyennes mobiles
-    plt.subplot(3, 1, 1)
-    plt.plot(df.index, df['Close'], label='Prix de clôture')
-    plt.plot(df.index, df['SMA20'], label='SMA 20')
-    plt.plot(df.index, df['SMA50'], label='SMA 50')
-    plt.title('Prix et moyennes mobiles')
-    plt.legend()
-    
-    # Graphique du RSI
-    plt.subplot(3, 1, 2)
-    plt.plot(df.index, df['RSI'], label='RSI')
-    plt.axhline(y=70, color='r', linestyle='-', alpha=0.3)
-    plt.axhline(y=30, color='g', linestyle='-', alpha=0.3)
-    plt.title('RSI')
-    plt.legend()
-    
-    # Graphique des performances des stratégies
-    plt.subplot(3, 1, 3)
-    plt.plot(ma_results.index, ma_results['Capital'], label='Stratégie MA')
-    plt.plot(rsi_results.index, rsi_results['Capital'], label='Stratégie RSI')
-    plt.title('Performance des stratégies')
-    plt.legend()
-    
-    # Ajuster la mise en page
-    plt.tight_layout()
-    
     # Enregistrer le graphique
     output_dir = os.path.join(os.path.dirname(__file__), '..', 'outputs')
-    os.makedirs(output_dir, exist_ok=True)
     output_file = os.path.join(output_dir, 'backtest_results.png')
-    plt.savefig(output_file)
+    render_report(df, {'Stratégie MA': ma_results, 'Stratégie RSI': rsi_results},
+                  output_file, width_px=1400, height_px=1000)
     
     print(f"Graphique enregistré dans {output_file}")
-    
-    # Afficher le graphique
-    plt.show()
 
 
 if __name__ == '__main__':
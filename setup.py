@@ -4,4 +4,9 @@ setup(
     name="algotrading",
     version="0.1.0",
     packages=["algotrading"],
+    entry_points={
+        "console_scripts": [
+            "algotrading=algotrading.cli:main",
+        ],
+    },
 ) 
\ No newline at end of file
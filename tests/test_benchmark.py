@@ -0,0 +1,98 @@
+"""
+Tests pour le module de benchmark.
+"""
+import json
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.benchmark import (
+    make_synthetic_prices, measure, run_benchmarks, compare_to_baseline,
+    save_results, load_results, main, BENCHMARK_CASES
+)
+from algotrading.synthetic import SyntheticMarketGenerator
+
+
+def test_make_synthetic_prices():
+    """Teste la cohérence des données synthétiques."""
+    df = make_synthetic_prices(500, seed=3)
+
+    assert len(df) == 500
+    assert list(df.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    assert (df['High'] >= df[['Open', 'Close']].max(axis=1)).all()
+    assert (df['Low'] <= df[['Open', 'Close']].min(axis=1)).all()
+    pd.testing.assert_frame_equal(df, make_synthetic_prices(500, seed=3))
+    # Mêmes barres que le générateur de données synthétiques
+    pd.testing.assert_frame_equal(df, SyntheticMarketGenerator(['BENCH'], freq='min', seed=3).generate(500)['BENCH'])
+
+
+def test_measure_reports_time_and_memory():
+    """Teste la mesure du temps et du pic de mémoire."""
+    result = measure(lambda: np.ones(1_000_000), repeat=2)
+
+    assert result['time_s'] > 0
+    assert result['runs'] == 2
+    # Un tableau de 1e6 float64 occupe environ 7,6 Mo
+    assert result['peak_mb'] > 7
+
+
+def test_run_benchmarks_all_cases(tmp_path):
+    """Teste l'exécution de tous les cas sur une petite taille."""
+    report = run_benchmarks(sizes=[300], repeat=1, work_dir=str(tmp_path))
+
+    cases = {r['case'] for r in report['results']}
+    assert cases == set(BENCHMARK_CASES)
+    assert all(r['n_bars'] == 300 for r in report['results'])
+    assert 'pandas' in report['meta']
+
+    with pytest.raises(ValueError):
+        run_benchmarks(sizes=[100], cases=['inexistant'])
+
+
+def test_multi_symbol_case_memory(tmp_path):
+    """Teste que le cas multi-symboles répartit la taille entre les symboles."""
+    report = run_benchmarks(sizes=[100000], cases=['add_all_indicators', 'add_all_indicators_symbols'],
+                            repeat=1, work_dir=str(tmp_path))
+
+    single, symbols = (r['peak_mb'] for r in report['results'])
+    assert symbols < 1.5 * single
+
+
+def test_compare_to_baseline():
+    """Teste la détection des régressions."""
+    baseline = {'results': [
+        {'case': 'sma', 'n_bars': 1000, 'time_s': 0.1, 'peak_mb': 10.0},
+        {'case': 'ema', 'n_bars': 1000, 'time_s': 0.1, 'peak_mb': 10.0},
+        {'case': 'rsi', 'n_bars': 1000, 'time_s': 1e-5, 'peak_mb': 10.0},
+    ]}
+    report = {'results': [
+        {'case': 'sma', 'n_bars': 1000, 'time_s': 0.2, 'peak_mb': 10.0},
+        {'case': 'ema', 'n_bars': 1000, 'time_s': 0.11, 'peak_mb': 30.0},
+        {'case': 'rsi', 'n_bars': 1000, 'time_s': 1e-4, 'peak_mb': 10.0},
+    ]}
+
+    regressions = compare_to_baseline(report, baseline, threshold=0.25)
+    assert [(r['case'], r['metric']) for r in regressions] == [('sma', 'time_s')]
+
+    regressions = compare_to_baseline(report, baseline, threshold=0.25, memory_threshold=0.5)
+    assert ('ema', 'peak_mb') in [(r['case'], r['metric']) for r in regressions]
+
+
+def test_main_fails_on_regression(tmp_path):
+    """Teste le code de sortie de la ligne de commande face à une référence."""
+    output = str(tmp_path / "results.json")
+    baseline = str(tmp_path / "baseline.json")
+
+    # Première exécution : création de la référence
+    assert main(['--sizes', '2000', '--cases', 'rsi_strategy_signals', '--repeat', '1',
+                 '--output', output, '--baseline', baseline]) == 0
+
+    # Référence artificiellement très rapide : régression détectée
+    reference = load_results(baseline)
+    for r in reference['results']:
+        r['time_s'] = 1e-9
+    save_results(reference, baseline)
+
+    assert main(['--sizes', '2000', '--cases', 'rsi_strategy_signals', '--repeat', '1',
+                 '--no-memory', '--output', output, '--baseline', baseline]) == 1
+    with open(output) as f:
+        assert json.load(f)['results'][0]['peak_mb'] is None
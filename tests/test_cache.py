@@ -0,0 +1,164 @@
+"""
+Tests pour le module de cache des backtests.
+"""
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading import cache as cache_module
+from algotrading.cache import BacktestCache, data_fingerprint, strategy_fingerprint
+from algotrading.costs import FixedBps, SquareRootImpact, CompositeCostModel
+from algotrading.strategy import MovingAverageCrossover, RSIStrategy, CompositeStrategy
+
+
+@pytest.fixture
+def sample_price_data():
+    """Crée un DataFrame de test avec des données de prix."""
+    dates = pd.date_range(start='2023-01-01', periods=200)
+    rng = np.random.default_rng(0)
+    close_prices = 100 + np.cumsum(rng.normal(0, 1, 200))
+
+    data = {
+        'Open': close_prices - rng.uniform(0, 1, 200),
+        'High': close_prices + rng.uniform(0, 1, 200),
+        'Low': close_prices - rng.uniform(0, 1, 200),
+        'Close': close_prices,
+        'Volume': rng.integers(1000, 10000, 200)
+    }
+    return pd.DataFrame(data, index=dates)
+
+
+def test_fingerprints(sample_price_data):
+    """Teste que les empreintes dépendent des données et des paramètres."""
+    df = sample_price_data
+
+    assert data_fingerprint(df) == data_fingerprint(df.copy())
+    modified = df.copy()
+    modified.iloc[10, 3] += 1e-9
+    assert data_fingerprint(df) != data_fingerprint(modified)
+
+    assert strategy_fingerprint(MovingAverageCrossover(10, 30)) == \
+        strategy_fingerprint(MovingAverageCrossover(10, 30))
+    assert strategy_fingerprint(MovingAverageCrossover(10, 30)) != \
+        strategy_fingerprint(MovingAverageCrossover(10, 31))
+
+
+def test_composite_fingerprint_is_deterministic(tmp_path, sample_price_data):
+    """Teste que deux composites identiques partagent leur empreinte et leur entrée de cache."""
+    def composite(weights, slow_window=30):
+        return CompositeStrategy([MovingAverageCrossover(10, slow_window), RSIStrategy(14, 70, 30)],
+                                 mode='weighted', weights=weights)
+
+    assert strategy_fingerprint(composite([1.0, 2.0])) == strategy_fingerprint(composite([1.0, 2.0]))
+    assert strategy_fingerprint(composite([1.0, 2.0])) != strategy_fingerprint(composite([2.0, 1.0]))
+    assert strategy_fingerprint(composite([1.0, 2.0])) != strategy_fingerprint(composite([1.0, 2.0], 31))
+    assert 'object at' not in repr(composite([1.0, 2.0]).params())
+
+    cache = BacktestCache(str(tmp_path / "cache"))
+    cache.backtest(composite([1.0, 2.0]), sample_price_data)
+    cache.backtest(composite([1.0, 2.0]), sample_price_data)
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_cache_hit_returns_same_results(tmp_path, sample_price_data):
+    """Teste qu'un second appel identique est servi par le cache."""
+    cache = BacktestCache(str(tmp_path / "cache"))
+    strategy = MovingAverageCrossover(fast_window=10, slow_window=30)
+
+    results1, metrics1 = cache.backtest(strategy, sample_price_data, commission=0.001)
+    results2, metrics2 = cache.backtest(MovingAverageCrossover(10, 30), sample_price_data,
+                                        commission=0.001)
+
+    assert cache.misses == 1
+    assert cache.hits == 1
+    pd.testing.assert_frame_equal(results1, results2)
+    assert metrics1.keys() == metrics2.keys()
+
+    # Une commission différente est un autre backtest
+    cache.backtest(strategy, sample_price_data, commission=0.002)
+    assert cache.misses == 2
+
+
+def test_code_change_invalidates(tmp_path, sample_price_data):
+    """Teste qu'une modification du code de la stratégie change la clé."""
+    cache = BacktestCache(str(tmp_path / "cache"))
+    strategy = MovingAverageCrossover(10, 30)
+    key = cache.make_key(strategy, sample_price_data)
+
+    class PatchedCrossover(MovingAverageCrossover):
+        def generate_signals(self, data):
+            return -super().generate_signals(data)
+
+    patched = PatchedCrossover(10, 30)
+    assert cache.make_key(patched, sample_price_data) != key
+
+
+def test_backtest_module_change_invalidates(tmp_path, sample_price_data, monkeypatch):
+    """Teste qu'une modification d'un module utilisé par le backtest change la clé."""
+    cache = BacktestCache(str(tmp_path / "cache"))
+    strategy = MovingAverageCrossover(10, 30)
+    key = cache.make_key(strategy, sample_price_data)
+
+    # Simuler une modification du code des indicateurs
+    cache_module._module_fingerprint('algotrading.indicators')
+    monkeypatch.setitem(cache_module._MODULE_FINGERPRINTS, 'algotrading.indicators', 'modifié')
+    assert cache.make_key(strategy, sample_price_data) != key
+
+
+def test_cost_model_is_part_of_key(tmp_path, sample_price_data):
+    """Teste que le modèle de coûts est transmis au backtest et inclus dans la clé."""
+    cache = BacktestCache(str(tmp_path / "cache"))
+    strategy = MovingAverageCrossover(10, 30)
+    model = CompositeCostModel([FixedBps(10), SquareRootImpact()])
+
+    plain, _ = cache.backtest(strategy, sample_price_data)
+    charged, _ = cache.backtest(strategy, sample_price_data, cost_model=model)
+    again, _ = cache.backtest(strategy, sample_price_data,
+                              cost_model=CompositeCostModel([FixedBps(10), SquareRootImpact()]))
+    cache.backtest(strategy, sample_price_data, cost_model=FixedBps(20))
+
+    assert 'Cost' in charged.columns and 'Cost' not in plain.columns
+    pd.testing.assert_frame_equal(again, charged)
+    assert cache.misses == 3 and cache.hits == 1
+
+
+def test_explicit_invalidation(tmp_path, sample_price_data):
+    """Teste l'invalidation explicite par classe de stratégie."""
+    cache = BacktestCache(str(tmp_path / "cache"))
+    cache.backtest(MovingAverageCrossover(10, 30), sample_price_data)
+    cache.backtest(MovingAverageCrossover(5, 20), sample_price_data)
+    cache.backtest(RSIStrategy(), sample_price_data)
+
+    assert cache.invalidate(MovingAverageCrossover()) == 2
+    assert len(os.listdir(cache.cache_dir)) == 1
+    assert cache.invalidate() == 1
+
+
+def test_size_bounded_eviction(tmp_path, sample_price_data):
+    """Teste l'éviction des entrées les moins récemment utilisées."""
+    cache = BacktestCache(str(tmp_path / "cache"))
+    cache.backtest(MovingAverageCrossover(10, 30), sample_price_data)
+    entry_size = cache.size()
+
+    # Limiter le cache à deux entrées
+    cache.max_size_bytes = int(entry_size * 2.5)
+    for fast in (5, 6, 7):
+        cache.backtest(MovingAverageCrossover(fast, 30), sample_price_data)
+
+    assert cache.size() <= cache.max_size_bytes
+    assert len(os.listdir(cache.cache_dir)) == 2
+
+
+def test_corrupted_entry_is_recomputed(tmp_path, sample_price_data):
+    """Teste qu'une entrée corrompue est ignorée puis recalculée."""
+    cache = BacktestCache(str(tmp_path / "cache"))
+    strategy = MovingAverageCrossover(10, 30)
+    key = cache.make_key(strategy, sample_price_data)
+    cache.backtest(strategy, sample_price_data)
+
+    with open(os.path.join(cache.cache_dir, f"{key}.bt"), 'wb') as f:
+        f.write(b"corrompu")
+
+    assert cache.get(key) is None
+    cache.backtest(strategy, sample_price_data)
+    assert cache.misses == 2
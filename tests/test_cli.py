@@ -0,0 +1,127 @@
+"""
+Tests pour l'interface en ligne de commande.
+"""
+import json
+import subprocess
+import sys
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.cli import main, load_config, expand_grid, resolve_strategy_class
+from algotrading.strategy import MovingAverageCrossover
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    """Crée un fichier de prix et des configurations dans un répertoire temporaire."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    dates = pd.date_range(start='2023-01-01', periods=200)
+    close_prices = 100 + np.cumsum(np.random.normal(0, 1, 200))
+    pd.DataFrame({
+        'date': dates,
+        'Open': close_prices,
+        'High': close_prices + 1,
+        'Low': close_prices - 1,
+        'Close': close_prices,
+        'Volume': np.random.randint(1000, 10000, 200)
+    }).to_csv(data_dir / "prices.csv", index=False)
+
+    config = {
+        'data': {'file': 'prices.csv', 'data_dir': 'data'},
+        'strategy': {'type': 'MovingAverageCrossover', 'params': {'fast_window': 10, 'slow_window': 30}},
+        'backtest': {'initial_capital': 10000.0, 'commission': 0.001},
+        'output': {'metrics': 'outputs/metrics.json'},
+    }
+    with open(tmp_path / "ma.json", 'w') as f:
+        json.dump(config, f)
+
+    with open(tmp_path / "rsi.toml", 'w') as f:
+        f.write('[data]\nfile = "prices.csv"\ndata_dir = "data"\n\n'
+                '[strategy]\ntype = "RSIStrategy"\n\n'
+                '[grid]\nwindow = [7, 14]\noversold = [20, 30]\n')
+    return tmp_path
+
+
+def test_help_does_not_import_heavy_modules():
+    """Teste que l'aide s'affiche sans importer pandas ni numpy."""
+    code = ("import sys\n"
+            "from algotrading import cli\n"
+            "try:\n"
+            "    cli.main(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "assert 'pandas' not in sys.modules, 'pandas importé'\n"
+            "assert 'numpy' not in sys.modules, 'numpy importé'\n")
+    completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+
+    assert completed.returncode == 0, completed.stderr
+    assert 'backtest' in completed.stdout
+
+
+def test_load_config_formats(config_dir):
+    """Teste le chargement des configurations JSON et TOML."""
+    json_config = load_config(str(config_dir / "ma.json"))
+    toml_config = load_config(str(config_dir / "rsi.toml"))
+
+    assert json_config['strategy']['type'] == 'MovingAverageCrossover'
+    assert toml_config['grid']['window'] == [7, 14]
+    assert json_config['_name'] == 'ma'
+
+    with pytest.raises(ValueError):
+        load_config(str(config_dir / "data" / "prices.csv"))
+
+
+def test_resolve_strategy_class():
+    """Teste la résolution des stratégies par nom court et par chemin."""
+    assert resolve_strategy_class('MovingAverageCrossover') is MovingAverageCrossover
+    assert resolve_strategy_class('algotrading.strategy:MovingAverageCrossover') is MovingAverageCrossover
+    with pytest.raises(ValueError):
+        resolve_strategy_class('Inexistante')
+
+
+def test_backtest_command(config_dir, capsys):
+    """Teste la sous-commande backtest et l'écriture des métriques."""
+    assert main(['backtest', str(config_dir / "ma.json")]) == 0
+
+    output = capsys.readouterr().out
+    assert 'sharpe_ratio' in output
+    with open(config_dir / "outputs" / "metrics.json") as f:
+        metrics = json.load(f)
+    assert 'total_return' in metrics
+
+
+def test_backtest_command_parallel(config_dir, capsys):
+    """Teste l'exécution parallèle d'un lot de configurations."""
+    path = str(config_dir / "ma.json")
+    assert main(['backtest', path, path, '--jobs', '2']) == 0
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith('ma')]
+    assert len(lines) == 2
+
+
+def test_sweep_command(config_dir):
+    """Teste la sous-commande sweep sur une grille de paramètres."""
+    config = load_config(str(config_dir / "rsi.toml"))
+    assert len(expand_grid(config)) == 4
+
+    output = str(config_dir / "sweep.json")
+    assert main(['sweep', str(config_dir / "rsi.toml"), '--jobs', '2', '--output', output]) == 0
+
+    with open(output) as f:
+        summaries = json.load(f)
+    assert len(summaries) == 4
+    assert {s['params']['window'] for s in summaries} == {7, 14}
+
+
+def test_ingest_command(tmp_path, capsys):
+    """Teste la sous-commande ingest avec un connecteur de rejeu."""
+    with open(tmp_path / "stream.jsonl", 'w') as f:
+        for i in range(10):
+            f.write(json.dumps({'symbol': 'ABC', 'timestamp': 1672531200 + 60 * i, 'close': 10 + i}) + "\n")
+    with open(tmp_path / "ingest.json", 'w') as f:
+        json.dump({'connectors': [{'type': 'file', 'path': 'stream.jsonl'}],
+                   'store': {'data_dir': 'store'}, 'flush_interval': 0.01}, f)
+
+    assert main(['ingest', str(tmp_path / "ingest.json")]) == 0
+    assert 'bars_written: 10' in capsys.readouterr().out
+    assert len(pd.read_csv(tmp_path / "store" / "ABC.csv")) == 10
@@ -0,0 +1,126 @@
+"""
+Tests pour le module des modèles de coûts de transaction.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.costs import (FixedBps, SpreadCost, SquareRootImpact, CapacityLimit,
+                               CompositeCostModel, apply_capacity, apply_costs)
+from algotrading.strategy import MovingAverageCrossover
+from algotrading.synthetic import SyntheticMarketGenerator
+
+
+@pytest.fixture
+def market_data():
+    """Crée des barres OHLCV synthétiques."""
+    return SyntheticMarketGenerator(seed=3).generate(600)['SYN00000']
+
+
+def test_cost_rates():
+    """Teste les taux de coût des modèles élémentaires."""
+    market = {
+        'close': np.array([100.0, 100.0]),
+        'high': np.array([101.0, 102.0]),
+        'low': np.array([99.0, 98.0]),
+        'volume': np.array([1000.0, 1000.0]),
+    }
+    participation = np.array([0.01, 0.04])
+
+    np.testing.assert_allclose(FixedBps(10).cost_rate(market, participation), 0.001)
+    np.testing.assert_allclose(SpreadCost(spread_bps=4).cost_rate(market, participation), 0.0002)
+    # Écart estimé : 10 % de l'amplitude de la barre, dont on paie la moitié
+    np.testing.assert_allclose(SpreadCost().cost_rate(market, participation), [0.001, 0.002])
+
+    # L'impact double quand la participation est multipliée par 4
+    impact = SquareRootImpact(volatility_window=2).cost_rate(
+        {**market, 'close': np.array([100.0, 101.0])}, participation)
+    assert impact[1] == pytest.approx(2 * impact[0])
+
+    # Sans anticipation : le coût d'une barre ne dépend pas des prix suivants
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.01, 50)))
+    shocked = close.copy()
+    shocked[10:] *= 1.5
+    rates = [SquareRootImpact(volatility_window=5).cost_rate({'close': prices}, np.full(50, 0.01))
+             for prices in (close, shocked)]
+    np.testing.assert_array_equal(rates[0][:10], rates[1][:10])
+    assert rates[0][0] == rates[0][1] == 0
+
+    composite = CompositeCostModel([FixedBps(10), SpreadCost(spread_bps=4)])
+    np.testing.assert_allclose(composite.cost_rate(market, participation), 0.0012)
+
+
+def test_apply_capacity_and_costs():
+    """Teste l'exécution progressive sous une limite de capacité."""
+    target = np.array([0.0, 1.0, 1.0, 1.0, 1.0, -1.0, -1.0, -1.0, 0.0, 0.0])
+    capacity = np.full(10, 0.5)
+
+    executed = apply_capacity(target, capacity)
+    np.testing.assert_allclose(executed, [0, 0.5, 1, 1, 1, 0.5, 0, -0.5, 0, 0])
+
+    # Capacité de 10 % du volume : 0,5 unité de position par barre pour un capital de 10 000
+    market = {'close': np.full(10, 100.0), 'high': np.full(10, np.nan), 'low': np.full(10, np.nan),
+              'volume': np.full(10, 500.0)}
+    applied = apply_costs(np.vstack([target, target]), market,
+                          CompositeCostModel([CapacityLimit(0.1), FixedBps(10)]), notional=10000.0)
+    np.testing.assert_allclose(applied['executed'][1], executed)
+    np.testing.assert_allclose(applied['participation'][0], applied['trade'][0] * 0.2)
+    np.testing.assert_allclose(applied['cost'][0], applied['trade'][0] * 0.001)
+
+
+def test_apply_capacity_matches_bar_by_bar():
+    """Teste l'exécution vectorisée sur plusieurs lignes contre un calcul barre par barre."""
+    rng = np.random.default_rng(0)
+    target = rng.choice([-1.0, 0.0, 1.0], size=(20, 300), p=[0.02, 0.96, 0.02]).cumsum(axis=1).clip(-1, 1)
+    capacity = rng.uniform(0, 0.4, 300)
+    capacity[rng.choice(300, 30)] = np.inf
+
+    expected = np.zeros_like(target)
+    for row in range(len(target)):
+        current = 0.0
+        for t in range(target.shape[1]):
+            current += np.clip(target[row, t] - current, -capacity[t], capacity[t])
+            expected[row, t] = current
+
+    np.testing.assert_allclose(apply_capacity(target, capacity), expected, atol=1e-12)
+    np.testing.assert_allclose(apply_capacity(target[3], capacity), expected[3], atol=1e-12)
+
+
+def test_backtest_with_cost_model(market_data):
+    """Teste le backtest avec un modèle de coûts et l'effet de la taille du capital."""
+    strategy = MovingAverageCrossover(fast_window=5, slow_window=20)
+
+    # Sans coût, le modèle ne change rien
+    reference = strategy.backtest(market_data)
+    free = strategy.backtest(market_data, cost_model=FixedBps(0))
+    np.testing.assert_allclose(free['Capital'], reference['Capital'])
+
+    # Le coût fixe est déduit des rendements à chaque transaction
+    charged = strategy.backtest(market_data, cost_model=FixedBps(10))
+    np.testing.assert_allclose(charged['Cost'], charged['Trade'] * 0.001)
+    assert charged['Capital'].iloc[-1] < reference['Capital'].iloc[-1]
+
+    # Un capital plus élevé subit plus d'impact et n'est plus exécuté en une barre
+    model = CompositeCostModel([SquareRootImpact(), CapacityLimit(0.01)])
+    small = strategy.backtest(market_data, initial_capital=1e3, cost_model=model)
+    large = strategy.backtest(market_data, initial_capital=1e7, cost_model=model)
+    assert (small['Position'] == small['Target_Position'].fillna(0)).all()
+    assert (large['Position'] != large['Target_Position'].fillna(0)).any()
+    assert large['Participation'].max() <= 0.01 + 1e-12
+    # Coût moyen par unité échangée plus élevé
+    assert large['Cost'].sum() / large['Trade'].sum() > small['Cost'].sum() / small['Trade'].sum()
+
+
+def test_backtest_matrix_with_cost_model(market_data):
+    """Teste l'égalité entre le backtest matriciel et le backtest individuel avec coûts."""
+    param_sets = [{'fast_window': 5, 'slow_window': 20}, {'fast_window': 10, 'slow_window': 40}]
+    model = CompositeCostModel([SpreadCost(), SquareRootImpact(), CapacityLimit(0.05)])
+
+    table = MovingAverageCrossover.backtest_matrix(market_data, param_sets, initial_capital=1e6,
+                                                   cost_model=model)
+
+    for row, params in zip(table.itertuples(), param_sets):
+        strategy = MovingAverageCrossover(**params)
+        results = strategy.backtest(market_data, initial_capital=1e6, cost_model=model)
+        metrics = strategy.calculate_metrics(results)
+        assert row.total_return == pytest.approx(metrics['total_return'])
+        assert row.max_drawdown == pytest.approx(metrics['max_drawdown'])
@@ -0,0 +1,79 @@
+"""
+Tests pour le module de covariance incrémentale.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.covariance import (
+    RollingCovariance, EWMACovariance, iter_covariances, volatility_scaled_weights
+)
+
+
+@pytest.fixture
+def returns():
+    """Crée une matrice de rendements corrélés (dates × symboles)."""
+    rng = np.random.default_rng(0)
+    n, n_assets = 400, 6
+    common = rng.normal(0, 0.01, (n, 1))
+    values = common + rng.normal(0, 0.01, (n, n_assets)) * np.linspace(0.5, 2.0, n_assets)
+    return pd.DataFrame(values, index=pd.date_range(start='2020-01-01', periods=n),
+                        columns=[f"S{i}" for i in range(n_assets)])
+
+
+def test_rolling_matches_pandas(returns):
+    """Teste la covariance glissante contre pandas."""
+    window = 50
+    expected = returns.rolling(window).cov()
+    engine = RollingCovariance(returns.shape[1], window, recompute_every=1000)
+
+    for i, (date, row) in enumerate(returns.iterrows()):
+        engine.update(row.to_numpy())
+        if i + 1 >= window and i % 37 == 0:
+            np.testing.assert_allclose(engine.covariance(), expected.loc[date].to_numpy(), atol=1e-12)
+
+    assert engine.ready
+    np.testing.assert_allclose(engine.correlation(), returns.iloc[-window:].corr().to_numpy(), atol=1e-9)
+
+
+def test_ewma_matches_pandas(returns):
+    """Teste la covariance exponentielle contre pandas."""
+    engine = EWMACovariance(returns.shape[1], halflife=20)
+    for row in returns.to_numpy():
+        engine.update(row)
+
+    alpha = 1 - np.exp(-np.log(2) / 20)
+    expected = returns.ewm(alpha=alpha, adjust=False).cov(bias=True).loc[returns.index[-1]]
+    np.testing.assert_allclose(engine.covariance(), expected.to_numpy(), atol=1e-15)
+
+    with pytest.raises(ValueError):
+        EWMACovariance(3, alpha=0.1, span=10)
+
+
+def test_iter_covariances_batch(returns):
+    """Teste le mode par lot sur un historique."""
+    window = 30
+    produced = list(iter_covariances(returns, window=window, step=10))
+
+    assert len(produced) == len(range(window - 1, len(returns), 10))
+    date, covariance = produced[-1]
+    position = returns.index.get_loc(date)
+    expected = returns.iloc[position - window + 1:position + 1].cov().to_numpy()
+    np.testing.assert_allclose(covariance, expected, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        next(iter_covariances(returns))
+
+
+def test_volatility_scaled_weights(returns):
+    """Teste l'allocation pondérée par la volatilité."""
+    covariance = returns.cov().to_numpy()
+
+    weights = volatility_scaled_weights(covariance, target_volatility=0.05, max_leverage=10.0)
+    volatility = np.sqrt(weights @ covariance @ weights * 252)
+
+    assert volatility == pytest.approx(0.05)
+    # Les symboles les plus volatils reçoivent les poids les plus faibles
+    assert np.all(np.diff(weights) < 0)
+
+    capped = volatility_scaled_weights(covariance, target_volatility=5.0, max_leverage=1.0)
+    assert np.abs(capped).sum() == pytest.approx(1.0)
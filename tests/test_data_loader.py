@@ -101,4 +101,17 @@ def test_column_validation():
     
     # Devrait toujours lever une exception car toutes les colonnes requises ne sont pas spécifiées
     with pytest.raises(ValueError):
-        loader.prepare_price_data(df, ohlcv_cols=custom_cols) 
\ No newline at end of file
+        loader.prepare_price_data(df, ohlcv_cols=custom_cols) 
+
+def test_iter_csv_chunks(sample_data_csv):
+    """Teste la lecture par blocs d'un fichier CSV."""
+    data_dir, filename, original_df = sample_data_csv
+
+    loader = DataLoader(data_dir=data_dir)
+    chunks = list(loader.iter_csv_chunks(filename, chunksize=4))
+
+    # 10 lignes en blocs de 4 : 4 + 4 + 2
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+
+    full = loader.prepare_price_data(loader.load_csv(filename))
+    pd.testing.assert_frame_equal(pd.concat(chunks), full)
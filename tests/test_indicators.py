@@ -152,4 +152,27 @@ def test_add_all_indicators(sample_price_data):
     assert all(col in result.columns for col in expected_columns)
     
     # Vérifier que le DataFrame résultant a la même longueur que le DataFrame d'origine
-    assert len(result) == len(df) 
\ No newline at end of file
+    assert len(result) == len(df) 
+
+@pytest.mark.parametrize("n_jobs", [2, None])
+def test_add_all_indicators_threads(sample_price_data, n_jobs):
+    """Teste que le calcul sur plusieurs threads donne les mêmes colonnes."""
+    df = sample_price_data
+
+    expected = TechnicalIndicators.add_all_indicators(df, 'Close')
+    result = TechnicalIndicators.add_all_indicators(df, 'Close', n_jobs=n_jobs)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_add_all_indicators_many(sample_price_data):
+    """Teste le calcul des indicateurs de plusieurs symboles sur un pool existant."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    frames = {'ABC': sample_price_data, 'XYZ': sample_price_data * 2}
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = TechnicalIndicators.add_all_indicators_many(frames, executor=executor)
+
+    assert set(results) == {'ABC', 'XYZ'}
+    for symbol, df in frames.items():
+        pd.testing.assert_frame_equal(results[symbol], TechnicalIndicators.add_all_indicators(df))
@@ -0,0 +1,184 @@
+"""
+Tests pour le module d'ingestion asynchrone.
+"""
+import asyncio
+import json
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.data_loader import DataLoader
+from algotrading.ingestion import (
+    normalize_message, bars_to_frame, CsvBarStore,
+    FileReplayConnector, MarketDataIngestor, MarketDataConnector
+)
+
+
+@pytest.fixture
+def replay_file(tmp_path):
+    """Crée un fichier JSON lines avec des klines Binance et des mises à jour répétées."""
+    path = tmp_path / "stream.jsonl"
+    start = pd.Timestamp('2023-01-01').value // 10**6
+    lines = []
+    for i in range(50):
+        for update in range(2):
+            lines.append({
+                'e': 'kline',
+                's': 'BTCUSDT',
+                'k': {
+                    't': start + i * 60000,
+                    'o': str(100 + i),
+                    'h': str(101 + i + update),
+                    'l': str(99 + i),
+                    'c': str(100.5 + i + update),
+                    'v': str(10 + update),
+                }
+            })
+    with open(path, 'w') as f:
+        for line in lines:
+            f.write(json.dumps(line) + "\n")
+    return str(path)
+
+
+def test_normalize_message_formats():
+    """Teste la normalisation des formats Binance, Oanda et générique."""
+    binance = normalize_message({'e': 'kline', 's': 'BTCUSDT',
+                                 'k': {'t': 1672531200000, 'o': '1', 'h': '2',
+                                       'l': '0.5', 'c': '1.5', 'v': '3'}})
+    assert binance['symbol'] == 'BTCUSDT'
+    assert binance['date'] == pd.Timestamp('2023-01-01')
+    assert binance['High'] == 2.0
+
+    oanda = normalize_message({'instrument': 'EUR_USD', 'time': '2023-01-01T00:00:00Z',
+                               'mid': {'o': '1.1', 'h': '1.2', 'l': '1.0', 'c': '1.15'},
+                               'volume': 42})
+    assert oanda['symbol'] == 'EUR_USD'
+    assert oanda['Close'] == 1.15
+    assert oanda['Volume'] == 42.0
+
+    generic = normalize_message({'date': '2023-01-02', 'close': 10}, default_symbol='X')
+    assert generic['Open'] == generic['High'] == generic['Low'] == 10.0
+
+    # Un message sans prix n'est pas une barre
+    assert normalize_message({'e': 'heartbeat'}) is None
+
+
+def test_bars_to_frame_coalesces_updates():
+    """Teste la fusion des mises à jour d'une même barre."""
+    bars = [
+        {'symbol': 'A', 'date': pd.Timestamp('2023-01-02'), 'Open': 1, 'High': 2,
+         'Low': 1, 'Close': 2, 'Volume': 5},
+        {'symbol': 'A', 'date': pd.Timestamp('2023-01-01'), 'Open': 1, 'High': 1,
+         'Low': 1, 'Close': 1, 'Volume': 1},
+        {'symbol': 'A', 'date': pd.Timestamp('2023-01-02'), 'Open': 1, 'High': 3,
+         'Low': 1, 'Close': 3, 'Volume': 7},
+    ]
+    df = bars_to_frame(bars)
+
+    assert len(df) == 2
+    assert df.index.is_monotonic_increasing
+    assert df.loc['2023-01-02', 'Close'] == 3
+
+
+def test_ingestion_writes_loadable_csv(tmp_path, replay_file):
+    """Teste l'ingestion complète jusqu'à un CSV lisible par DataLoader."""
+    data_dir = str(tmp_path / "data")
+    store = CsvBarStore(data_dir)
+    ingestor = MarketDataIngestor([FileReplayConnector(replay_file)], store,
+                                  queue_size=8, batch_size=16, flush_interval=0.05)
+
+    stats = asyncio.run(ingestor.run())
+
+    assert stats['messages'] == 100
+    assert stats['batches'] >= 2
+    # La file bornée n'est jamais dépassée
+    assert stats['max_queue_depth'] <= 8
+
+    loader = DataLoader(data_dir=data_dir)
+    df = loader.prepare_price_data(loader.load_csv("BTCUSDT.csv"))
+
+    assert len(df) == 50
+    assert list(df.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    # La dernière mise à jour de chaque barre est conservée
+    assert np.allclose(df['Close'].values, np.arange(50) + 101.5)
+
+
+def test_backpressure_bounds_queue(tmp_path):
+    """Teste que la file reste bornée avec un consommateur lent."""
+
+    class FastConnector(MarketDataConnector):
+        async def messages(self):
+            for i in range(200):
+                yield {'symbol': 'X', 'timestamp': 1672531200 + i, 'close': 1.0}
+
+    class SlowStore:
+        def __init__(self):
+            self.rows = 0
+
+        def append(self, symbol, bars):
+            import time
+            time.sleep(0.001)
+            self.rows += len(bars)
+
+    store = SlowStore()
+    ingestor = MarketDataIngestor([FastConnector('fast'), FastConnector('fast2')], store,
+                                  queue_size=5, batch_size=4, flush_interval=0.01)
+    stats = asyncio.run(ingestor.run())
+
+    assert stats['messages'] == 400
+    assert stats['max_queue_depth'] <= 5
+    # Les deux connecteurs produisent les mêmes horodatages : fusion par lot
+    assert 200 <= store.rows <= 400
+
+
+def test_pending_bar_not_duplicated(tmp_path, replay_file):
+    """Teste qu'une barre mise à jour sur deux lots n'est écrite qu'une fois."""
+    store = CsvBarStore(str(tmp_path / "data"))
+    ingestor = MarketDataIngestor([FileReplayConnector(replay_file)], store,
+                                  queue_size=3, batch_size=3, flush_interval=0.01)
+    asyncio.run(ingestor.run())
+
+    df = pd.read_csv(store.path_for('BTCUSDT'), parse_dates=['date'])
+    assert df['date'].is_unique
+    assert len(df) == 50
+
+
+def test_connector_default_symbol(tmp_path):
+    """Teste que le symbole par défaut du connecteur ne remplace pas celui du message."""
+    path = tmp_path / "oanda.jsonl"
+    with open(path, 'w') as f:
+        f.write(json.dumps({'instrument': 'EUR_USD', 'time': '2023-01-02T00:00:00Z',
+                            'mid': {'o': 1.1, 'h': 1.2, 'l': 1.0, 'c': 1.15}, 'volume': 3}) + "\n")
+        f.write(json.dumps({'time': '2023-01-02T00:01:00Z', 'close': 10}) + "\n")
+
+    store = CsvBarStore(str(tmp_path / "data"))
+    ingestor = MarketDataIngestor([FileReplayConnector(str(path), symbol='DEFAULT')], store,
+                                  flush_interval=0.01)
+    asyncio.run(ingestor.run())
+
+    assert len(pd.read_csv(store.path_for('EUR_USD'))) == 1
+    assert len(pd.read_csv(store.path_for('DEFAULT'))) == 1
+
+
+def test_csv_store_merges_late_bars(tmp_path):
+    """Teste la fusion des barres arrivées en retard dans le fichier CSV."""
+    dates = pd.date_range('2023-01-01', periods=6, freq='min', name='date')
+    bars = pd.DataFrame({column: np.arange(6, dtype=float) for column in
+                         ['Open', 'High', 'Low', 'Close', 'Volume']}, index=dates)
+    store = CsvBarStore(str(tmp_path))
+    store.append('A', bars.iloc[[0, 1, 3, 4]])
+
+    # Barre manquante et correction d'une barre déjà écrite, dans un nouveau stockage
+    late = bars.iloc[[2, 4]].copy()
+    late['Close'] = [20.0, 40.0]
+    CsvBarStore(str(tmp_path)).append('A', late)
+    store.append('A', bars.iloc[[5]])
+
+    df = pd.read_csv(store.path_for('A'), index_col='date', parse_dates=['date'])
+    assert df.index.equals(dates)
+    assert list(df['Close']) == [0.0, 1.0, 20.0, 3.0, 40.0, 5.0]
+
+
+def test_invalid_queue_size():
+    """Teste la validation de la taille de file."""
+    with pytest.raises(ValueError):
+        MarketDataIngestor([], CsvBarStore.__new__(CsvBarStore), queue_size=0)
@@ -0,0 +1,111 @@
+"""
+Tests pour le module de suivi en temps réel.
+"""
+import json
+import urllib.request
+import urllib.error
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.monitoring import RingBuffer, StrategyMonitor, MetricsServer, prometheus_text
+from algotrading.strategy import MovingAverageCrossover
+from algotrading.synthetic import SyntheticMarketGenerator
+
+
+def test_ring_buffer():
+    """Teste le remplacement des valeurs les plus anciennes."""
+    buffer = RingBuffer(3)
+    assert len(buffer) == 0 and buffer.last() is None
+
+    for value in range(5):
+        buffer.append(value)
+
+    np.testing.assert_array_equal(buffer.values(), [2, 3, 4])
+    assert len(buffer) == 3 and buffer.total == 5 and buffer.last() == 4
+
+
+def test_strategy_monitor_snapshot():
+    """Teste l'état courant et le format Prometheus."""
+    monitor = StrategyMonitor('test', capacity=4, initial_capital=100.0)
+
+    # Plus haut à 120 puis baisse à 90, sur plus de barres que la taille des tampons
+    for equity in [110.0, 120.0, 90.0, 100.0, 105.0, 95.0]:
+        monitor.record_bar('AAA', 1.0, equity)
+    for seconds in [0.001, 0.002, 0.003]:
+        monitor.record_latency('signals', seconds)
+
+    snapshot = monitor.snapshot()
+    assert snapshot['events'] == 6
+    assert snapshot['positions'] == {'AAA': 1.0}
+    assert snapshot['peak_equity'] == 120.0
+    assert snapshot['drawdown'] == pytest.approx(95.0 / 120.0 - 1)
+    assert snapshot['max_drawdown'] == pytest.approx(90.0 / 120.0 - 1)
+    assert snapshot['latencies']['signals']['count'] == 3
+    assert snapshot['latencies']['signals']['max_s'] == pytest.approx(0.003)
+    np.testing.assert_array_equal(monitor.equity_history.values(), [90.0, 100.0, 105.0, 95.0])
+    json.dumps(snapshot)
+
+    text = monitor.prometheus_text()
+    assert 'algotrading_equity{strategy="test"} 95.0' in text
+    assert 'algotrading_position{strategy="test",symbol="AAA"} 1.0' in text
+    assert 'algotrading_stage_latency_seconds_count{strategy="test",stage="signals"} 3' in text
+    assert '# TYPE algotrading_stage_latency_seconds summary' in text
+
+
+def test_prometheus_text_families_and_escaping():
+    """Teste l'échappement des étiquettes et les lignes TYPE uniques par famille."""
+    first = StrategyMonitor('ma "rapide"\\v2', initial_capital=100.0)
+    second = StrategyMonitor('rsi', initial_capital=100.0)
+    for monitor in (first, second):
+        monitor.record_bar('A\nB', 1.0, 101.0)
+        monitor.record_latency('signals', 0.001)
+
+    text = prometheus_text([first, second])
+    lines = text.splitlines()
+
+    assert 'algotrading_equity{strategy="ma \\"rapide\\"\\\\v2"} 101.0' in lines
+    assert 'algotrading_position{strategy="rsi",symbol="A\\nB"} 1.0' in lines
+    type_lines = [line for line in lines if line.startswith('# TYPE')]
+    assert len(type_lines) == len(set(type_lines))
+    assert '# TYPE algotrading_stage_latency_seconds summary' in type_lines
+    assert '# TYPE algotrading_equity gauge' in type_lines
+    # Les échantillons d'une famille suivent sa ligne TYPE, tous collecteurs confondus
+    start = lines.index('# TYPE algotrading_stage_latency_seconds summary')
+    assert all(line.startswith('algotrading_stage_latency_seconds') for line in lines[start + 1:])
+    assert len(lines[start + 1:]) == 8
+
+
+def test_backtest_chunked_monitor():
+    """Teste le suivi d'un backtest par blocs."""
+    data = SyntheticMarketGenerator(seed=2).generate(400)['SYN00000']
+    strategy = MovingAverageCrossover(fast_window=5, slow_window=20)
+    monitor = StrategyMonitor(strategy.name, initial_capital=10000.0)
+
+    chunks = (data.iloc[begin:begin + 50] for begin in range(0, len(data), 50))
+    results = pd.concat(strategy.backtest_chunked(chunks, monitor=monitor, symbol='SYN00000'))
+
+    snapshot = monitor.snapshot()
+    assert snapshot['events'] == len(data)
+    assert list(snapshot['positions']) == ['SYN00000']
+    assert snapshot['equity'] == pytest.approx(results['Capital'].iloc[-1])
+    assert snapshot['max_drawdown'] == pytest.approx(min(results['Drawdown'].min(), 0.0))
+    assert set(snapshot['latencies']) == {'signals', 'accounting'}
+    assert snapshot['latencies']['accounting']['count'] == 8
+
+
+def test_metrics_server():
+    """Teste les points d'accès HTTP du serveur de métriques."""
+    monitor = StrategyMonitor('served', initial_capital=1000.0)
+    monitor.record_bar('AAA', -1.0, 990.0)
+
+    with MetricsServer(monitor) as server:
+        with urllib.request.urlopen(f"{server.url}/snapshot") as response:
+            snapshot = json.loads(response.read())
+        with urllib.request.urlopen(f"{server.url}/metrics") as response:
+            assert response.headers['Content-Type'].startswith('text/plain')
+            text = response.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{server.url}/unknown")
+
+    assert snapshot[0]['strategy'] == 'served' and snapshot[0]['positions'] == {'AAA': -1.0}
+    assert 'algotrading_drawdown{strategy="served"} -0.01' in text
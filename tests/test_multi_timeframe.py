@@ -0,0 +1,111 @@
+"""
+Tests pour le module d'indicateurs multi-unités de temps.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.multi_timeframe import MultiTimeframeIndicators, resample_ohlcv, align_to_base
+from algotrading.indicators import TechnicalIndicators
+
+
+@pytest.fixture
+def hourly_data():
+    """Crée un DataFrame de prix horaires sur deux mois."""
+    n = 24 * 60
+    dates = pd.date_range(start='2023-01-01', periods=n, freq='h')
+    close_prices = 100 + np.cumsum(np.random.normal(0, 1, n))
+    return pd.DataFrame({
+        'Open': close_prices - 0.5,
+        'High': close_prices + 1,
+        'Low': close_prices - 1,
+        'Close': close_prices,
+        'Volume': np.random.randint(1000, 10000, n)
+    }, index=dates)
+
+
+TIMEFRAMES = {
+    '1D': {'RSI': lambda d: TechnicalIndicators.rsi(d, 'Close', 5), 'MACD': TechnicalIndicators.macd},
+    '4h': {'SMA': lambda d: TechnicalIndicators.sma(d, 'Close', 3)},
+}
+
+
+def test_resample_ohlcv(hourly_data):
+    """Teste l'agrégation OHLCV en une passe."""
+    daily = resample_ohlcv(hourly_data, '1D')
+    first_day = hourly_data.loc['2023-01-01']
+
+    assert len(daily) == 60
+    assert daily.index[0] == pd.Timestamp('2023-01-02')
+    assert daily['Open'].iloc[0] == first_day['Open'].iloc[0]
+    assert daily['High'].iloc[0] == first_day['High'].max()
+    assert daily['Low'].iloc[0] == first_day['Low'].min()
+    assert daily['Close'].iloc[0] == first_day['Close'].iloc[-1]
+    assert daily['Volume'].iloc[0] == first_day['Volume'].sum()
+
+
+def test_resample_calendar_periods(hourly_data):
+    """Teste que les barres mensuelles et hebdomadaires couvrent des jours entiers."""
+    monthly = resample_ohlcv(hourly_data, 'ME')
+    january = hourly_data.loc['2023-01']
+
+    assert monthly.index[0] == pd.Timestamp('2023-02-01')
+    assert monthly['Close'].iloc[0] == january['Close'].iloc[-1]
+    assert monthly['Volume'].iloc[0] == january['Volume'].sum()
+    pd.testing.assert_frame_equal(resample_ohlcv(hourly_data, 'MS'), monthly)
+
+    # Semaine du lundi au dimanche, visible le lundi suivant à minuit
+    weekly = resample_ohlcv(hourly_data, 'W')
+    week = hourly_data.loc['2023-01-02':'2023-01-08']
+    assert pd.Timestamp('2023-01-09') in weekly.index
+    assert weekly.loc['2023-01-09', 'Volume'] == week['Volume'].sum()
+
+    # Les mises à jour incrémentales restent cohérentes avec le calcul complet
+    rules = {'W': {'SMA': lambda d: TechnicalIndicators.sma(d, 'Close', 2)}}
+    full = MultiTimeframeIndicators(rules).compute(hourly_data)
+    mtf = MultiTimeframeIndicators(rules)
+    parts = [mtf.compute(hourly_data.iloc[:200])]
+    for start in range(200, len(hourly_data), 100):
+        parts.append(mtf.update(hourly_data.iloc[start:start + 100]))
+    pd.testing.assert_frame_equal(pd.concat(parts), full)
+
+
+def test_alignment_uses_only_completed_bars(hourly_data):
+    """Teste l'absence d'anticipation lors du réalignement."""
+    aligned = MultiTimeframeIndicators(TIMEFRAMES).compute(hourly_data)
+    daily_close = align_to_base(resample_ohlcv(hourly_data, '1D')['Close'], hourly_data.index,
+                                pd.Timedelta(hours=1))
+
+    # La clôture journalière n'est connue qu'à la dernière barre horaire du jour
+    assert np.isnan(daily_close.loc['2023-01-01 22:00'])
+    assert daily_close.loc['2023-01-01 23:00'] == hourly_data['Close'].loc['2023-01-01 23:00']
+    assert daily_close.loc['2023-01-02 12:00'] == hourly_data['Close'].loc['2023-01-01 23:00']
+
+    # Tronquer les données ne change aucune valeur passée
+    truncated = MultiTimeframeIndicators(TIMEFRAMES).compute(hourly_data.iloc[:500])
+    pd.testing.assert_frame_equal(truncated, aligned.iloc[:500])
+    assert {'1D_RSI', '1D_MACD_MACD', '1D_MACD_Signal', '4h_SMA'} <= set(aligned.columns)
+
+
+def test_incremental_update_matches_full(hourly_data):
+    """Teste que les mises à jour incrémentales donnent le calcul complet."""
+    full = MultiTimeframeIndicators(TIMEFRAMES).compute(hourly_data)
+
+    mtf = MultiTimeframeIndicators(TIMEFRAMES)
+    parts = [mtf.compute(hourly_data.iloc[:100])]
+    for start in range(100, len(hourly_data), 37):
+        parts.append(mtf.update(hourly_data.iloc[start:start + 37]))
+
+    pd.testing.assert_frame_equal(pd.concat(parts), full)
+    # Seules les barres du jour en cours sont conservées
+    assert len(mtf._pending) <= 24
+
+
+def test_add_to_and_update_before_compute(hourly_data):
+    """Teste l'ajout des colonnes et l'ordre d'appel."""
+    mtf = MultiTimeframeIndicators({'1D': {'SMA': lambda d: TechnicalIndicators.sma(d, 'Close', 2)}})
+    with pytest.raises(RuntimeError):
+        mtf.update(hourly_data)
+
+    result = mtf.add_to(hourly_data)
+    assert list(result.columns) == list(hourly_data.columns) + ['1D_SMA']
+    assert result['1D_SMA'].notna().sum() > 0
@@ -0,0 +1,124 @@
+"""
+Tests pour le module d'instrumentation.
+"""
+import json
+import time
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.profiling import Profiler, instrument, span, active_profiler
+from algotrading.data_loader import DataLoader
+from algotrading.indicators import TechnicalIndicators
+from algotrading.strategy import MovingAverageCrossover
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    """Crée un fichier CSV de prix dans un répertoire temporaire."""
+    dates = pd.date_range(start='2023-01-01', periods=300)
+    close_prices = 100 + np.cumsum(np.random.normal(0, 1, 300))
+    df = pd.DataFrame({
+        'date': dates,
+        'Open': close_prices,
+        'High': close_prices + 1,
+        'Low': close_prices - 1,
+        'Close': close_prices,
+        'Volume': np.random.randint(1000, 10000, 300)
+    })
+    df.to_csv(tmp_path / "prices.csv", index=False)
+    return str(tmp_path)
+
+
+def test_pipeline_stages_recorded(sample_csv):
+    """Teste l'enregistrement de chaque étape du pipeline."""
+    loader = DataLoader(sample_csv)
+    strategy = MovingAverageCrossover(10, 30)
+
+    with Profiler() as profiler:
+        df = loader.prepare_price_data(loader.load_csv("prices.csv"))
+        df = TechnicalIndicators.add_all_indicators(df)
+        strategy.backtest(df)
+
+    summary = profiler.summary()
+    for stage in ['load_csv', 'prepare_price_data', 'add_all_indicators',
+                  'generate_signals', 'backtest']:
+        assert summary[stage]['calls'] == 1
+        assert summary[stage]['wall_s'] >= 0
+        assert summary[stage]['rows'] == 300
+
+    # generate_signals est imbriqué dans backtest
+    depths = {e['stage']: e['depth'] for e in profiler.events}
+    assert depths['generate_signals'] == depths['backtest'] + 1
+
+
+def test_disabled_by_default():
+    """Teste que rien n'est collecté hors d'un profileur."""
+    calls = []
+
+    @instrument('noop')
+    def noop(x):
+        calls.append(x)
+        return x
+
+    assert active_profiler() is None
+    assert noop(3) == 3
+    with span('libre', rows=5) as event:
+        assert event['rows'] == 5
+
+    with Profiler() as profiler:
+        noop(4)
+    assert active_profiler() is None
+    assert [e['stage'] for e in profiler.events] == ['noop']
+
+
+def test_memory_tracking_nested():
+    """Teste la mesure du pic d'allocation avec des étapes imbriquées."""
+    with Profiler(track_memory=True) as profiler:
+        with profiler.span('parent'):
+            with profiler.span('enfant'):
+                big = np.ones(2_000_000)
+                del big
+            small = np.ones(10)
+
+    summary = profiler.summary()
+    # 2e6 float64 = environ 15 Mo, comptés dans l'enfant et dans le parent
+    assert summary['enfant']['peak_mb'] > 14
+    assert summary['parent']['peak_mb'] >= summary['enfant']['peak_mb']
+
+
+def test_exports(tmp_path):
+    """Teste l'export JSON et Chrome Trace."""
+    with Profiler() as profiler:
+        with span('etape', rows=10):
+            time.sleep(0.001)
+
+    json_path = tmp_path / "profile.json"
+    trace_path = tmp_path / "trace.json"
+    profiler.to_json(str(json_path))
+    profiler.to_chrome_trace(str(trace_path))
+
+    with open(json_path) as f:
+        report = json.load(f)
+    assert report['summary']['etape']['rows'] == 10
+
+    with open(trace_path) as f:
+        trace = json.load(f)
+    event = trace['traceEvents'][0]
+    assert event['ph'] == 'X'
+    assert event['name'] == 'etape'
+    assert event['dur'] >= 1000
+
+
+def test_disabled_overhead_is_small():
+    """Teste que le surcoût du décorateur désactivé reste négligeable."""
+    @instrument()
+    def f():
+        return None
+
+    start = time.perf_counter()
+    for _ in range(100000):
+        f()
+    elapsed = time.perf_counter() - start
+
+    # Moins de 2 microsecondes par appel en moyenne
+    assert elapsed / 100000 < 2e-6
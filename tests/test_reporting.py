@@ -0,0 +1,110 @@
+"""
+Tests pour le module de génération des graphiques.
+"""
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.reporting import (
+    minmax_indices, lttb_indices, downsample, prepare_report, render_report, render_reports
+)
+from algotrading.indicators import TechnicalIndicators
+from algotrading.strategy import MovingAverageCrossover, RSIStrategy
+
+
+@pytest.fixture
+def long_price_data():
+    """Crée un long DataFrame de prix avec indicateurs."""
+    n = 20000
+    dates = pd.date_range(start='2020-01-01', periods=n, freq='min')
+    close_prices = 100 * np.exp(np.cumsum(np.random.normal(0, 0.001, n)))
+    df = pd.DataFrame({
+        'Open': close_prices,
+        'High': close_prices * 1.001,
+        'Low': close_prices * 0.999,
+        'Close': close_prices,
+        'Volume': np.random.randint(1000, 10000, n)
+    }, index=dates)
+    return TechnicalIndicators.add_all_indicators(df)
+
+
+def test_minmax_preserves_extremes():
+    """Teste que le sous-échantillonnage min-max conserve les extrêmes."""
+    values = np.random.normal(0, 1, 100000)
+    values[12345] = 50.0
+    values[54321] = -50.0
+
+    indices = minmax_indices(values, 500)
+
+    assert len(indices) <= 2 * 500 + 2
+    assert 12345 in indices and 54321 in indices
+    assert indices[0] == 0 and indices[-1] == len(values) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_minmax_handles_nan_and_short_series():
+    """Teste les NaN de chauffe des indicateurs et les séries courtes."""
+    values = np.concatenate([np.full(1000, np.nan), np.arange(9000, dtype=float)])
+    indices = minmax_indices(values, 100)
+    assert not np.isnan(values[indices[indices >= 1000]]).any()
+
+    assert len(minmax_indices(np.arange(10.0), 100)) == 10
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    """Teste l'algorithme LTTB."""
+    values = np.sin(np.linspace(0, 20 * np.pi, 20000))
+    values[7777] = 10.0
+
+    indices = lttb_indices(values, 300)
+
+    assert len(indices) == 300
+    assert indices[0] == 0 and indices[-1] == len(values) - 1
+    assert 7777 in indices
+
+
+def test_downsample_series():
+    """Teste le sous-échantillonnage d'une série pandas."""
+    series = pd.Series(np.random.normal(0, 1, 10000),
+                       index=pd.date_range('2020-01-01', periods=10000, freq='min'))
+
+    reduced = downsample(series, 400)
+    assert len(reduced) <= 402
+    assert reduced.index.is_monotonic_increasing
+    assert reduced.max() == series.max()
+
+    # Budget de 2 × 200 points : le minimum et le maximum de chacune des 200 colonnes
+    columns = series.to_numpy().reshape(200, -1)
+    assert set(columns.min(axis=1)) | set(columns.max(axis=1)) <= set(reduced)
+
+    with pytest.raises(ValueError):
+        downsample(series, 400, method='inconnue')
+
+
+def test_render_report_headless(tmp_path, long_price_data):
+    """Teste le rendu sans affichage d'un rapport sur une longue série."""
+    df = long_price_data
+    results = {'MA': MovingAverageCrossover(20, 50).backtest(df)}
+
+    panels = prepare_report(df, results, n_points=800)
+    assert set(panels) == {'price', 'rsi', 'capital', 'drawdown'}
+    assert all(len(s) <= 802 for series in panels.values() for s in series.values())
+
+    output = str(tmp_path / "rapport.png")
+    assert render_report(df, results, output, width_px=800, height_px=600) == output
+    assert os.path.getsize(output) > 0
+
+
+def test_render_reports_parallel(tmp_path, long_price_data):
+    """Teste le rendu de plusieurs rapports dans un pool de processus."""
+    df = long_price_data
+    reports = [
+        {'data': df, 'results': {s.name: s.backtest(df)}, 'output_file': str(tmp_path / f"{s.name}.png"),
+         'width_px': 600, 'height_px': 400}
+        for s in (MovingAverageCrossover(10, 30), RSIStrategy())
+    ]
+
+    outputs = render_reports(reports, max_workers=2)
+
+    assert outputs == [r['output_file'] for r in reports]
+    assert all(os.path.exists(path) for path in outputs)
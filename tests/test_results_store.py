@@ -0,0 +1,177 @@
+"""
+Tests pour le module de stockage des résultats de backtest.
+"""
+import time
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.results_store import ResultsStore, strategy_params
+from algotrading.strategy import MovingAverageCrossover, RSIStrategy, CompositeStrategy
+
+
+@pytest.fixture
+def sample_price_data():
+    """Crée un DataFrame de test avec des données de prix."""
+    dates = pd.date_range(start='2023-01-01', periods=300)
+    rng = np.random.default_rng(1)
+    close_prices = 100 + np.cumsum(rng.normal(0, 1, 300))
+
+    data = {
+        'Open': close_prices - rng.uniform(0, 1, 300),
+        'High': close_prices + rng.uniform(0, 1, 300),
+        'Low': close_prices - rng.uniform(0, 1, 300),
+        'Close': close_prices,
+        'Volume': rng.integers(1000, 10000, 300)
+    }
+    return pd.DataFrame(data, index=dates)
+
+
+def test_record_and_load_equity(tmp_path, sample_price_data):
+    """Teste l'enregistrement d'une exécution et la relecture de sa courbe de capital."""
+    strategy = MovingAverageCrossover(10, 30)
+    results = strategy.backtest(sample_price_data, commission=0.001)
+
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        run_id = store.record(strategy, results)
+        equity = store.load_equity(run_id)
+        runs = store.query()
+
+    assert equity.index.equals(results.index)
+    np.testing.assert_array_equal(equity.values, results['Capital'].values)
+    assert runs.loc[run_id, 'strategy'] == strategy.name
+    assert runs.loc[run_id, 'params'] == {'fast_window': 10, 'slow_window': 30}
+    assert runs.loc[run_id, 'n_bars'] == len(sample_price_data)
+    assert runs.loc[run_id, 'data_start'].startswith('2023-01-01')
+
+
+def test_top_by_metric_with_filters(sample_price_data):
+    """Teste le classement par métrique avec filtre sur le drawdown et les paramètres."""
+    store = ResultsStore(':memory:')
+    runs = []
+    for fast in range(5, 15):
+        for slow in (30, 40):
+            strategy = MovingAverageCrossover(fast, slow)
+            results = strategy.backtest(sample_price_data)
+            runs.append((strategy, results, None))
+    store.record_many(runs, store_equity=False)
+
+    top = store.top('sharpe_ratio', n=5, where=[('max_drawdown', '>', -0.2)])
+
+    assert len(top) <= 5
+    assert (top['max_drawdown'] > -0.2).all()
+    assert top['sharpe_ratio'].is_monotonic_decreasing
+
+    filtered = store.query(params={'slow_window': 40}, order_by='total_return')
+    assert len(filtered) == 10
+    assert all(p['slow_window'] == 40 for p in filtered['params'])
+
+    by_class = store.query(strategy_class='RSIStrategy')
+    assert by_class.empty
+
+
+def test_query_rejects_unknown_columns():
+    """Teste le refus des colonnes et opérateurs non autorisés."""
+    store = ResultsStore(':memory:')
+
+    with pytest.raises(ValueError):
+        store.query(order_by='sharpe_ratio; DROP TABLE runs')
+    with pytest.raises(ValueError):
+        store.query(where=[('max_drawdown', 'LIKE', 0)])
+
+
+def test_delete_cascades(sample_price_data):
+    """Teste la suppression d'une exécution et de ses données associées."""
+    store = ResultsStore(':memory:')
+    strategy = RSIStrategy()
+    run_id = store.record(strategy, strategy.backtest(sample_price_data))
+
+    assert store.delete([run_id]) == 1
+    assert len(store) == 0
+    with pytest.raises(KeyError):
+        store.load_equity(run_id)
+
+
+def test_query_speed_many_runs():
+    """Teste qu'un classement filtré reste rapide sur un grand nombre d'exécutions."""
+    store = ResultsStore(':memory:')
+    rng = np.random.default_rng(0)
+    n_runs = 20000
+    rows = [
+        ('RSI', 'algotrading.strategy.RSIStrategy', '{}', str(i), None, None, 0, None, '',
+         *rng.normal(0, 1, 7), None)
+        for i in range(n_runs)
+    ]
+    with store.connection:
+        store.connection.executemany(
+            "INSERT INTO runs (strategy, strategy_class, params, params_hash, data_start, "
+            "data_end, n_bars, data_fingerprint, created_at, total_return, annual_return, "
+            "annual_volatility, sharpe_ratio, max_drawdown, n_trades, win_rate, extra_metrics) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    start = time.perf_counter()
+    top = store.top('sharpe_ratio', n=20, where=[('max_drawdown', '>', -0.2)])
+    elapsed = time.perf_counter() - start
+
+    assert len(top) == 20
+    assert elapsed < 0.5
+
+
+def test_query_uses_metric_index_and_sorts_nulls_last():
+    """Teste que le classement utilise l'index de la métrique et place les NULL en dernier."""
+    store = ResultsStore(':memory:')
+    values = [0.5, None, -1.0, 2.0, None, 1.0]
+    with store.connection:
+        store.connection.executemany(
+            "INSERT INTO runs (strategy, strategy_class, params, params_hash, created_at, sharpe_ratio, "
+            "max_drawdown) VALUES ('RSI', 'algotrading.strategy.RSIStrategy', '{}', ?, '', ?, -0.1)",
+            [(str(i), value) for i, value in enumerate(values)])
+
+    # Capturer les requêtes exécutées pour examiner leur plan
+    statements = []
+    store.connection.set_trace_callback(statements.append)
+    descending = store.top('sharpe_ratio', n=10, where=[('max_drawdown', '>', -0.2)])
+    ascending = store.query(order_by='sharpe_ratio', ascending=True, limit=5)
+    store.connection.set_trace_callback(None)
+
+    assert descending['sharpe_ratio'].tolist()[:4] == [2.0, 1.0, 0.5, -1.0]
+    assert descending['sharpe_ratio'].iloc[4:].isna().all() and len(descending) == 6
+    assert ascending['sharpe_ratio'].tolist()[:4] == [-1.0, 0.5, 1.0, 2.0]
+    assert ascending['sharpe_ratio'].iloc[4:].isna().all() and len(ascending) == 5
+
+    selects = [sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]
+    for sql in selects:
+        plan = ' '.join(row[3] for row in store.connection.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        assert 'TEMP B-TREE' not in plan
+    assert 'idx_runs_sharpe_ratio' in ' '.join(
+        row[3] for row in store.connection.execute(f"EXPLAIN QUERY PLAN {selects[0]}"))
+
+
+def test_strategy_params_excludes_name():
+    """Teste l'extraction des paramètres d'une stratégie."""
+    params = strategy_params(RSIStrategy(window=10, overbought=80, oversold=20))
+    assert params == {'window': 10, 'overbought': 80, 'oversold': 20}
+
+
+def test_strategy_params_of_composite():
+    """Teste les paramètres d'une stratégie composite (filles décrites récursivement)."""
+    composite = CompositeStrategy([MovingAverageCrossover(5, 20), RSIStrategy(10, 80, 20)], mode='and')
+    params = strategy_params(composite)
+
+    assert params['mode'] == 'and' and params['weights'] == [1.0, 1.0]
+    assert params['strategies'][0] == {'class': 'algotrading.strategy.MovingAverageCrossover',
+                                       'params': {'fast_window': 5, 'slow_window': 20}}
+    assert params == strategy_params(CompositeStrategy([MovingAverageCrossover(5, 20), RSIStrategy(10, 80, 20)],
+                                                       mode='and'))
+
+
+def test_query_filters_on_list_param(sample_price_data):
+    """Teste le filtre sur un paramètre de type liste (même codage qu'à l'enregistrement)."""
+    store = ResultsStore(':memory:')
+    children = [MovingAverageCrossover(5, 20), RSIStrategy(10, 80, 20)]
+    for weights in ([1.0, 1.0], [2.0, 1.0]):
+        composite = CompositeStrategy(children, weights=weights)
+        store.record(composite, composite.backtest(sample_price_data), store_equity=False)
+
+    assert list(store.query(params={'weights': [2.0, 1.0]})['params'].map(lambda p: p['weights'])) == [[2.0, 1.0]]
+    assert len(store.query(params={'weights': np.array([1.0, 1.0])})) == 1
+    assert len(store.query(params={'mode': 'vote', 'weights': (2.0, 1.0)})) == 1
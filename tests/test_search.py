@@ -0,0 +1,123 @@
+"""
+Tests pour le module de recherche de paramètres.
+"""
+import itertools
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.search import ParameterSearch
+from algotrading.strategy import MovingAverageCrossover, RSIStrategy
+
+
+@pytest.fixture
+def price_data():
+    """Crée un DataFrame de prix avec une composante cyclique."""
+    rng = np.random.default_rng(42)
+    n = 3000
+    dates = pd.date_range(start='2020-01-01', periods=n)
+    close_prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.005, n)) + 0.1 * np.sin(np.arange(n) / 10))
+    return pd.DataFrame({
+        'Open': close_prices,
+        'High': close_prices * 1.01,
+        'Low': close_prices * 0.99,
+        'Close': close_prices,
+        'Volume': rng.integers(1000, 10000, n)
+    }, index=dates)
+
+
+RSI_SPACE = {'window': [7, 14, 21], 'overbought': [60, 70, 80], 'oversold': [20, 30, 40]}
+
+
+def test_successive_halving_cheaper_than_grid(price_data):
+    """Teste que le successive halving trouve une bonne combinaison à moindre coût."""
+    # Grille exhaustive sur l'historique complet
+    grid = ParameterSearch(RSIStrategy, RSI_SPACE, price_data)
+    candidates = [dict(zip(RSI_SPACE, values)) for values in itertools.product(*RSI_SPACE.values())]
+    exhaustive = sorted((grid.evaluate(params) for params in candidates), reverse=True)
+
+    search = ParameterSearch(RSIStrategy, RSI_SPACE, price_data)
+    result = search.successive_halving(candidates=candidates, eta=3, min_fraction=1 / 9)
+
+    assert result['bars_evaluated'] < result['grid_cost'] / 2
+    assert result['best_score'] >= exhaustive[len(exhaustive) // 4]
+    assert set(result['history']['rung']) == {0, 1, 2}
+    assert result['best_params'] in candidates
+
+
+def test_evaluate_is_memoized(price_data):
+    """Teste que les évaluations et les indicateurs sont mis en cache."""
+    search = ParameterSearch(RSIStrategy, RSI_SPACE, price_data)
+    params = {'window': 14, 'overbought': 70, 'oversold': 30}
+
+    first = search.evaluate(params, 1000)
+    second = search.evaluate(params, 1000)
+    search.evaluate({'window': 14, 'overbought': 80, 'oversold': 20}, 1000)
+
+    assert first == second
+    assert search.bars_evaluated == 2000
+    assert list(search._indicators) == [('RSI', 14)]
+
+
+def test_cached_indicators_match_direct_backtest(price_data):
+    """Teste que les colonnes précalculées donnent le même backtest."""
+    search = ParameterSearch(MovingAverageCrossover, {'fast_window': [10], 'slow_window': [40]}, price_data)
+    prepared = search._prepared_data({'fast_window': 10, 'slow_window': 40})
+
+    strategy = MovingAverageCrossover(10, 40)
+    expected = strategy.backtest(price_data)
+    results = strategy.backtest(prepared)
+
+    pd.testing.assert_series_equal(results['Capital'], expected['Capital'])
+
+
+def test_partial_rungs_open_positions(price_data):
+    """Teste que les portions tronquées ouvrent des positions dès leur première barre."""
+    space = {'fast_window': [5, 10, 20], 'slow_window': [30, 50, 80]}
+    search = ParameterSearch(MovingAverageCrossover, space, price_data)
+    candidates = [dict(zip(space, values)) for values in itertools.product(*space.values())]
+    search.successive_halving(candidates=candidates, eta=3, min_fraction=1 / 9)
+
+    # Les scores des paliers partiels ne sont pas tous identiques (ni tous nuls)
+    history = pd.DataFrame(search.history)
+    first_rung = history[history['rung'] == 0]['score']
+    assert first_rung.nunique() > 1
+    assert (first_rung != 0).all()
+
+    # Sur une portion, la position part de l'état du croisement sur la première barre
+    prepared = search._prepared_data({'fast_window': 10, 'slow_window': 50}).iloc[-300:]
+    results = MovingAverageCrossover(10, 50).backtest(prepared)
+    assert results['Position'].notna().all()
+    assert results['Position'].iloc[0] != 0
+
+
+def test_random_and_bayesian_respect_constraint(price_data):
+    """Teste les recherches aléatoire et bayésienne avec une contrainte."""
+    space = {'fast_window': (5, 30), 'slow_window': (20, 80)}
+
+    def constraint(params):
+        return params['fast_window'] < params['slow_window']
+
+    random_result = ParameterSearch(MovingAverageCrossover, space, price_data,
+                                    constraint=constraint, seed=1).random_search(15)
+    bayes_result = ParameterSearch(MovingAverageCrossover, space, price_data,
+                                   constraint=constraint, seed=1).bayesian_search(20, n_initial=5)
+
+    for result in (random_result, bayes_result):
+        history = result['history']
+        assert (history['fast_window'] < history['slow_window']).all()
+        assert not history.duplicated(['fast_window', 'slow_window']).any()
+    assert bayes_result['n_evaluations'] == 20
+    assert random_result['n_evaluations'] == 15
+
+
+def test_custom_metric_and_invalid_arguments(price_data):
+    """Teste une métrique personnalisée et les arguments invalides."""
+    search = ParameterSearch(RSIStrategy, RSI_SPACE, price_data,
+                             metric=lambda m: m['total_return'] / (1 - m['max_drawdown']))
+    result = search.random_search(3)
+    assert np.isfinite(result['best_score'])
+
+    with pytest.raises(ValueError):
+        search.successive_halving(eta=1)
+    with pytest.raises(ValueError):
+        search.successive_halving(min_fraction=0)
@@ -0,0 +1,89 @@
+"""
+Tests pour le module de partage des données en mémoire partagée.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.shared_data import SharedDataset, attach, init_worker, worker_frame
+from algotrading.data_loader import DataLoader
+from algotrading.strategy import MovingAverageCrossover
+
+
+@pytest.fixture
+def price_data():
+    """Crée un DataFrame de prix."""
+    dates = pd.date_range(start='2023-01-01', periods=500, tz='Europe/Paris')
+    close_prices = 100 + np.cumsum(np.random.normal(0, 1, 500))
+    return pd.DataFrame({
+        'Open': close_prices,
+        'High': close_prices + 1,
+        'Low': close_prices - 1,
+        'Close': close_prices,
+        'Volume': np.random.randint(1000, 10000, 500)
+    }, index=pd.DatetimeIndex(dates, name='date'))
+
+
+def _final_capital(fast_window):
+    """Backtest exécuté dans un processus de travail sur les données partagées."""
+    data = worker_frame('ABC')
+    return float(MovingAverageCrossover(fast_window, 30).backtest(data)['Capital'].iloc[-1])
+
+
+def test_publish_and_attach_zero_copy(price_data):
+    """Teste l'aller-retour sans copie en lecture seule."""
+    with SharedDataset() as dataset:
+        dataset.publish('ABC', price_data)
+        attached = attach(dataset.manifest, 'ABC')
+        frame = attached.to_frame()
+
+        pd.testing.assert_frame_equal(frame, price_data.astype(np.float64), check_freq=False)
+        assert np.shares_memory(frame['Close'].to_numpy(), attached.values)
+        with pytest.raises(ValueError):
+            attached.values[0, 0] = 0.0
+        with pytest.raises(ValueError, match='read-only'):
+            frame.iloc[0, 0] = 0.0
+        np.testing.assert_array_equal(attached.column('Volume'), price_data['Volume'])
+        attached.close()
+
+
+def test_workers_share_published_data(price_data):
+    """Teste l'utilisation des données partagées dans un pool de processus."""
+    with SharedDataset() as dataset:
+        dataset.publish('ABC', price_data)
+        with ProcessPoolExecutor(max_workers=2, initializer=init_worker,
+                                 initargs=(dataset.manifest,)) as executor:
+            capitals = list(executor.map(_final_capital, [5, 10, 15]))
+
+    expected = [float(MovingAverageCrossover(w, 30).backtest(price_data.astype(np.float64))['Capital'].iloc[-1])
+                for w in [5, 10, 15]]
+    assert capitals == pytest.approx(expected)
+
+
+def test_close_releases_segments(price_data):
+    """Teste la libération des segments."""
+    dataset = SharedDataset()
+    manifest = dict(datasets={'ABC': dataset.publish('ABC', price_data)})
+    assert dataset.nbytes >= price_data.size * 8
+
+    dataset.close()
+    dataset.close()
+
+    with pytest.raises(FileNotFoundError):
+        attach(manifest, 'ABC')
+    with pytest.raises(RuntimeError):
+        dataset.publish('XYZ', price_data)
+
+
+def test_from_csv_and_invalid_data(tmp_path, price_data):
+    """Teste le chargement par DataLoader et les données refusées."""
+    price_data.tz_localize(None).reset_index().to_csv(tmp_path / "ABC.csv", index=False)
+
+    with SharedDataset.from_csv(DataLoader(str(tmp_path)), {'ABC': 'ABC.csv'}, indicators=True) as dataset:
+        frame = attach(dataset.manifest, 'ABC').to_frame()
+        assert 'RSI' in frame.columns and len(frame) == len(price_data)
+
+        with pytest.raises(ValueError):
+            dataset.publish('ABC', price_data)
+        with pytest.raises(ValueError):
+            dataset.publish('TXT', price_data.assign(Symbol='ABC'))
@@ -0,0 +1,137 @@
+"""
+Tests pour le module de stockage compressé.
+"""
+import json
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.storage import CompressedBarStore
+from algotrading.data_loader import DataLoader
+from algotrading.cli import main
+
+
+@pytest.fixture
+def minute_bars():
+    """Crée des barres minute avec des prix au centime."""
+    n = 20000
+    dates = pd.date_range(start='2023-01-02 09:00', periods=n, freq='min', name='date')
+    close_prices = np.round(100 * np.exp(np.cumsum(np.random.normal(0, 0.001, n))), 2)
+    return pd.DataFrame({
+        'Open': np.round(close_prices + np.random.normal(0, 0.05, n), 2),
+        'High': np.round(close_prices + 0.1, 2),
+        'Low': np.round(close_prices - 0.1, 2),
+        'Close': close_prices,
+        'Volume': np.random.randint(1000, 10000, n)
+    }, index=dates)
+
+
+def test_roundtrip_and_size(tmp_path, minute_bars):
+    """Teste l'aller-retour et le gain de place par rapport au CSV."""
+    store = CompressedBarStore(str(tmp_path / "store"), tick_size=0.01, block_size=3000)
+    store.append('ABC', minute_bars.iloc[:12345])
+    store.append('ABC', minute_bars.iloc[12345:])
+
+    df = CompressedBarStore(str(tmp_path / "store"), tick_size=0.01).read('ABC')
+
+    pd.testing.assert_index_equal(df.index, minute_bars.index.as_unit('ns'))
+    np.testing.assert_allclose(df.to_numpy(), minute_bars.to_numpy(dtype=np.float64), atol=1e-9)
+    assert list(df.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+
+    minute_bars.to_csv(tmp_path / "ABC.csv")
+    assert store.size('ABC') < os.path.getsize(tmp_path / "ABC.csv") / 3
+    assert store.symbols() == ['ABC']
+
+
+def test_range_read_skips_blocks(tmp_path, minute_bars):
+    """Teste la lecture d'une période à l'aide de l'index des blocs."""
+    store = CompressedBarStore(str(tmp_path), tick_size=0.01, block_size=1000)
+    store.append('ABC', minute_bars)
+
+    start, end = minute_bars.index[4321], minute_bars.index[5678]
+    df = store.read('ABC', start, end)
+
+    assert df.index[0] == start and df.index[-1] == end
+    assert len(df) == 5678 - 4321 + 1
+    overlapping = [h for _, h in store.block_index('ABC')
+                   if h[3] >= start.value and h[2] <= end.as_unit('ns').value]
+    assert len(overlapping) == 2
+    assert store.read('ABC', '2030-01-01').empty
+
+
+def test_append_order_and_missing_symbol(tmp_path, minute_bars):
+    """Teste les corrections tardives, le refus des barres antérieures et des symboles absents."""
+    store = CompressedBarStore(str(tmp_path), tick_size=0.01, block_size=50)
+    store.append('ABC', minute_bars.iloc[100:200])
+
+    # Barres du dernier bloc corrigées : elles remplacent les barres stockées
+    corrected = minute_bars.iloc[180:250].copy()
+    corrected['Close'] += 1.0
+    store.append('ABC', corrected)
+    df = CompressedBarStore(str(tmp_path)).read('ABC')
+    pd.testing.assert_index_equal(df.index, minute_bars.index[100:250].as_unit('ns'))
+    np.testing.assert_allclose(df['Close'].to_numpy(),
+                               np.concatenate([minute_bars['Close'].iloc[100:180], corrected['Close']]))
+
+    size = store.size('ABC')
+    with pytest.raises(ValueError):
+        store.append('ABC', minute_bars.iloc[150:160])
+    with pytest.raises(FileNotFoundError):
+        store.read('XYZ')
+    assert store.size('ABC') == size
+
+
+def test_small_appends_fill_last_block(tmp_path, minute_bars):
+    """Teste que des écritures de quelques barres remplissent le dernier bloc."""
+    store = CompressedBarStore(str(tmp_path), tick_size=0.01, block_size=1000)
+    for begin in range(0, 2500, 7):
+        store.append('ABC', minute_bars.iloc[begin:min(begin + 7, 2500)])
+
+    assert [header[1] for _, header in store.block_index('ABC')] == [1000, 1000, 500]
+    df = CompressedBarStore(str(tmp_path)).read('ABC')
+    pd.testing.assert_index_equal(df.index, minute_bars.index[:2500].as_unit('ns'))
+    np.testing.assert_allclose(df.to_numpy(), minute_bars.iloc[:2500].to_numpy(dtype=np.float64), atol=1e-9)
+
+
+def test_append_rejects_timezone(tmp_path, minute_bars):
+    """Teste le refus des dates avec fuseau horaire (stockées sans fuseau)."""
+    store = CompressedBarStore(str(tmp_path))
+
+    with pytest.raises(ValueError, match='fuseau'):
+        store.append('ABC', minute_bars.tz_localize('Europe/Paris'))
+    assert store.symbols() == []
+
+
+def test_append_rejects_missing_values(tmp_path, minute_bars):
+    """Teste le refus des prix et volumes manquants au lieu d'un codage corrompu."""
+    store = CompressedBarStore(str(tmp_path), tick_size=0.01, block_size=50)
+    store.append('ABC', minute_bars.iloc[:100])
+
+    for column in ('Close', 'Volume'):
+        bars = minute_bars.iloc[100:200].astype(np.float64)
+        bars.iloc[70, bars.columns.get_loc(column)] = np.nan
+        with pytest.raises(ValueError, match=column):
+            store.append('ABC', bars)
+
+    # Aucun bloc partiel n'a été écrit
+    assert len(CompressedBarStore(str(tmp_path)).read('ABC')) == 100
+
+
+def test_import_csv_and_ingest(tmp_path, minute_bars):
+    """Teste l'import d'un CSV et l'ingestion vers le stockage compressé."""
+    minute_bars.reset_index().to_csv(tmp_path / "ABC.csv", index=False)
+    store = CompressedBarStore(str(tmp_path / "store"), tick_size=0.01)
+
+    assert store.import_csv('ABC', DataLoader(str(tmp_path)), 'ABC.csv', chunksize=7000) == len(minute_bars)
+    np.testing.assert_allclose(store.read('ABC')['Close'].to_numpy(), minute_bars['Close'].to_numpy())
+
+    with open(tmp_path / "stream.jsonl", 'w') as f:
+        for i in range(10):
+            f.write(json.dumps({'symbol': 'XYZ', 'timestamp': 1672531200 + 60 * i, 'close': 10 + i}) + "\n")
+    with open(tmp_path / "ingest.json", 'w') as f:
+        json.dump({'connectors': [{'type': 'file', 'path': 'stream.jsonl'}],
+                   'store': {'type': 'compressed', 'data_dir': 'bars', 'tick_size': 0.01},
+                   'flush_interval': 0.01}, f)
+
+    assert main(['ingest', str(tmp_path / "ingest.json")]) == 0
+    assert len(CompressedBarStore(str(tmp_path / "bars")).read('XYZ')) == 10
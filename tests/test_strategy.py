@@ -4,7 +4,7 @@ Tests pour le module des stratégies de trading.
 import pytest
 import pandas as pd
 import numpy as np
-from algotrading.strategy import Strategy, MovingAverageCrossover, RSIStrategy, Position
+from algotrading.strategy import Strategy, MovingAverageCrossover, RSIStrategy, CompositeStrategy, Position
 
 
 @pytest.fixture
@@ -103,6 +103,40 @@ def test_backtest(sample_price_data):
     assert results['Capital'].iloc[0] == 10000.0
 
 
+class _OpenOnFirstBar(Strategy):
+    """Stratégie achetant à une date donnée puis conservant la position."""
+    
+    def __init__(self, start):
+        super().__init__("Open_First")
+        self.start = start
+    
+    @property
+    def warmup_period(self):
+        return 0
+    
+    def generate_signals(self, data):
+        return pd.Series((data.index == self.start).astype(int), index=data.index)
+
+
+def test_backtest_flat_start(sample_price_data):
+    """Teste la comptabilité de la première barre (départ d'une position nulle)."""
+    df = sample_price_data
+    strategy = _OpenOnFirstBar(df.index[0])
+    
+    results = strategy.backtest(df, initial_capital=10000.0, commission=0.001)
+    
+    # Aucun rendement sur la première barre, mais l'ouverture est une transaction payée
+    assert results['Strategy_Returns'].iloc[0] == 0
+    assert results['Trade'].iloc[0] == 1
+    assert results['Capital'].iloc[0] == pytest.approx(10000.0 - df['Close'].iloc[0] * 0.001)
+    assert strategy.calculate_metrics(results)['n_trades'] == 1
+    
+    # Même comptabilité par blocs
+    chunks = (df.iloc[begin:begin + 30] for begin in range(0, len(df), 30))
+    chunked = pd.concat(strategy.backtest_chunked(chunks, initial_capital=10000.0, commission=0.001))
+    pd.testing.assert_frame_equal(chunked, results, check_freq=False)
+
+
 def test_metrics_calculation(sample_price_data):
     """Teste le calcul des métriques de performance."""
     df = sample_price_data
@@ -161,4 +195,130 @@ def test_multiple_strategies_comparison(sample_price_data):
     assert isinstance(rsi_metrics, dict)
     
     # Vérifier que les résultats sont comparables (mêmes métriques)
-    assert set(ma_metrics.keys()) == set(rsi_metrics.keys()) 
\ No newline at end of file
+    assert set(ma_metrics.keys()) == set(rsi_metrics.keys()) 
+
+def _chunks(df, size):
+    """Découpe un DataFrame en blocs consécutifs."""
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+@pytest.mark.parametrize("strategy", [
+    MovingAverageCrossover(fast_window=10, slow_window=30),
+    RSIStrategy(window=14, overbought=70, oversold=30),
+])
+@pytest.mark.parametrize("chunk_size", [7, 25, 100])
+def test_backtest_chunked_matches_in_memory(sample_price_data, strategy, chunk_size):
+    """Teste que le backtest par blocs reproduit le backtest en mémoire."""
+    df = sample_price_data
+
+    expected = strategy.backtest(df, initial_capital=10000.0, commission=0.001)
+    chunked = pd.concat(strategy.backtest_chunked(_chunks(df, chunk_size),
+                                                  initial_capital=10000.0, commission=0.001))
+
+    pd.testing.assert_frame_equal(chunked, expected, check_freq=False)
+
+
+def test_calculate_metrics_chunked(sample_price_data):
+    """Teste les métriques calculées bloc par bloc."""
+    df = sample_price_data
+    strategy = MovingAverageCrossover(fast_window=10, slow_window=30)
+
+    expected = strategy.calculate_metrics(strategy.backtest(df, commission=0.001))
+    metrics = strategy.calculate_metrics_chunked(
+        strategy.backtest_chunked(_chunks(df, 13), commission=0.001))
+
+    assert metrics.keys() == expected.keys()
+    for key in expected:
+        assert np.isclose(metrics[key], expected[key], equal_nan=True)
+
+
+def test_backtest_chunked_requires_warmup(sample_price_data):
+    """Teste qu'une stratégie sans période de chauffe exige l'argument warmup."""
+
+    class AlwaysLong(Strategy):
+        def generate_signals(self, data):
+            signals = pd.Series(0, index=data.index)
+            signals.iloc[0] = 1
+            return signals
+
+    with pytest.raises(ValueError):
+        list(AlwaysLong("long").backtest_chunked(_chunks(sample_price_data, 10)))
+
+
+def test_composite_single_child_matches_child(sample_price_data):
+    """Teste qu'une composite à une seule fille reproduit le backtest de la fille."""
+    df = sample_price_data
+    child = MovingAverageCrossover(fast_window=10, slow_window=30)
+
+    expected = child.backtest(df, commission=0.001)
+    results = CompositeStrategy([child]).backtest(df, commission=0.001)
+
+    pd.testing.assert_series_equal(results['Capital'], expected['Capital'])
+
+
+@pytest.mark.parametrize("mode", CompositeStrategy.MODES)
+def test_composite_modes(sample_price_data, mode):
+    """Teste les règles de combinaison des positions."""
+    df = sample_price_data
+    composite = CompositeStrategy([
+        MovingAverageCrossover(fast_window=5, slow_window=20),
+        MovingAverageCrossover(fast_window=10, slow_window=30),
+        RSIStrategy(window=14, overbought=60, oversold=40),
+    ], mode=mode, weights=[0.5, 0.3, 0.2], threshold=0.6)
+
+    positions = composite.child_positions(df)
+    combined = composite.combine(positions)
+    results = composite.backtest(df)
+
+    # Un seul passage de backtest, dont la position est la position combinée
+    assert (results['Position'].to_numpy() == combined.to_numpy()).all()
+    assert set(combined.unique()) <= {-1, 0, 1}
+    if mode == 'and':
+        agree = positions.nunique(axis=1) == 1
+        assert (combined[~agree] == 0).all()
+    elif mode == 'weighted':
+        score = positions.to_numpy() @ np.array([0.5, 0.3, 0.2])
+        assert (combined[np.abs(score) < 0.6] == 0).all()
+
+
+def test_composite_shares_indicators(sample_price_data):
+    """Teste le calcul unique des indicateurs partagés et la période de chauffe."""
+    composite = CompositeStrategy([
+        MovingAverageCrossover(fast_window=10, slow_window=30),
+        MovingAverageCrossover(fast_window=10, slow_window=50),
+    ])
+
+    assert set(composite.required_indicators()) == {'SMA10', 'SMA30', 'SMA50'}
+    assert composite.warmup_period == 50
+    with pytest.raises(ValueError):
+        CompositeStrategy([], mode='vote')
+    with pytest.raises(ValueError):
+        CompositeStrategy([RSIStrategy()], mode='unanime')
+
+
+@pytest.mark.parametrize("commission", [0.0, 0.001])
+def test_backtest_matrix_matches_individual_backtests(sample_price_data, commission):
+    """Teste que le backtest matriciel reproduit les backtests individuels."""
+    df = sample_price_data
+    param_sets = [{'fast_window': f, 'slow_window': s} for f in (3, 5, 10) for s in (15, 20, 30)]
+
+    table = MovingAverageCrossover.backtest_matrix(df, param_sets, commission=commission, batch_size=4)
+
+    assert len(table) == len(param_sets)
+    for i, params in enumerate(param_sets):
+        strategy = MovingAverageCrossover(**params)
+        expected = strategy.calculate_metrics(strategy.backtest(df, commission=commission))
+        assert table.loc[i, 'fast_window'] == params['fast_window']
+        for key, value in expected.items():
+            assert np.isclose(table.loc[i, key], value, equal_nan=True), key
+
+
+def test_generate_signal_matrix_default(sample_price_data):
+    """Teste la matrice de signaux par défaut (une stratégie par jeu de paramètres)."""
+    df = sample_price_data
+    param_sets = [{'window': 7}, {'window': 14, 'oversold': 40}]
+
+    signals = RSIStrategy.generate_signal_matrix(df, param_sets)
+
+    assert signals.shape == (2, len(df))
+    np.testing.assert_array_equal(signals[1], RSIStrategy(window=14, oversold=40).generate_signals(df).to_numpy())
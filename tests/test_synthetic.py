@@ -0,0 +1,98 @@
+"""
+Tests pour le module de génération de données synthétiques.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.synthetic import SyntheticMarketGenerator
+from algotrading.data_loader import DataLoader
+from algotrading.storage import CompressedBarStore
+
+
+REGIMES = [{'drift': 0.2, 'volatility': 0.1, 'duration': 50},
+           {'drift': -0.3, 'volatility': 0.5, 'duration': 20}]
+
+
+def test_ohlcv_consistency():
+    """Teste la cohérence des barres OHLCV produites."""
+    frames = SyntheticMarketGenerator(5, jump_intensity=10, regimes=REGIMES, seed=1).generate(2000)
+
+    for df in frames.values():
+        assert list(df.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert (df['High'] >= df[['Open', 'Close']].max(axis=1)).all()
+        assert (df['Low'] <= df[['Open', 'Close']].min(axis=1)).all()
+        assert (df['Low'] > 0).all() and (df['Volume'] > 0).all()
+        # L'ouverture reprend la clôture précédente
+        np.testing.assert_allclose(df['Open'].iloc[1:].to_numpy(), df['Close'].iloc[:-1].to_numpy())
+
+
+def test_chunk_size_does_not_change_output():
+    """Teste que le découpage en blocs et la graine rendent le résultat reproductible."""
+    generator = SyntheticMarketGenerator(4, correlation=0.6, jump_intensity=5, regimes=REGIMES, seed=7)
+
+    whole = generator.generate(1000, chunk_size=1000)
+    chunked = generator.generate(1000, chunk_size=77)
+    other_seed = SyntheticMarketGenerator(4, correlation=0.6, seed=8).generate(1000)
+
+    for symbol in whole:
+        pd.testing.assert_frame_equal(whole[symbol], chunked[symbol])
+    assert not whole['SYN00000'].equals(other_seed['SYN00000'])
+
+
+def test_chunk_size_counts_values():
+    """Teste que la taille des blocs est répartie entre les symboles."""
+    generator = SyntheticMarketGenerator(50, freq='B', seed=1)
+
+    chunks = list(generator.generate_chunks(1000, chunk_size=5000))
+
+    assert [chunk['Close'].shape for chunk in chunks] == [(100, 50)] * 10
+    index = pd.DatetimeIndex(np.concatenate([chunk['index'] for chunk in chunks]))
+    pd.testing.assert_index_equal(index, pd.date_range('2000-01-01', periods=1000, freq='B'), check_names=False)
+
+
+def test_correlation_and_regimes():
+    """Teste la corrélation entre symboles et l'alternance des régimes."""
+    generator = SyntheticMarketGenerator(3, correlation=0.8, regimes=REGIMES, seed=2)
+    chunk = next(generator.generate_chunks(20000, chunk_size=3 * 20000))
+
+    returns = np.diff(np.log(chunk['Close']), axis=0)
+    correlation = np.corrcoef(returns.T)
+    assert correlation[0, 1] == pytest.approx(0.8, abs=0.05)
+    assert set(np.unique(chunk['regime'])) == {0, 1}
+
+    with pytest.raises(ValueError):
+        SyntheticMarketGenerator(2, correlation=np.array([[1.0, 2.0], [2.0, 1.0]]))
+
+
+def test_write_csv_streaming(tmp_path):
+    """Teste l'écriture par blocs dans des fichiers lisibles par DataLoader."""
+    generator = SyntheticMarketGenerator(['AAA', 'BBB'], freq='min', seed=3)
+
+    written = generator.write_csv(str(tmp_path), 1000, chunk_size=300)
+
+    assert written == 2000
+    loader = DataLoader(str(tmp_path))
+    df = loader.prepare_price_data(loader.load_csv('AAA.csv'))
+    expected = generator.generate(1000)['AAA']
+    assert len(df) == 1000
+    np.testing.assert_allclose(df['Close'].to_numpy(), expected['Close'].to_numpy())
+
+
+def test_write_rerun_overwrites(tmp_path):
+    """Teste qu'une nouvelle écriture remplace l'historique au lieu de le dupliquer."""
+    generator = SyntheticMarketGenerator(['AAA', 'BBB'], freq='min', seed=3)
+    generator.write_csv(str(tmp_path), 500, chunk_size=200)
+    generator.write_csv(str(tmp_path), 400, chunk_size=200)
+
+    loader = DataLoader(str(tmp_path))
+    df = loader.prepare_price_data(loader.load_csv('BBB.csv'))
+    assert len(df) == 400 and df.index.is_unique
+
+    with pytest.raises(FileExistsError):
+        generator.write_csv(str(tmp_path), 400, overwrite=False)
+
+    store = CompressedBarStore(str(tmp_path / "store"), tick_size=0.01)
+    for _ in range(2):
+        generator.write(store, 300, chunk_size=100)
+    assert len(store.read('AAA')) == 300
+    assert len(CompressedBarStore(str(tmp_path / "store")).read('AAA')) == 300
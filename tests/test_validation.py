@@ -0,0 +1,99 @@
+"""
+Tests pour le module de contrôle de la qualité des données.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.data_loader import DataLoader
+from algotrading.synthetic import SyntheticMarketGenerator
+from algotrading.validation import validate_price_data, repair_price_data, CHECKS
+
+
+@pytest.fixture
+def clean_data():
+    """Crée des barres OHLCV synthétiques sans défaut."""
+    return SyntheticMarketGenerator(seed=5, freq='h').generate(500)['SYN00000']
+
+
+@pytest.fixture
+def dirty_data(clean_data):
+    """Introduit un défaut de chaque type dans les barres."""
+    df = clean_data.copy()
+    df.iloc[10, df.columns.get_loc('Close')] *= 5           # Pic isolé
+    df.iloc[20, df.columns.get_loc('Low')] = -1.0           # Prix négatif
+    df.iloc[30, df.columns.get_loc('High')] = df['Low'].iloc[30] * 0.9   # Barre incohérente
+    df.iloc[40, df.columns.get_loc('Open')] = np.nan        # Valeur manquante
+    df.iloc[50, df.columns.get_loc('Volume')] = -5          # Volume négatif
+    df = df.drop(df.index[100:120])                          # Trou dans les dates
+    # Doublon et dates désordonnées
+    return pd.concat([df.iloc[:200], df.iloc[[150]], df.iloc[200:260], df.iloc[300:], df.iloc[260:300]])
+
+
+def test_validate_clean_data(clean_data):
+    """Teste le rapport sur des données sans défaut."""
+    report = validate_price_data(clean_data)
+
+    assert report['valid']
+    assert report['n_rows'] == 500
+    assert set(report['counts']) == set(CHECKS)
+    assert sum(report['counts'].values()) == 0
+    assert report['examples'] == {}
+
+
+def test_validate_dirty_data(dirty_data, clean_data):
+    """Teste la détection de chaque type de défaut."""
+    report = validate_price_data(dirty_data)
+
+    assert not report['valid']
+    counts = report['counts']
+    assert counts['spikes'] == 1 and report['examples']['spikes'] == [clean_data.index[10]]
+    assert counts['non_positive'] == 1
+    assert counts['inconsistent'] == 2       # Barre 30 et clôture du pic au-dessus du plus haut
+    assert counts['missing'] == 1
+    assert counts['negative_volume'] == 1
+    assert counts['duplicates'] == 1
+    assert counts['unsorted'] == 2
+    assert counts['gaps'] == 3               # Barres retirées et sauts en avant des dates désordonnées
+
+
+def test_repair_price_data(dirty_data):
+    """Teste la correction des défauts."""
+    repaired = repair_price_data(dirty_data)
+
+    assert repaired.index.is_monotonic_increasing and repaired.index.is_unique
+    assert len(repaired) == 480
+    report = validate_price_data(repaired)
+    assert report['valid']
+    # Les trous dans les dates sont signalés mais pas comblés
+    assert report['counts']['gaps'] == 1
+
+
+def test_prepare_price_data_validation(dirty_data, clean_data):
+    """Teste le contrôle et la correction lors de la préparation des données."""
+    loader = DataLoader()
+    raw = dirty_data.reset_index()
+
+    # Sans contrôle, les données sont seulement triées
+    assert len(loader.prepare_price_data(raw)) == len(dirty_data)
+    assert len(loader.prepare_price_data(clean_data.reset_index(), validate=True)) == len(clean_data)
+
+    with pytest.raises(ValueError, match='duplicates'):
+        loader.prepare_price_data(raw, validate=True)
+
+    repaired = loader.prepare_price_data(raw, validate=True, repair=True)
+    assert validate_price_data(repaired)['valid']
+
+
+def test_validation_with_partial_columns(dirty_data):
+    """Teste le contrôle et la correction d'une partie seulement des colonnes OHLCV."""
+    raw = dirty_data[['Close']].rename(columns={'Close': 'Price'}).reset_index()
+    loader = DataLoader()
+
+    report = validate_price_data(dirty_data[['Close']])
+    assert report['counts']['spikes'] == 1 and report['counts']['inconsistent'] == 0
+
+    with pytest.raises(ValueError):
+        loader.prepare_price_data(raw, ohlcv_cols={'close': 'Price'}, validate=True)
+    repaired = loader.prepare_price_data(raw, ohlcv_cols={'close': 'Price'}, repair=True)
+    assert list(repaired.columns) == ['Close']
+    assert validate_price_data(repaired)['valid']
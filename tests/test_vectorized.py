@@ -0,0 +1,41 @@
+"""
+Tests pour le module de backtest vectorisé.
+"""
+import pytest
+import pandas as pd
+import numpy as np
+from algotrading.vectorized import backtest_matrix, metrics_matrix, batch_size_for
+
+
+def test_backtest_matrix_accounting():
+    """Teste la comptabilité sur un exemple calculé à la main."""
+    prices = np.array([100.0, 110.0, 99.0, 99.0])
+    signals = np.array([
+        [1, 0, -1, 0],   # Long sur deux barres puis neutre
+        [1, 1, 0, 0],    # Position invalide (2) à partir de la deuxième barre
+    ])
+
+    results = backtest_matrix(signals, prices, initial_capital=1000.0)
+
+    np.testing.assert_array_equal(results['Position'][0], [1, 1, 0, 0])
+    np.testing.assert_allclose(results['Capital'][0], [1000.0, 1100.0, 990.0, 990.0])
+    np.testing.assert_allclose(results['Drawdown'][0], [0.0, 0.0, -0.1, -0.1])
+    assert results['Trade'][0].sum() == 2
+    assert np.isnan(results['Position'][1, 1:]).all()
+    np.testing.assert_allclose(results['Capital'][1], [1000.0, 1100.0, 1100.0, 1100.0])
+
+
+def test_metrics_matrix_and_commission():
+    """Teste les métriques et la déduction des commissions."""
+    prices = 100 * np.exp(np.cumsum(np.random.normal(0, 0.01, 500)))
+    signals = np.zeros((3, 500))
+    signals[1, 0] = 1
+    signals[2, [0, 100, 200]] = [1, -1, 1]
+
+    results = backtest_matrix(signals, prices, commission=0.001)
+    metrics = metrics_matrix(results)
+
+    assert metrics['n_trades'].tolist() == [0, 1, 3]
+    assert metrics['total_return'][0] == 0 and metrics['sharpe_ratio'][0] == 0
+    assert results['Capital'][1, -1] == pytest.approx(10000.0 * prices[-1] / prices[0] - prices[0] * 0.001)
+    assert batch_size_for(10 ** 7, 4_000_000) == 1